@@ -0,0 +1,295 @@
+"""Deterministic scripted chat model that plays the planner's agents offline.
+
+The model recognizes which agent it is answering for from the system prompt and
+follows the same protocol as the real one: the supervisor hands off (to several
+agents for composite requests), workers call their tools and the booking agent
+requests confirmations, which trigger the human-in-the-loop interrupt.
+"""
+
+import asyncio
+import json
+import re
+import threading
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Iterator
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langchain_core.messages.utils import count_tokens_approximately
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langgraph_supervisor.handoff import METADATA_KEY_IS_HANDOFF_BACK
+from pydantic import PrivateAttr
+
+SEARCH_WORDS = (
+    "weather",
+    "rain",
+    "sunny",
+    "climate",
+    "visa",
+    "currency",
+    "language",
+    "timezone",
+)
+BOOKING_WORDS = ("flight", "hotel", "stay", "accommodation", "book", "room")
+TRIP_WORDS = ("trip", "plan", "itinerary", "holiday", "vacation")
+DESTINATION_RE = re.compile(r"\b(?:in|to|for|at|visit)\s+([A-Z][a-zA-Z]+)")
+# Booking dates a month ahead, inside the default inventory window
+DEPARTURE_DATE = (date.today() + timedelta(days=30)).isoformat()
+RETURN_DATE = (date.today() + timedelta(days=33)).isoformat()
+
+
+def _call(name: str, **args) -> dict:
+    return {"name": name, "args": args, "id": f"call_{uuid.uuid4().hex[:24]}"}
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that answers every planner node with scripted messages.
+
+    `latency` seconds are spent before each response (with `asyncio.sleep` on the
+    async path, so concurrent conversations overlap like real API calls) and
+    `token_latency` between streamed words. Calls and time spent are counted so
+    benchmarks can subtract model time from graph time.
+    """
+
+    latency: float = 0.0
+    token_latency: float = 0.0
+    calls: int = 0
+    model_seconds: float = 0.0
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.model_seconds = 0.0
+
+    def _record(self, seconds: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.model_seconds += seconds
+
+    # Scripted behaviour
+
+    def _respond(self, messages: list[BaseMessage]) -> AIMessage:
+        system = next((m.content for m in messages if isinstance(m, SystemMessage)), "")
+        query = next(
+            (m.content for m in reversed(messages) if isinstance(m, HumanMessage)), ""
+        )
+        if "travel planning supervisor" in system:
+            message = self._supervisor(messages, query)
+        elif "travel information agent" in system:
+            message = self._search_agent(messages, query)
+        elif "booking agent" in system:
+            message = self._booking_agent(messages, query)
+        else:
+            message = AIMessage(content=f"Summary: {str(query)[:200]}")
+
+        output_tokens = max(1, len(str(message.content)) // 4)
+        input_tokens = count_tokens_approximately(messages)
+        message.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+        return message
+
+    @staticmethod
+    def _destination(query: str) -> str:
+        match = DESTINATION_RE.search(query)
+        return match.group(1) if match else "Paris"
+
+    @staticmethod
+    def _turn_results(messages: list[BaseMessage]) -> list[str]:
+        """Worker answers produced since the latest user message."""
+        start = max(
+            (i for i, m in enumerate(messages) if isinstance(m, HumanMessage)),
+            default=0,
+        )
+        return [
+            m.content
+            for m in messages[start:]
+            if isinstance(m, AIMessage)
+            and m.content
+            and m.name not in (None, "supervisor")
+            and not m.response_metadata.get(METADATA_KEY_IS_HANDOFF_BACK)
+        ]
+
+    def _supervisor(self, messages: list[BaseMessage], query: str) -> AIMessage:
+        last = messages[-1]
+        if not isinstance(last, HumanMessage):
+            results = self._turn_results(messages) or [
+                m.content for m in messages[-1:] if isinstance(m, ToolMessage)
+            ]
+            return AIMessage(content="Here is what I found:\n" + "\n".join(results))
+
+        text = query.lower()
+        if text.startswith("remember"):
+            return AIMessage(
+                content="",
+                tool_calls=[
+                    _call("add_long_term_memory", content=query, importance="high")
+                ],
+            )
+
+        agents = []
+        if any(word in text for word in SEARCH_WORDS + TRIP_WORDS):
+            agents.append("search_agent")
+        if any(word in text for word in BOOKING_WORDS + TRIP_WORDS):
+            agents.append("booking_agent")
+        if not agents:
+            return AIMessage(content="I can help with weather, flights and hotels.")
+        return AIMessage(
+            content="", tool_calls=[_call(f"transfer_to_{agent}") for agent in agents]
+        )
+
+    def _search_agent(self, messages: list[BaseMessage], query: str) -> AIMessage:
+        last = messages[-1]
+        destination = self._destination(query)
+        if isinstance(last, ToolMessage) and last.name.startswith("transfer_to"):
+            return AIMessage(
+                content="",
+                tool_calls=[
+                    _call("get_weather_forecast", destination=destination),
+                    _call("get_location_info", destination=destination),
+                ],
+            )
+        results = [m.content for m in messages[-2:] if isinstance(m, ToolMessage)]
+        return AIMessage(
+            content=f"Travel information for {destination}: " + " ".join(results)
+        )
+
+    def _booking_agent(self, messages: list[BaseMessage], query: str) -> AIMessage:
+        last = messages[-1]
+        destination = self._destination(query)
+        if isinstance(last, ToolMessage) and last.name.startswith("transfer_to"):
+            if "book" in query.lower().split():
+                return AIMessage(
+                    content="",
+                    tool_calls=[
+                        _call(
+                            "confirm_flight_booking",
+                            airline="SkyWings",
+                            route=f"London-{destination}",
+                            departure_date=DEPARTURE_DATE,
+                            passenger_name="Alex Doe",
+                            payment_method="card",
+                        )
+                    ],
+                )
+            return AIMessage(
+                content="",
+                tool_calls=[
+                    _call(
+                        "search_flights",
+                        origin="London",
+                        destination=destination,
+                        departure_date=DEPARTURE_DATE,
+                        return_date=RETURN_DATE,
+                    ),
+                    _call(
+                        "search_accommodations",
+                        destination=destination,
+                        check_in=DEPARTURE_DATE,
+                        check_out=RETURN_DATE,
+                        guests=2,
+                    ),
+                ],
+            )
+        results = [m.content for m in messages[-2:] if isinstance(m, ToolMessage)]
+        return AIMessage(
+            content=f"Booking options for {destination}: " + " ".join(results)
+        )
+
+    # BaseChatModel interface
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        start = time.perf_counter()
+        time.sleep(self.latency)
+        message = self._respond(messages)
+        self._record(time.perf_counter() - start)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        start = time.perf_counter()
+        await asyncio.sleep(self.latency)
+        message = self._respond(messages)
+        self._record(time.perf_counter() - start)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    @staticmethod
+    def _chunks(message: AIMessage) -> list[AIMessageChunk]:
+        if message.tool_calls:
+            return [
+                AIMessageChunk(
+                    content="",
+                    tool_call_chunks=[
+                        {
+                            "name": tool_call["name"],
+                            "args": json.dumps(tool_call["args"]),
+                            "id": tool_call["id"],
+                            "index": index,
+                        }
+                        for index, tool_call in enumerate(message.tool_calls)
+                    ],
+                    usage_metadata=message.usage_metadata,
+                )
+            ]
+        words = re.findall(r"\S+\s*", str(message.content)) or [""]
+        chunks = [AIMessageChunk(content=word) for word in words]
+        chunks[-1].usage_metadata = message.usage_metadata
+        return chunks
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        start = time.perf_counter()
+        time.sleep(self.latency)
+        for chunk in self._chunks(self._respond(messages)):
+            time.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=chunk)
+        self._record(time.perf_counter() - start)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        start = time.perf_counter()
+        await asyncio.sleep(self.latency)
+        for chunk in self._chunks(self._respond(messages)):
+            await asyncio.sleep(self.token_latency)
+            yield ChatGenerationChunk(message=chunk)
+        self._record(time.perf_counter() - start)
@@ -0,0 +1,385 @@
+"""Benchmark the planner graph's own overhead with a scripted chat model.
+
+Runs offline: `get_llm_model()` is replaced by `ScriptedChatModel` and memories
+use the hashing embedder, so every number is the cost of the graph, its hooks,
+checkpointer and memory store rather than of the LLM provider.
+
+Suites:
+    turns        per-turn wall time minus model time as the thread grows
+    checkpoints  read/write cost of each checkpointer backend during those turns
+                 (summed across the graph's background writer threads, so it
+                 can exceed the turn's wall time)
+    memory       memory put and search latency against namespace size
+    hooks        pre/post model hook latency against thread length
+    inventory    booking inventory query latency (route/day, route/month, stays)
+
+Usage:
+    python -m benchmarks.graph --turns 40 --output graph.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+
+os.environ.setdefault("EMBEDDING_BACKEND", "hashing")
+os.environ.setdefault("GROQ_API_KEY", "offline")
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+
+from src.config import set_llm_factory  # noqa: E402
+
+from .fake_llm import ScriptedChatModel  # noqa: E402
+
+SCRIPT = [
+    "What's the weather in Paris?",
+    "Find me flights to Rome",
+    "Plan a 3-day trip to Lisbon",
+    "Do I need a visa to visit Japan?",
+    "Show me hotels in Madrid",
+    "Please book the flight to Rome",
+]
+CHECKPOINT_METHODS = ["get_tuple", "put", "put_writes"]
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    """Median and p95 of millisecond samples."""
+    return {
+        "median_ms": round(statistics.median(values), 4),
+        "p95_ms": round(percentile(values, 0.95), 4),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class CheckpointTimer:
+    """Wraps a checkpointer's methods to accumulate call counts and time."""
+
+    def __init__(self, checkpointer):
+        self.totals = {name: [0, 0.0] for name in CHECKPOINT_METHODS}
+        for name in CHECKPOINT_METHODS:
+            setattr(checkpointer, name, self._timed(name, getattr(checkpointer, name)))
+
+    def _timed(self, name, method):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.totals[name][0] += 1
+                self.totals[name][1] += time.perf_counter() - start
+
+        return timed
+
+    def snapshot(self) -> float:
+        """Total seconds spent in the checkpointer so far."""
+        return sum(seconds for _, seconds in self.totals.values())
+
+
+def bench_turns(
+    model: ScriptedChatModel, backend: str, turns: int
+) -> tuple[list, list]:
+    from src.graph import TravelPlannerGraph
+
+    with tempfile.TemporaryDirectory() as tmp:
+        planner = TravelPlannerGraph(
+            checkpointer=backend, checkpoint_path=os.path.join(tmp, "bench.sqlite")
+        )
+        timer = CheckpointTimer(planner.checkpointer)
+        config = planner.get_config(f"bench-{backend}")
+        rows = []
+
+        for turn in range(turns):
+            message = SCRIPT[turn % len(SCRIPT)]
+            model.reset()
+            checkpoint_before = timer.snapshot()
+            start = time.perf_counter()
+            result = planner.chat(message, config["configurable"]["thread_id"])
+            if isinstance(result, dict) and result.get("type") == "interrupt":
+                result = planner.chat(
+                    "", config["configurable"]["thread_id"], is_approved=True
+                )
+            wall = time.perf_counter() - start
+
+            checkpoint = timer.snapshot() - checkpoint_before
+            state = planner.graph.get_state(config)
+            rows.append(
+                {
+                    "backend": backend,
+                    "turn": turn,
+                    "messages": len(state.values["messages"]),
+                    "model_calls": model.calls,
+                    "wall_ms": round(wall * 1000, 3),
+                    "model_ms": round(model.model_seconds * 1000, 3),
+                    "checkpoint_ms": round(checkpoint * 1000, 3),
+                    "overhead_ms": round((wall - model.model_seconds) * 1000, 3),
+                }
+            )
+
+        checkpoints = [
+            {
+                "backend": backend,
+                "method": name,
+                "calls": calls,
+                "mean_ms": round(seconds / calls * 1000, 4) if calls else 0.0,
+            }
+            for name, (calls, seconds) in timer.totals.items()
+        ]
+    return rows, checkpoints
+
+
+def bench_memory(sizes: list[int], queries: int) -> list[dict]:
+    from src.memory import MemoryEntry, TravelMemoryStore
+
+    results = []
+    for size in sizes:
+        store = TravelMemoryStore(embedding_backend="hashing")
+        entries = [
+            (
+                "bench",
+                MemoryEntry(
+                    f"Traveller prefers destination {i % 97} with {i % 13} stars",
+                    "long_term",
+                    {"importance": "medium", "tags": [f"tag{i % 7}"]},
+                ),
+            )
+            for i in range(size)
+        ]
+
+        start = time.perf_counter()
+        store.add_memories(entries[:-100])
+        bulk_ms = (time.perf_counter() - start) * 1000
+
+        puts = []
+        for entry in entries[-100:]:
+            start = time.perf_counter()
+            store.add_memories([entry])
+            puts.append((time.perf_counter() - start) * 1000)
+
+        searches = []
+        for i in range(queries):
+            start = time.perf_counter()
+            store.search_memories("bench", f"destination {i % 97} stars", limit=5)
+            searches.append((time.perf_counter() - start) * 1000)
+
+        results.append(
+            {
+                "size": size,
+                "bulk_put_ms": round(bulk_ms, 3),
+                "put": summarize(puts),
+                "search": summarize(searches),
+            }
+        )
+    return results
+
+
+def bench_hooks(lengths: list[int], repeat: int) -> list[dict]:
+    from src.tracing import tracer
+    from src.utils import create_post_model_hook, create_pre_model_hook
+
+    config = {"configurable": {"thread_id": "bench-hooks"}}
+    results = []
+    for level in ["off", "info"]:
+        tracer.configure(level=level, sink=lambda event: None)
+        pre_hook = create_pre_model_hook("bench")
+        post_hook = create_post_model_hook("bench")
+
+        for length in lengths:
+            messages = []
+            for i in range(length // 2):
+                messages.append(
+                    HumanMessage(f"Question {i} about a trip " * 5, id=f"h{i}")
+                )
+                messages.append(
+                    AIMessage(f"Answer {i} with travel details " * 10, id=f"a{i}")
+                )
+            state = {"messages": messages}
+
+            pre, post = [], []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                pre_hook.invoke(state, config)
+                pre.append((time.perf_counter() - start) * 1000)
+                if post_hook is not None:
+                    start = time.perf_counter()
+                    post_hook.invoke(state, config)
+                    post.append((time.perf_counter() - start) * 1000)
+
+            results.append(
+                {
+                    "trace_level": level,
+                    "messages": length,
+                    "pre": summarize(pre),
+                    "post": summarize(post) if post else None,
+                }
+            )
+    tracer.configure(level="off")
+    return results
+
+
+def bench_inventory(repeat: int) -> list[dict]:
+    from src.agents.booking.inventory import from_day, get_inventory
+
+    start = time.perf_counter()
+    inventory = get_inventory()
+    load_ms = (time.perf_counter() - start) * 1000
+    # Dates relative to the inventory window, which starts a month before today
+    first = inventory.first_day + 60
+    day = from_day(first)
+    stay_end = from_day(first + 3)
+    month_end = from_day(first + 29)
+    queries = {
+        "flights_day": lambda: inventory.find_flights("London", "Rome", day),
+        "flights_month": lambda: inventory.find_flights(
+            "London", "Tokyo", day, month_end
+        ),
+        "stays": lambda: inventory.find_stays("Lisbon", day, stay_end, 2),
+        # Price calendar of every departure day and 3-7 night stay in a month
+        "round_trips_month": lambda: inventory.round_trip_fares(
+            inventory.find_flights("London", "Paris", day, month_end),
+            inventory.find_flights("Paris", "London", stay_end, from_day(first + 36)),
+            first,
+            30,
+            3,
+            7,
+        )[0].reshape(-1),
+    }
+
+    results = []
+    for name, query in queries.items():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = query()
+            timings.append((time.perf_counter() - start) * 1000)
+        results.append(
+            {
+                "query": name,
+                "rows": len(rows),
+                "inventory_rows": len(inventory.flight_keys) + len(inventory.stay_keys),
+                "load_ms": round(load_ms, 3),
+                **summarize(timings),
+            }
+        )
+    return results
+
+
+def run(args: argparse.Namespace) -> dict:
+    model = ScriptedChatModel()
+    set_llm_factory(lambda cache: model)
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        }
+    }
+
+    # Tools print every call; keep the report readable
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        # First, so the load time is measured cold and turns run on a warm inventory
+        if "inventory" in args.suites:
+            results["inventory"] = bench_inventory(args.repeat * 20)
+        if "turns" in args.suites or "checkpoints" in args.suites:
+            results["turns"], results["checkpoints"] = [], []
+            for backend in args.backends:
+                rows, checkpoints = bench_turns(model, backend, args.turns)
+                results["turns"] += rows
+                results["checkpoints"] += checkpoints
+        if "memory" in args.suites:
+            results["memory"] = bench_memory(args.memory_sizes, args.queries)
+        if "hooks" in args.suites:
+            results["hooks"] = bench_hooks(args.hook_lengths, args.repeat)
+
+    return results
+
+
+def report(results: dict) -> None:
+    if "turns" in results:
+        print(
+            f"{'backend':<8}{'turns':>7}{'messages':>10}"
+            f"{'overhead ms':>14}{'checkpoint ms':>16}"
+        )
+        for backend in sorted({row["backend"] for row in results["turns"]}):
+            rows = [row for row in results["turns"] if row["backend"] == backend]
+            for label, window in [("first", rows[:5]), ("last", rows[-5:])]:
+                print(
+                    f"{backend:<8}{label:>7}{window[-1]['messages']:>10}"
+                    f"{statistics.median(r['overhead_ms'] for r in window):>14.2f}"
+                    f"{statistics.median(r['checkpoint_ms'] for r in window):>16.2f}"
+                )
+        print()
+        for row in results["checkpoints"]:
+            print(
+                f"{row['backend']:<8}{row['method']:<12}"
+                f"{row['calls']:>7}{row['mean_ms']:>10} ms"
+            )
+        print()
+    for row in results.get("memory", []):
+        print(
+            f"memory size={row['size']:<8} put median={row['put']['median_ms']} ms"
+            f"  search median={row['search']['median_ms']} ms"
+        )
+    for row in results.get("hooks", []):
+        post = row["post"]["median_ms"] if row["post"] else "-"
+        print(
+            f"hooks trace={row['trace_level']:<5} messages={row['messages']:<6}"
+            f" pre median={row['pre']['median_ms']} ms  post median={post} ms"
+        )
+    for row in results.get("inventory", []):
+        print(
+            f"inventory {row['query']:<14} rows={row['rows']:<6}"
+            f" median={row['median_ms']} ms  p95={row['p95_ms']} ms"
+            f"  (of {row['inventory_rows']} rows, loaded in {row['load_ms']} ms)"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--suites",
+        nargs="+",
+        default=["turns", "checkpoints", "memory", "hooks", "inventory"],
+        choices=["turns", "checkpoints", "memory", "hooks", "inventory"],
+    )
+    parser.add_argument("--backends", nargs="+", default=["memory", "sqlite"])
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--memory-sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--hook-lengths", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args)
+    report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Generate a synthetic booking inventory and write it to disk.
+
+The output directory can be used as `INVENTORY_PATH`: `.npy` columns are
+memory-mapped on load, CSV is parsed (slower, but easy to inspect or edit).
+
+Usage:
+    python -m benchmarks.inventory data/inventory --flights-per-day 8
+    python -m benchmarks.inventory data/inventory-csv --days 30 --csv
+"""
+
+import argparse
+
+from src.agents.booking.inventory import generate_inventory
+from src.config import (
+    INVENTORY_DAYS,
+    INVENTORY_FLIGHTS_PER_DAY,
+    INVENTORY_PROPERTIES_PER_CITY,
+    INVENTORY_SEED,
+    INVENTORY_START,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("output", help="Directory to write the inventory to")
+    parser.add_argument("--start", default=INVENTORY_START)
+    parser.add_argument("--days", type=int, default=INVENTORY_DAYS)
+    parser.add_argument(
+        "--flights-per-day", type=int, default=INVENTORY_FLIGHTS_PER_DAY
+    )
+    parser.add_argument(
+        "--properties-per-city", type=int, default=INVENTORY_PROPERTIES_PER_CITY
+    )
+    parser.add_argument("--seed", type=int, default=INVENTORY_SEED)
+    parser.add_argument(
+        "--csv", action="store_true", help="Write CSV instead of .npy columns"
+    )
+    args = parser.parse_args()
+
+    inventory = generate_inventory(
+        args.start, args.days, args.flights_per_day, args.properties_per_city, args.seed
+    )
+    if args.csv:
+        inventory.save_csv(args.output)
+    else:
+        inventory.save(args.output)
+    print(
+        f"Wrote {len(inventory.flight_keys)} flights and {len(inventory.stay_keys)}"
+        f" accommodation rows to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
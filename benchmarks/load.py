@@ -0,0 +1,240 @@
+"""Drive many concurrent synthetic conversations through one planner process.
+
+Every session runs a multi-turn script on the shared event loop with `achat`:
+an information query, a flight search, a booking that is approved or rejected
+through the interrupt resume, and a composite trip request. The chat model is
+`ScriptedChatModel` with a configurable latency, so the numbers show how the
+graph, checkpointer and memory scale with concurrency rather than the provider.
+
+Reports throughput, p50/p95/p99 turn latency, resident memory growth per
+session and checkpointer size sampled over time.
+
+Usage:
+    python -m benchmarks.load --sessions 50 --latency 0.2 --output load.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import resource
+import tempfile
+import time
+from typing import TYPE_CHECKING
+
+os.environ.setdefault("EMBEDDING_BACKEND", "hashing")
+os.environ.setdefault("GROQ_API_KEY", "offline")
+
+from src.config import set_llm_factory  # noqa: E402
+
+from .fake_llm import ScriptedChatModel  # noqa: E402
+from .graph import git_commit, percentile  # noqa: E402
+
+if TYPE_CHECKING:
+    from src.graph import TravelPlannerGraph
+
+SCRIPT = [
+    "What's the weather in {city}?",
+    "Find me flights to {city}",
+    "Please book the flight to {city}",
+    "Plan a 3-day trip to {city}",
+]
+CITIES = ["Paris", "Rome", "Lisbon", "Tokyo", "Madrid", "Berlin", "Vienna", "Prague"]
+
+
+def rss_bytes() -> int:
+    """Current resident set size, or the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def checkpointer_size(checkpointer, path: str) -> dict[str, int]:
+    """Number of stored checkpoints and their approximate size in bytes."""
+    if hasattr(checkpointer, "storage"):
+        checkpoints = 0
+        size = 0
+        for namespaces in list(checkpointer.storage.values()):
+            for checkpoints_by_id in list(namespaces.values()):
+                for checkpoint, metadata, _ in list(checkpoints_by_id.values()):
+                    checkpoints += 1
+                    size += len(checkpoint[1]) + len(metadata[1])
+        size += sum(len(blob[1]) for blob in list(checkpointer.blobs.values()))
+        size += sum(
+            len(write[2][1])
+            for writes in list(checkpointer.writes.values())
+            for write in list(writes.values())
+        )
+        return {"checkpoints": checkpoints, "bytes": size}
+
+    with checkpointer.lock:
+        query = checkpointer.conn.execute("SELECT COUNT(*) FROM checkpoints")
+        checkpoints = query.fetchone()[0]
+    size = sum(
+        os.path.getsize(path + suffix)
+        for suffix in ["", "-wal"]
+        if os.path.exists(path + suffix)
+    )
+    return {"checkpoints": checkpoints, "bytes": size}
+
+
+async def run_session(
+    planner: "TravelPlannerGraph",
+    index: int,
+    turns: int,
+    reject_every: int,
+    latencies: list[tuple[str, float]],
+) -> None:
+    """Run one conversation, recording (kind, seconds) for every turn."""
+    conversation_id = f"load-{index}"
+    city = CITIES[index % len(CITIES)]
+
+    for turn in range(turns):
+        message = SCRIPT[turn % len(SCRIPT)].format(city=city)
+        start = time.perf_counter()
+        result = await planner.achat(message, conversation_id)
+        latencies.append(("turn", time.perf_counter() - start))
+
+        if isinstance(result, dict) and result.get("type") == "interrupt":
+            approved = not (reject_every and index % reject_every == 0)
+            start = time.perf_counter()
+            await planner.achat("", conversation_id, is_approved=approved)
+            latencies.append(("resume", time.perf_counter() - start))
+
+
+async def sample(planner, path: str, started: float, interval: float, samples: list):
+    while True:
+        samples.append(
+            {
+                "elapsed_s": round(time.perf_counter() - started, 3),
+                "rss_mb": round(rss_bytes() / 2**20, 2),
+                **checkpointer_size(planner.checkpointer, path),
+            }
+        )
+        await asyncio.sleep(interval)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    from src.graph import TravelPlannerGraph
+
+    model = ScriptedChatModel(latency=args.latency, token_latency=args.token_latency)
+    set_llm_factory(lambda cache: model)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "load.sqlite")
+        planner = TravelPlannerGraph(checkpointer=args.backend, checkpoint_path=path)
+
+        # Warm up imports, the embedder and the booking inventory (the largest
+        # lazy allocation) so the measured growth is per session only
+        await planner.achat("What's the weather in Paris?", "warmup")
+        await planner.achat("Find me flights to Paris", "warmup")
+        baseline_rss = rss_bytes()
+
+        latencies: list[tuple[str, float]] = []
+        samples: list[dict] = []
+        started = time.perf_counter()
+        sampler = asyncio.create_task(
+            sample(planner, path, started, args.sample_interval, samples)
+        )
+        await asyncio.gather(
+            *[
+                run_session(planner, i, args.turns, args.reject_every, latencies)
+                for i in range(args.sessions)
+            ]
+        )
+        elapsed = time.perf_counter() - started
+        sampler.cancel()
+        samples.append(
+            {
+                "elapsed_s": round(elapsed, 3),
+                "rss_mb": round(rss_bytes() / 2**20, 2),
+                **checkpointer_size(planner.checkpointer, path),
+            }
+        )
+
+    summary = {}
+    for kind in ["turn", "resume"]:
+        values = [seconds * 1000 for k, seconds in latencies if k == kind]
+        if values:
+            summary[kind] = {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 0.50), 2),
+                "p95_ms": round(percentile(values, 0.95), 2),
+                "p99_ms": round(percentile(values, 0.99), 2),
+            }
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.time(),
+            "sessions": args.sessions,
+            "turns": args.turns,
+            "latency_s": args.latency,
+            "backend": args.backend,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "throughput_turns_per_s": round(len(latencies) / elapsed, 2),
+        "model_calls": model.calls,
+        "latency": summary,
+        "rss_growth_per_session_kb": round(
+            (samples[-1]["rss_mb"] * 2**20 - baseline_rss) / args.sessions / 1024, 2
+        ),
+        "samples": samples,
+    }
+
+
+def report(results: dict) -> None:
+    meta = results["meta"]
+    print(
+        f"{meta['sessions']} sessions x {meta['turns']} turns on {meta['backend']}"
+        f" (model latency {meta['latency_s']}s) in {results['elapsed_s']}s"
+    )
+    print(f"throughput: {results['throughput_turns_per_s']} turns/s")
+    for kind, stats in results["latency"].items():
+        print(
+            f"{kind:<7} n={stats['count']:<6} p50={stats['p50_ms']} ms"
+            f"  p95={stats['p95_ms']} ms  p99={stats['p99_ms']} ms"
+        )
+    print(f"rss growth per session: {results['rss_growth_per_session_kb']} KB")
+    print(f"{'elapsed s':>10}{'rss MB':>10}{'checkpoints':>13}{'bytes':>12}")
+    for row in results["samples"]:
+        print(
+            f"{row['elapsed_s']:>10}{row['rss_mb']:>10}"
+            f"{row['checkpoints']:>13}{row['bytes']:>12}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--turns", type=int, default=8)
+    parser.add_argument(
+        "--latency", type=float, default=0.2, help="Seconds per model call"
+    )
+    parser.add_argument("--token-latency", type=float, default=0.0)
+    parser.add_argument("--backend", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument(
+        "--reject-every",
+        type=int,
+        default=3,
+        help="Reject the booking in every Nth session (0 approves all)",
+    )
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    # Tools print every call; keep the report readable
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results = asyncio.run(run(args))
+    report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
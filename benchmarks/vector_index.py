@@ -0,0 +1,153 @@
+"""Benchmark memory search latency against namespace size.
+
+Compares the NumPy index behind TravelMemoryStore (exact and IVF modes) with
+the per-item scan of langgraph's InMemoryStore on random 384-dim vectors.
+
+Usage:
+    python -m benchmarks.vector_index --sizes 1000 10000 100000 \
+        --output vector_index.json
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langgraph.store.memory import InMemoryStore
+
+from src.vector_index import NamespaceIndex
+
+DIMS = 384
+
+
+class LookupEmbeddings(Embeddings):
+    """Returns precomputed vectors so the baseline measures search only."""
+
+    def __init__(self, vectors: dict[str, list[float]]):
+        self.vectors = vectors
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.vectors[text] for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.vectors[text]
+
+
+def time_queries(search, queries: np.ndarray) -> dict[str, float]:
+    """Median and p95 latency in milliseconds of `search` over the queries."""
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {
+        "median_ms": round(statistics.median(latencies), 4),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 4),
+    }
+
+
+def clustered_vectors(rng: np.random.Generator, size: int) -> np.ndarray:
+    """Random vectors grouped around topics, like real memory embeddings."""
+    centers = rng.normal(size=(64, DIMS))
+    labels = rng.integers(0, len(centers), size)
+    return (centers[labels] + 0.5 * rng.normal(size=(size, DIMS))).astype(np.float32)
+
+
+def run(sizes: list[int], queries: int, k: int, baseline_max: int) -> list[dict]:
+    rng = np.random.default_rng(0)
+    results = []
+
+    for size in sizes:
+        vectors = clustered_vectors(rng, size)
+        keys = [f"memory_{i}" for i in range(size)]
+        query_vectors = vectors[rng.integers(0, size, queries)] + 0.1 * rng.normal(
+            size=(queries, DIMS)
+        )
+
+        exact = NamespaceIndex(DIMS)
+        start = time.perf_counter()
+        exact.add(keys, vectors)
+        build_ms = (time.perf_counter() - start) * 1000
+        results.append(
+            {"index": "exact", "size": size, "build_ms": round(build_ms, 2)}
+            | time_queries(lambda q: exact.search(q, k), query_vectors)
+        )
+
+        ivf = NamespaceIndex(DIMS, ivf_threshold=1)
+        start = time.perf_counter()
+        ivf.add(keys, vectors)
+        build_ms = (time.perf_counter() - start) * 1000
+        truth = [{key for key, _ in exact.search(q, k)} for q in query_vectors]
+        found = [{key for key, _ in ivf.search(q, k)} for q in query_vectors]
+        recall = sum(len(t & f) for t, f in zip(truth, found)) / (k * queries)
+        results.append(
+            {
+                "index": "ivf",
+                "size": size,
+                "build_ms": round(build_ms, 2),
+                "recall": round(recall, 4),
+            }
+            | time_queries(lambda q: ivf.search(q, k), query_vectors)
+        )
+
+        if size <= baseline_max:
+            lookup = {key: vector.tolist() for key, vector in zip(keys, vectors)}
+            lookup |= {f"query_{i}": q.tolist() for i, q in enumerate(query_vectors)}
+            store = InMemoryStore(
+                index={
+                    "embed": LookupEmbeddings(lookup),
+                    "dims": DIMS,
+                    "fields": ["text"],
+                }
+            )
+            start = time.perf_counter()
+            for key in keys:
+                store.put(("bench", "memories"), key, {"text": key})
+            build_ms = (time.perf_counter() - start) * 1000
+            query_ids = iter(range(queries))
+            results.append(
+                {"index": "inmemorystore", "size": size, "build_ms": round(build_ms, 2)}
+                | time_queries(
+                    lambda q: store.search(
+                        ("bench", "memories"), query=f"query_{next(query_ids)}", limit=k
+                    ),
+                    query_vectors,
+                )
+            )
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--baseline-max", type=int, default=10_000)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.queries, args.k, args.baseline_max)
+
+    print(
+        f"{'index':<14}{'size':>10}{'build ms':>12}"
+        f"{'median ms':>12}{'p95 ms':>10}{'recall':>8}"
+    )
+    for row in results:
+        print(
+            f"{row['index']:<14}{row['size']:>10}{row['build_ms']:>12}"
+            f"{row['median_ms']:>12}{row['p95_ms']:>10}{row.get('recall', ''):>8}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,25 @@
 """Booking agent implementation."""
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.prebuilt import create_react_agent
 
 from ...config import get_llm_model
-from ...utils import debug_hook, human_in_the_loop
+from ...tracing import tracer
+from ...utils import create_pre_model_hook, human_in_the_loop
 from .constants import BOOKING_AGENT_PROMPT
 from .tools import (
     confirm_accommodation_booking,
     confirm_flight_booking,
+    plan_multi_city_trip,
     search_accommodations,
+    search_flight_calendar,
     search_flights,
 )
 
 
-def post_model_hook(state):
+def post_model_hook(state, config: RunnableConfig):
     """Post-model hook for the booking agent."""
-    debug_hook(state, "BOOKING_POST")
+    tracer.model_end(state, "booking_agent", config)
     return human_in_the_loop(
         state, ["confirm_accommodation_booking", "confirm_flight_booking"]
     )
@@ -24,15 +28,17 @@ def post_model_hook(state):
 def create_booking_agent():
     """Create the booking agent for accommodations and flights."""
     return create_react_agent(
-        model=get_llm_model(),
+        model=get_llm_model(cache=False),
         tools=[
             search_accommodations,
             search_flights,
+            search_flight_calendar,
+            plan_multi_city_trip,
             confirm_accommodation_booking,
             confirm_flight_booking,
         ],
         prompt=BOOKING_AGENT_PROMPT,
         name="booking_agent",
-        pre_model_hook=lambda state: debug_hook(state, "BOOKING_PRE"),
+        pre_model_hook=create_pre_model_hook("booking_agent"),
         post_model_hook=post_model_hook,
     )
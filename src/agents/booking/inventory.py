@@ -0,0 +1,853 @@
+"""Columnar flight and accommodation inventory with sorted-key indexes.
+
+Each table is a set of equal-length NumPy columns, with strings stored as codes
+into a shared vocabulary. Rows are sorted by an integer key so a lookup is two
+binary searches (`np.searchsorted`) followed by vectorized filters on the
+matching slice:
+
+    flights   (origin, destination, day)   -> a route's flights on a date range
+    stays     (destination, capacity)      -> properties that fit the guests,
+                                              then filtered on availability
+
+An inventory is read from a directory holding either `.npy` columns written by
+`Inventory.save` (memory-mapped, so opening it is instant and pages are shared
+between worker processes) or `flights` and `accommodations` tables as CSV or
+Parquet (Parquet needs pyarrow). Without `INVENTORY_PATH`, a deterministic
+synthetic inventory is generated on first use (`benchmarks/inventory.py` writes
+one to disk).
+"""
+
+import csv
+import json
+import math
+import os
+import threading
+from datetime import date, timedelta
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ...config import (
+    INVENTORY_DAYS,
+    INVENTORY_FLIGHTS_PER_DAY,
+    INVENTORY_PATH,
+    INVENTORY_PROPERTIES_PER_CITY,
+    INVENTORY_SEED,
+    INVENTORY_START,
+)
+from .schemas import Accommodation, Flight
+
+FLIGHT_COLUMNS = {
+    "origin": np.int16,
+    "destination": np.int16,
+    "day": np.int32,
+    "departure_minute": np.int16,
+    "duration_minutes": np.int16,
+    "stops": np.int8,
+    "price": np.float32,
+    "rating": np.float32,
+    "airline": np.int16,
+    "travel_class": np.int16,
+}
+STAY_COLUMNS = {
+    "destination": np.int16,
+    "name": np.int32,
+    "type": np.int16,
+    "price_per_night": np.float32,
+    "rating": np.float32,
+    "capacity": np.int16,
+    "available_from": np.int32,
+    "available_to": np.int32,
+    "amenities": np.uint16,
+    "pros": np.int16,
+    "cons": np.int16,
+}
+# String columns and the vocabulary their codes refer to
+FLIGHT_VOCAB = {
+    "origin": "cities",
+    "destination": "cities",
+    "airline": "airlines",
+    "travel_class": "classes",
+}
+STAY_VOCAB = {
+    "destination": "cities",
+    "name": "names",
+    "type": "types",
+    "pros": "pros",
+    "cons": "cons",
+}
+VOCABS = ["cities", "airlines", "classes", "names", "types", "pros", "cons"]
+COASTAL_CITIES = {"Lisbon", "Barcelona", "Athens", "Dubai", "Miami", "Bali", "Sydney"}
+AMENITIES = [
+    "WiFi",
+    "Breakfast",
+    "Pool",
+    "Beach",
+    "Spa",
+    "Gym",
+    "Parking",
+    "Kitchen",
+    "Air conditioning",
+    "Restaurant",
+    "Bar",
+    "Pet friendly",
+]
+
+# Synthetic data: city, latitude, longitude
+CITIES = [
+    ("London", 51.5, -0.1),
+    ("Paris", 48.9, 2.4),
+    ("Rome", 41.9, 12.5),
+    ("Lisbon", 38.7, -9.1),
+    ("Madrid", 40.4, -3.7),
+    ("Barcelona", 41.4, 2.2),
+    ("Berlin", 52.5, 13.4),
+    ("Vienna", 48.2, 16.4),
+    ("Prague", 50.1, 14.4),
+    ("Amsterdam", 52.4, 4.9),
+    ("Dublin", 53.3, -6.3),
+    ("Athens", 38.0, 23.7),
+    ("Istanbul", 41.0, 29.0),
+    ("Dubai", 25.2, 55.3),
+    ("New York", 40.7, -74.0),
+    ("Los Angeles", 34.1, -118.2),
+    ("Miami", 25.8, -80.2),
+    ("Toronto", 43.7, -79.4),
+    ("Mexico City", 19.4, -99.1),
+    ("Tokyo", 35.7, 139.7),
+    ("Bangkok", 13.8, 100.5),
+    ("Singapore", 1.4, 103.8),
+    ("Bali", -8.7, 115.2),
+    ("Sydney", -33.9, 151.2),
+]
+CITY_ALIASES = {
+    "nyc": "New York",
+    "jfk": "New York",
+    "la": "Los Angeles",
+    "lax": "Los Angeles",
+    "lhr": "London",
+    "cdg": "Paris",
+    "fco": "Rome",
+    "lis": "Lisbon",
+    "mad": "Madrid",
+    "bcn": "Barcelona",
+    "ber": "Berlin",
+    "ams": "Amsterdam",
+    "dxb": "Dubai",
+    "hnd": "Tokyo",
+    "nrt": "Tokyo",
+    "bkk": "Bangkok",
+    "sin": "Singapore",
+    "dps": "Bali",
+    "syd": "Sydney",
+}
+# Name, price factor, mean rating
+AIRLINES = [
+    ("SkyWings", 1.0, 4.1),
+    ("Demo Airways", 1.1, 4.3),
+    ("Budget Air", 0.7, 3.6),
+    ("Blue Horizon", 0.95, 4.0),
+    ("AeroLux", 1.4, 4.7),
+    ("Northern Star", 0.85, 3.9),
+]
+# Class, price factor, share of flights
+CLASSES = [
+    ("Economy", 1.0, 0.8),
+    ("Premium Economy", 1.6, 0.12),
+    ("Business", 3.5, 0.08),
+]
+# Type, price factor, guests, typical amenity bits
+STAY_TYPES = [
+    ("Hotel", 1.0, 2, 0b000001100011),
+    ("Resort", 1.8, 4, 0b011000111111),
+    ("Apartment", 0.9, 4, 0b000011000001),
+    ("Hostel", 0.35, 1, 0b000000000001),
+    ("Boutique Hotel", 1.4, 2, 0b011000010011),
+    ("Villa", 2.5, 6, 0b000011000101),
+]
+NAME_PREFIXES = [
+    "Grand",
+    "Royal",
+    "Sunset",
+    "Harbor",
+    "Garden",
+    "Central",
+    "Old Town",
+    "Riverside",
+    "Skyline",
+    "Palm",
+    "Seaside",
+    "Hilltop",
+    "Park",
+    "Crown",
+    "Lighthouse",
+    "Orchard",
+]
+PROS = ["Excellent reviews", "Beachfront", "Affordable", "Great location", "Spacious"]
+CONS = ["Expensive", "Basic facilities", "Busy area", "Far from center", "Small rooms"]
+
+
+def normalize_city(city: str) -> str:
+    """Case-insensitive city key without the country: "paris, france" -> "paris"."""
+    return " ".join(city.split(",")[0].casefold().split())
+
+
+def to_day(value: str | date) -> int:
+    """Days since 1970-01-01 for an ISO date string or a date."""
+    if isinstance(value, str):
+        value = date.fromisoformat(value.strip())
+    return (value - date(1970, 1, 1)).days
+
+
+def from_day(day: int) -> str:
+    return (date(1970, 1, 1) + timedelta(days=int(day))).isoformat()
+
+
+def _amenity_names(mask: int) -> list[str]:
+    return [name for bit, name in enumerate(AMENITIES) if mask >> bit & 1]
+
+
+def _amenity_mask(names: list[str]) -> int:
+    lookup = {name.casefold(): bit for bit, name in enumerate(AMENITIES)}
+    return sum(
+        1 << lookup[name.casefold()] for name in names if name.casefold() in lookup
+    )
+
+
+def _sorted(
+    columns: dict[str, np.ndarray], keys: np.ndarray
+) -> tuple[dict, np.ndarray]:
+    if np.all(keys[1:] >= keys[:-1]):
+        return columns, keys
+    order = np.argsort(keys, kind="stable")
+    return {name: column[order] for name, column in columns.items()}, keys[order]
+
+
+class Inventory:
+    """Flights and accommodations held as sorted NumPy columns.
+
+    Query methods return row indexes, so callers can apply further vectorized
+    work (ranking, aggregation) to the columns before building any Python
+    objects; `flight` and `stay` turn a row into the booking schemas.
+    """
+
+    def __init__(
+        self,
+        flights: dict[str, np.ndarray],
+        stays: dict[str, np.ndarray],
+        vocab: dict[str, list[str]],
+        flight_keys: np.ndarray | None = None,
+        stay_keys: np.ndarray | None = None,
+    ):
+        self.vocab = vocab
+        self.city_codes = {
+            normalize_city(city): code for code, city in enumerate(vocab["cities"])
+        }
+        for alias, city in CITY_ALIASES.items():
+            if normalize_city(city) in self.city_codes:
+                self.city_codes.setdefault(alias, self.city_codes[normalize_city(city)])
+
+        days = flights["day"]
+        self.first_day = int(days.min()) if len(days) else 0
+        self.day_span = int(days.max()) - self.first_day + 1 if len(days) else 1
+        self.last_day = self.first_day + self.day_span - 1
+        capacities = stays["capacity"]
+        self.max_capacity = int(capacities.max()) if len(capacities) else 0
+
+        if flight_keys is None:
+            flights, flight_keys = _sorted(
+                flights,
+                self._flight_key(flights["origin"], flights["destination"], days),
+            )
+        if stay_keys is None:
+            stays, stay_keys = _sorted(
+                stays, self._stay_key(stays["destination"], stays["capacity"])
+            )
+        self.flights, self.flight_keys = flights, flight_keys
+        self.stays, self.stay_keys = stays, stay_keys
+
+    # Keys
+
+    def _flight_key(self, origin, destination, day):
+        cities = len(self.vocab["cities"])
+        route = np.asarray(origin, dtype=np.int64) * cities + np.asarray(
+            destination, dtype=np.int64
+        )
+        return route * self.day_span + (
+            np.asarray(day, dtype=np.int64) - self.first_day
+        )
+
+    def _stay_key(self, destination, capacity):
+        destination = np.asarray(destination, dtype=np.int64)
+        capacity = np.asarray(capacity, dtype=np.int64)
+        return destination * (self.max_capacity + 1) + capacity
+
+    def city_code(self, city: str) -> int:
+        code = self.city_codes.get(normalize_city(city))
+        if code is None:
+            known = ", ".join(self.vocab["cities"])
+            raise ValueError(f"No inventory for '{city}'. Known cities: {known}")
+        return code
+
+    def covers(self, *dates: str | date | None) -> bool:
+        """Whether every given date (None is skipped) is inside the inventory."""
+        return all(
+            self.first_day <= to_day(value) <= self.last_day
+            for value in dates
+            if value is not None
+        )
+
+    # Queries
+
+    def find_flights(
+        self,
+        origin: str,
+        destination: str,
+        start: str | date,
+        end: str | date | None = None,
+        max_stops: int | None = None,
+        max_price: float | None = None,
+    ) -> np.ndarray:
+        """Rows of flights on a route departing from `start` to `end` inclusive."""
+        origin_code = self.city_code(origin)
+        destination_code = self.city_code(destination)
+        first = max(to_day(start), self.first_day)
+        last = to_day(end if end is not None else start)
+        last = min(last, self.last_day)
+        if first > last:
+            return np.empty(0, dtype=np.int64)
+
+        low, high = self._flight_key(origin_code, destination_code, [first, last + 1])
+        begin, stop = np.searchsorted(self.flight_keys, [low, high])
+        rows = np.arange(begin, stop)
+
+        mask = np.ones(len(rows), dtype=bool)
+        if max_stops is not None:
+            mask &= self.flights["stops"][begin:stop] <= max_stops
+        if max_price is not None:
+            mask &= self.flights["price"][begin:stop] <= max_price
+        return rows[mask]
+
+    def find_stays(
+        self,
+        destination: str,
+        check_in: str | date,
+        check_out: str | date | None,
+        guests: int,
+        max_price: float | None = None,
+        min_rating: float | None = None,
+    ) -> np.ndarray:
+        """Rows of properties for `guests` people available for the whole stay.
+
+        A property's availability may be split into back-to-back blocks (e.g.
+        seasonal prices); a stay spanning them matches once, through the block
+        containing the check-in day.
+        """
+        code = self.city_code(destination)
+        first = to_day(check_in)
+        last = max(to_day(check_out) if check_out else first, first + 1)
+        if guests > self.max_capacity:
+            return np.empty(0, dtype=np.int64)
+
+        low, high = self._stay_key([code, code + 1], [max(guests, 0), 0])
+        begin, stop = np.searchsorted(self.stay_keys, [low, high])
+        starts = self.stays["available_from"][begin:stop]
+        ends = self.stays["available_to"][begin:stop]
+        # Blocks sharing a night with the stay, grouped per property and sorted by start
+        rows = begin + np.flatnonzero((starts < last) & (ends > first))
+        properties = self.stays["name"][rows]
+        order = np.lexsort((self.stays["available_from"][rows], properties))
+        rows, properties = rows[order], properties[order]
+        starts = self.stays["available_from"][rows]
+        ends = self.stays["available_to"][rows]
+
+        # A property matches if its first block covers check-in and no gap follows
+        new = np.ones(len(rows), dtype=bool)
+        new[1:] = properties[1:] != properties[:-1]
+        heads = np.flatnonzero(new)
+        gaps = np.zeros(len(heads), dtype=bool)
+        gaps[np.cumsum(new)[1:][~new[1:] & (starts[1:] > ends[:-1])] - 1] = True
+        covered = (starts[heads] <= first) & ~gaps
+        if len(heads):
+            covered &= np.maximum.reduceat(ends, heads) >= last
+        rows = rows[heads[covered]]
+
+        mask = np.ones(len(rows), dtype=bool)
+        if max_price is not None:
+            mask &= self.stays["price_per_night"][rows] <= max_price
+        if min_rating is not None:
+            mask &= self.stays["rating"][rows] >= min_rating
+        return rows[mask]
+
+    def round_trips(
+        self, rows: np.ndarray, return_rows: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Outbound rows paired with the cheapest return on the same airline.
+
+        Returns the outbound rows whose airline flies back among `return_rows`,
+        the return row paired with each, and their round-trip prices.
+        """
+        airline = self.flights["airline"]
+        price = self.flights["price"]
+        # Sorting by airline then price puts each airline's cheapest return first
+        order = np.lexsort((price[return_rows], airline[return_rows]))
+        return_rows = return_rows[order]
+        airlines = airline[return_rows]
+        first = np.ones(len(return_rows), dtype=bool)
+        first[1:] = airlines[1:] != airlines[:-1]
+        cheapest = np.full(len(self.vocab["airlines"]), -1, dtype=np.int64)
+        cheapest[airlines[first]] = return_rows[first]
+
+        paired = cheapest[airline[rows]]
+        available = paired >= 0
+        rows, paired = rows[available], paired[available]
+        return rows, paired, price[rows].astype(np.float64) + price[paired]
+
+    def cheapest_by_day(
+        self,
+        rows: np.ndarray,
+        first_day: int,
+        days: int,
+        costs: np.ndarray | None = None,
+        by_airline: bool = False,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Lowest cost per departure day of flight rows, and the row that has it.
+
+        `rows` must depart within `days` days from `first_day`; `costs` defaults
+        to their prices. With `by_airline` the result has one line per airline.
+        Days without flights get an infinite cost and row -1.
+        """
+        costs = (
+            self.flights["price"][rows].astype(np.float64) if costs is None else costs
+        )
+        slots = (self.flights["day"][rows] - first_day).astype(np.int64)
+        shape = (days,)
+        if by_airline:
+            shape = (len(self.vocab["airlines"]), days)
+            slots += self.flights["airline"][rows].astype(np.int64) * days
+
+        # Sorting by slot then cost puts each slot's cheapest row first
+        order = np.lexsort((costs, slots))
+        slots, costs, rows = slots[order], costs[order], rows[order]
+        first = np.ones(len(slots), dtype=bool)
+        first[1:] = slots[1:] != slots[:-1]
+
+        best = np.full(shape, np.inf)
+        best_rows = np.full(shape, -1, dtype=np.int64)
+        best.reshape(-1)[slots[first]] = costs[first]
+        best_rows.reshape(-1)[slots[first]] = rows[first]
+        return best, best_rows
+
+    def round_trip_fares(
+        self,
+        rows: np.ndarray,
+        return_rows: np.ndarray,
+        first_day: int,
+        days: int,
+        min_nights: int,
+        max_nights: int,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Cheapest same-airline round trip per departure day and stay length.
+
+        `rows` depart within `days` days from `first_day` and `return_rows`
+        `min_nights` to `max_nights` nights later. Returns the prices, outbound
+        rows and return rows, each shaped (days, stay lengths); combinations
+        without flights cost inf.
+        """
+        lengths = max_nights - min_nights + 1
+        out_prices, out_rows = self.cheapest_by_day(
+            rows, first_day, days, by_airline=True
+        )
+        back_prices, back_rows = self.cheapest_by_day(
+            return_rows, first_day + min_nights, days + lengths - 1, by_airline=True
+        )
+        # totals[airline, day, length]: out on `day`, back `min_nights + length`
+        # nights later
+        totals = out_prices[:, :, None] + sliding_window_view(
+            back_prices, lengths, axis=1
+        )
+        airline = totals.argmin(axis=0)
+        day, length = np.indices(airline.shape)
+        return (
+            totals[airline, day, length],
+            out_rows[airline, day],
+            back_rows[airline, day + length],
+        )
+
+    # Rows as schemas
+
+    def flight(self, row: int, price: float | None = None) -> Flight:
+        columns = self.flights
+        minute = int(columns["departure_minute"][row])
+        duration = int(columns["duration_minutes"][row])
+        return Flight(
+            airline=self.vocab["airlines"][columns["airline"][row]],
+            price=round(float(columns["price"][row] if price is None else price), 2),
+            rating=round(float(columns["rating"][row]), 1),
+            departure_time=f"{minute // 60:02d}:{minute % 60:02d}",
+            duration=f"{duration // 60}h {duration % 60:02d}m",
+            stops=int(columns["stops"][row]),
+            travel_class=self.vocab["classes"][columns["travel_class"][row]],
+        )
+
+    def stay(self, row: int) -> Accommodation:
+        columns = self.stays
+        return Accommodation(
+            name=self.vocab["names"][columns["name"][row]],
+            type=self.vocab["types"][columns["type"][row]],
+            price_per_night=round(float(columns["price_per_night"][row]), 2),
+            rating=round(float(columns["rating"][row]), 1),
+            amenities=_amenity_names(int(columns["amenities"][row])),
+            pros=self.vocab["pros"][columns["pros"][row]],
+            cons=self.vocab["cons"][columns["cons"][row]],
+        )
+
+    # Storage
+
+    def save(self, path: str) -> None:
+        """Write the sorted columns as `.npy` files for memory-mapped loading."""
+        for table, columns, keys in [
+            ("flights", self.flights, self.flight_keys),
+            ("stays", self.stays, self.stay_keys),
+        ]:
+            os.makedirs(os.path.join(path, table), exist_ok=True)
+            for name, column in {**columns, "key": keys}.items():
+                np.save(
+                    os.path.join(path, table, f"{name}.npy"),
+                    np.ascontiguousarray(column),
+                )
+        with open(os.path.join(path, "vocab.json"), "w", encoding="utf-8") as f:
+            json.dump(self.vocab, f, ensure_ascii=False)
+
+    def save_csv(self, path: str) -> None:
+        """Write `flights.csv` and `accommodations.csv` readable by `load`."""
+        os.makedirs(path, exist_ok=True)
+        for filename, columns, vocab_columns in [
+            ("flights.csv", self.flights, FLIGHT_VOCAB),
+            ("accommodations.csv", self.stays, STAY_VOCAB),
+        ]:
+            with open(
+                os.path.join(path, filename), "w", newline="", encoding="utf-8"
+            ) as f:
+                writer = csv.writer(f)
+                writer.writerow(list(columns))
+                for row in range(len(next(iter(columns.values())))):
+                    writer.writerow(
+                        [
+                            self._csv_value(name, columns[name][row], vocab_columns)
+                            for name in columns
+                        ]
+                    )
+
+    def _csv_value(self, name: str, value, vocab_columns: dict[str, str]) -> str:
+        if name in vocab_columns:
+            return self.vocab[vocab_columns[name]][value]
+        if name in ("day", "available_from", "available_to"):
+            return from_day(value)
+        if name == "amenities":
+            return ";".join(_amenity_names(int(value)))
+        return str(value.item())
+
+    @classmethod
+    def load(cls, path: str) -> "Inventory":
+        """Open an inventory directory, memory-mapping `.npy` columns when present."""
+        if os.path.exists(os.path.join(path, "vocab.json")):
+            with open(os.path.join(path, "vocab.json"), encoding="utf-8") as f:
+                vocab = json.load(f)
+            tables = {}
+            for table, schema in [("flights", FLIGHT_COLUMNS), ("stays", STAY_COLUMNS)]:
+                tables[table] = {
+                    name: np.load(
+                        os.path.join(path, table, f"{name}.npy"), mmap_mode="r"
+                    )
+                    for name in [*schema, "key"]
+                }
+            flight_keys = tables["flights"].pop("key")
+            stay_keys = tables["stays"].pop("key")
+            return cls(
+                tables["flights"], tables["stays"], vocab, flight_keys, stay_keys
+            )
+
+        flights = _read_table(path, "flights")
+        stays = _read_table(path, "accommodations")
+        return cls.from_records(flights, stays)
+
+    @classmethod
+    def from_records(
+        cls, flights: dict[str, list], stays: dict[str, list]
+    ) -> "Inventory":
+        """Build an inventory from string-valued columns as read from CSV or Parquet."""
+        vocab: dict[str, list[str]] = {name: [] for name in VOCABS}
+        codes: dict[str, dict[str, int]] = {name: {} for name in vocab}
+
+        def encode(values: list, vocab_name: str) -> list[int]:
+            lookup, words = codes[vocab_name], vocab[vocab_name]
+            encoded = []
+            for value in values:
+                value = str(value).strip()
+                if value not in lookup:
+                    lookup[value] = len(words)
+                    words.append(value)
+                encoded.append(lookup[value])
+            return encoded
+
+        def convert(
+            columns: dict[str, list], schema: dict, vocab_columns: dict
+        ) -> dict:
+            converted = {}
+            for name, dtype in schema.items():
+                values = columns[name]
+                if name in vocab_columns:
+                    values = encode(values, vocab_columns[name])
+                elif name in ("day", "available_from", "available_to"):
+                    values = [to_day(str(value)) for value in values]
+                elif name == "amenities":
+                    values = [
+                        _amenity_mask(str(value or "").split(";")) for value in values
+                    ]
+                elif name == "departure_minute" and values and ":" in str(values[0]):
+                    values = [int(str(v)[:2]) * 60 + int(str(v)[3:5]) for v in values]
+                if dtype == np.float32:
+                    values = np.asarray(values, dtype=np.float64)
+                converted[name] = np.asarray(values).astype(dtype)
+            return converted
+
+        return cls(
+            convert(flights, FLIGHT_COLUMNS, FLIGHT_VOCAB),
+            convert(stays, STAY_COLUMNS, STAY_VOCAB),
+            vocab,
+        )
+
+
+def _read_table(path: str, name: str) -> dict[str, list]:
+    """Read `<name>.parquet` or `<name>.csv` from `path` as columns of values."""
+    parquet = os.path.join(path, f"{name}.parquet")
+    if os.path.exists(parquet):
+        import pyarrow.parquet as pq
+
+        return pq.read_table(parquet).to_pydict()
+
+    with open(os.path.join(path, f"{name}.csv"), newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = list(reader)
+    return {column: [row[i] for row in rows] for i, column in enumerate(header)}
+
+
+def _synthetic_flights(
+    rng: np.random.Generator,
+    origin: int,
+    first_day: int,
+    days: int,
+    flights_per_day: int,
+) -> dict[str, np.ndarray]:
+    """Flights from one origin to every other city, ordered by destination and day."""
+    latitude = np.radians([lat for _, lat, _ in CITIES])
+    longitude = np.radians([lon for _, _, lon in CITIES])
+    destinations = np.delete(np.arange(len(CITIES)), origin)
+    # Great-circle distance in km
+    distance = 6371 * np.arccos(
+        np.clip(
+            np.sin(latitude[origin]) * np.sin(latitude[destinations])
+            + np.cos(latitude[origin])
+            * np.cos(latitude[destinations])
+            * np.cos(longitude[origin] - longitude[destinations]),
+            -1,
+            1,
+        )
+    )
+
+    per_route = days * flights_per_day
+    size = len(destinations) * per_route
+    destination = np.repeat(destinations, per_route)
+    day = first_day + np.tile(
+        np.repeat(np.arange(days), flights_per_day), len(destinations)
+    )
+    km = np.repeat(distance, per_route)
+
+    airline = rng.integers(0, len(AIRLINES), size)
+    airline_price = np.array([factor for _, factor, _ in AIRLINES])
+    airline_rating = np.array([rating for _, _, rating in AIRLINES])
+    class_share = np.cumsum([share for _, _, share in CLASSES])
+    travel_class = np.minimum(
+        np.searchsorted(class_share, rng.random(size)), len(CLASSES) - 1
+    )
+    class_price = np.array([factor for _, factor, _ in CLASSES])
+    draw = rng.random(size)
+    long_haul_stops = (draw > 0.4).astype(int) + (draw > 0.85)
+    stops = np.where(km > 4000, long_haul_stops, (draw > 0.75).astype(int))
+
+    season = 1 + 0.2 * np.cos(2 * math.pi * (day % 365.25 - 196) / 365.25)
+    weekday = (day + 3) % 7  # 1970-01-01 was a Thursday
+    weekend = np.where((weekday == 4) | (weekday == 6), 1.12, 1.0)
+    price = (
+        (45 + 0.085 * km)
+        * airline_price[airline]
+        * class_price[travel_class]
+        * (1 - 0.12 * stops)
+        * season
+        * weekend
+        * rng.lognormal(0, 0.18, size)
+    )
+
+    flights = {
+        "origin": np.full(size, origin),
+        "destination": destination,
+        "day": day,
+        "departure_minute": rng.integers(5 * 12, 23 * 12, size) * 5,
+        "duration_minutes": (
+            35 + km / 800 * 60 + stops * rng.integers(50, 200, size)
+        ).round(),
+        "stops": stops,
+        "price": price.round(),
+        "rating": np.clip(rng.normal(airline_rating[airline], 0.25), 2.5, 5.0).round(1),
+        "airline": airline,
+        "travel_class": travel_class,
+    }
+    return {
+        name: values.astype(FLIGHT_COLUMNS[name]) for name, values in flights.items()
+    }
+
+
+def generate_inventory(
+    start: str = INVENTORY_START,
+    days: int = INVENTORY_DAYS,
+    flights_per_day: int = INVENTORY_FLIGHTS_PER_DAY,
+    properties_per_city: int = INVENTORY_PROPERTIES_PER_CITY,
+    seed: int = INVENTORY_SEED,
+) -> Inventory:
+    """Deterministic synthetic inventory over `CITIES`.
+
+    Every ordered city pair gets `flights_per_day` flights on each of `days`
+    days, priced by distance, airline, class, stops, season and weekday. Each
+    city gets `properties_per_city` properties whose availability is split into
+    blocks with occasional gaps.
+    """
+    rng = np.random.default_rng(seed)
+    first_day = to_day(start)
+    cities = len(CITIES)
+
+    # One origin at a time keeps the float64 temporaries small
+    chunks = [
+        _synthetic_flights(rng, origin, first_day, days, flights_per_day)
+        for origin in range(cities)
+    ]
+    flights = {
+        name: np.concatenate([chunk[name] for chunk in chunks])
+        for name in FLIGHT_COLUMNS
+    }
+    del chunks
+
+    # Properties, then their availability blocks
+    properties = cities * properties_per_city
+    property_city = np.repeat(np.arange(cities), properties_per_city)
+    stay_type = rng.integers(0, len(STAY_TYPES), properties)
+    type_price = np.array([factor for _, factor, _, _ in STAY_TYPES])
+    type_guests = np.array([guests for _, _, guests, _ in STAY_TYPES])
+    type_amenities = np.array([bits for _, _, _, bits in STAY_TYPES])
+    guests = type_guests[stay_type]
+    capacity = guests + rng.integers(0, 2, properties) * (guests > 1)
+    amenities = (
+        type_amenities[stay_type] & rng.integers(0, 1 << len(AMENITIES), properties)
+    ) | 1
+    beach = 1 << AMENITIES.index("Beach")
+    coastal = np.isin(
+        property_city,
+        [i for i, (name, *_) in enumerate(CITIES) if name in COASTAL_CITIES],
+    )
+    amenities = np.where(
+        coastal & (rng.random(properties) < 0.5), amenities | beach, amenities
+    )
+    rating = np.clip(rng.normal(4.1, 0.45, properties), 2.5, 5.0).round(1)
+    base_price = (
+        110
+        * type_price[stay_type]
+        * rng.lognormal(0, 0.3, properties)
+        * (1 + (rating - 4) * 0.25)
+    )
+
+    names, seen = [], set()
+    for city, prefix, kind in zip(
+        property_city, rng.integers(0, len(NAME_PREFIXES), properties), stay_type
+    ):
+        name = f"{NAME_PREFIXES[prefix]} {STAY_TYPES[kind][0]}"
+        # Numbered like "Palm Hotel 2" when the city already has one
+        number = 1
+        while (city, name if number == 1 else f"{name} {number}") in seen:
+            number += 1
+        name = name if number == 1 else f"{name} {number}"
+        seen.add((city, name))
+        names.append(name)
+    pros = np.select(
+        [rating >= 4.6, (amenities & beach) > 0, base_price < 80, capacity >= 4],
+        [0, 1, 2, 4],
+        3,
+    )
+    cons = np.select(
+        [base_price > 250, rating < 3.6, type_price[stay_type] < 0.5],
+        [0, 1, 4],
+        rng.integers(2, 4, properties),
+    )
+
+    block_property, block_from, block_to = [], [], []
+    for index in range(properties):
+        day_cursor = first_day
+        while day_cursor < first_day + days:
+            length = int(rng.integers(14, 120))
+            block_property.append(index)
+            block_from.append(day_cursor)
+            block_to.append(min(day_cursor + length, first_day + days))
+            # Occasionally fully booked for a while
+            day_cursor += length + (
+                int(rng.integers(1, 15)) if rng.random() < 0.3 else 0
+            )
+    block_property = np.array(block_property)
+    block_from = np.array(block_from)
+    block_season = 1 + 0.25 * np.cos(2 * math.pi * (block_from % 365.25 - 196) / 365.25)
+
+    stays = {
+        "destination": property_city[block_property],
+        "name": block_property,
+        "type": stay_type[block_property],
+        "price_per_night": (base_price[block_property] * block_season).round(),
+        "rating": rating[block_property],
+        "capacity": capacity[block_property],
+        "available_from": block_from,
+        "available_to": np.array(block_to),
+        "amenities": amenities[block_property],
+        "pros": pros[block_property],
+        "cons": cons[block_property],
+    }
+    stays = {
+        name: np.asarray(values).astype(STAY_COLUMNS[name])
+        for name, values in stays.items()
+    }
+
+    vocab = {
+        "cities": [name for name, _, _ in CITIES],
+        "airlines": [name for name, _, _ in AIRLINES],
+        "classes": [name for name, _, _ in CLASSES],
+        "names": names,
+        "types": [name for name, _, _, _ in STAY_TYPES],
+        "pros": PROS,
+        "cons": CONS,
+    }
+    return Inventory(flights, stays, vocab)
+
+
+_inventory: Inventory | None = None
+_inventory_lock = threading.Lock()
+
+
+def get_inventory() -> Inventory:
+    """The process-wide inventory, loaded from `INVENTORY_PATH` or generated once."""
+    global _inventory
+    if _inventory is None:
+        with _inventory_lock:
+            if _inventory is None:
+                _inventory = (
+                    Inventory.load(INVENTORY_PATH)
+                    if INVENTORY_PATH
+                    else generate_inventory()
+                )
+    return _inventory
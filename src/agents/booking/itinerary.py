@@ -0,0 +1,210 @@
+"""Multi-city itinerary optimization over the flight inventory.
+
+Finds the order of cities and the travel days that minimise total price (or
+flight time) with a Held-Karp dynamic program over (visited cities, current
+city, day). Each leg's cost per day is looked up once from the inventory and
+memoized, and the day dimension is handled as NumPy vectors, so a trip through
+six cities over a month is solved in milliseconds instead of one search per
+candidate leg.
+"""
+
+import numpy as np
+
+from .inventory import Inventory, from_day, to_day
+from .schemas import ItineraryLeg, MultiCityItinerary
+
+MAX_ITINERARY_CITIES = 7
+OBJECTIVES = ("price", "duration")
+
+
+class LegCosts:
+    """Cheapest flight per day for each city pair in a date window, built on demand."""
+
+    def __init__(
+        self,
+        inventory: Inventory,
+        first_day: int,
+        days: int,
+        objective: str,
+        max_stops: int | None = None,
+    ):
+        self.inventory = inventory
+        self.first_day = first_day
+        self.days = days
+        self.objective = objective
+        self.max_stops = max_stops
+        self.tables: dict[tuple[str, str], tuple[np.ndarray, np.ndarray]] = {}
+
+    def __call__(self, origin: str, destination: str) -> tuple[np.ndarray, np.ndarray]:
+        """Per-day (cost, inventory row) arrays; inf and -1 on days without flights."""
+        key = (origin, destination)
+        if key not in self.tables:
+            self.tables[key] = self._table(origin, destination)
+        return self.tables[key]
+
+    def _table(self, origin: str, destination: str) -> tuple[np.ndarray, np.ndarray]:
+        inventory = self.inventory
+        rows = inventory.find_flights(
+            origin,
+            destination,
+            from_day(self.first_day),
+            from_day(self.first_day + self.days - 1),
+            max_stops=self.max_stops,
+        )
+        costs = None
+        if self.objective == "duration":
+            # Price breaks ties between equally long flights
+            prices = inventory.flights["price"][rows].astype(np.float64)
+            costs = inventory.flights["duration_minutes"][rows] + prices * 1e-6
+        return inventory.cheapest_by_day(rows, self.first_day, self.days, costs)
+
+
+def optimize_itinerary(
+    inventory: Inventory,
+    origin: str,
+    cities: list[str],
+    start: str,
+    end: str | None = None,
+    min_nights: int = 2,
+    max_nights: int = 4,
+    objective: str = "price",
+    return_to_origin: bool = True,
+    max_stops: int | None = None,
+) -> MultiCityItinerary | None:
+    """Best order and dates to visit every city once, leaving `origin` on `start`.
+
+    Stays last between `min_nights` and `max_nights` nights per city and the
+    trip ends by `end` (inclusive, default and at most: long enough for the
+    longest stays). Without `return_to_origin` the last stay is left open, so
+    `nights` has one entry fewer than `order`. Returns None when no combination
+    of flights fits.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {', '.join(OBJECTIVES)}")
+    if not 0 < min_nights <= max_nights:
+        raise ValueError("Nights must satisfy 0 < min_nights <= max_nights")
+    # Resolve names first so typos fail fast, and drop repeats and the origin
+    codes = {inventory.city_code(origin)}
+    stops = []
+    for city in cities:
+        code = inventory.city_code(city)
+        if code not in codes:
+            codes.add(code)
+            stops.append(city)
+    if not stops:
+        raise ValueError("Give at least one city to visit besides the origin")
+    if len(stops) > MAX_ITINERARY_CITIES:
+        raise ValueError(f"At most {MAX_ITINERARY_CITIES} cities per itinerary")
+
+    first_day = to_day(start)
+    longest = len(stops) * max_nights + 1
+    days = to_day(end) - first_day + 1 if end else longest
+    if days < 1:
+        raise ValueError("End date must not be before the start date")
+    if days > longest:
+        raise ValueError(
+            f"End date is too far out: {len(stops)} stays of at most {max_nights} "
+            f"nights end by {from_day(first_day + longest - 1)}"
+        )
+
+    legs = LegCosts(inventory, first_day, days, objective, max_stops)
+    count = len(stops)
+    nights = range(min_nights, max_nights + 1)
+
+    # cost[mask, city, day]: cheapest way to have visited `mask`, arriving at
+    # `city` on `day`; parents record the previous city and arrival day
+    cost = np.full((1 << count, count, days), np.inf)
+    parent_city = np.full(cost.shape, -1, dtype=np.int8)
+    parent_day = np.full(cost.shape, -1, dtype=np.int32)
+    for city in range(count):
+        # The first flight leaves on the start date
+        cost[1 << city, city, 0] = legs(origin, stops[city])[0][0]
+
+    for mask in range(1, 1 << count):
+        for city in range(count):
+            if not mask >> city & 1 or not np.isfinite(cost[mask, city]).any():
+                continue
+            arrived = cost[mask, city]
+            for following in range(count):
+                if mask >> following & 1:
+                    continue
+                leg = legs(stops[city], stops[following])[0]
+                target = mask | 1 << following
+                for stay in nights:
+                    if stay >= days:
+                        break
+                    candidate = arrived[:-stay] + leg[stay:]
+                    current = cost[target, following, stay:]
+                    better = candidate < current
+                    if better.any():
+                        current[better] = candidate[better]
+                        parent_city[target, following, stay:][better] = city
+                        arrived_on = np.flatnonzero(better)
+                        parent_day[target, following, stay:][better] = arrived_on
+
+    # Close the tour: stay in the last city, then fly home if requested
+    full = (1 << count) - 1
+    best = (np.inf, -1, -1, -1)
+    for city in range(count):
+        arrived = cost[full, city]
+        if not return_to_origin:
+            day = int(np.argmin(arrived))
+            if arrived[day] < best[0]:
+                best = (arrived[day], city, day, -1)
+            continue
+        home = legs(stops[city], origin)[0]
+        for stay in nights:
+            if stay >= days:
+                break
+            total = arrived[:-stay] + home[stay:]
+            day = int(np.argmin(total))
+            if total[day] < best[0]:
+                best = (total[day], city, day, day + stay)
+    if not np.isfinite(best[0]):
+        return None
+
+    # Walk the parents back to the first flight
+    _, city, day, home_day = best
+    visits = []
+    mask = full
+    while city >= 0:
+        visits.append((city, day))
+        previous = int(parent_city[mask, city, day]), int(parent_day[mask, city, day])
+        mask &= ~(1 << city)
+        city, day = previous
+    visits.reverse()
+
+    route = [origin] + [stops[city] for city, _ in visits]
+    arrival_days = [day for _, day in visits]
+    departure_days = [0] + arrival_days[1:]
+    if home_day >= 0:
+        route.append(origin)
+        departure_days.append(home_day)
+
+    itinerary_legs = []
+    total_minutes = 0
+    for (leg_from, leg_to), day in zip(zip(route, route[1:]), departure_days):
+        row = legs(leg_from, leg_to)[1][day]
+        total_minutes += int(inventory.flights["duration_minutes"][row])
+        itinerary_legs.append(
+            ItineraryLeg(
+                route=f"{leg_from} → {leg_to}",
+                departure_date=from_day(first_day + day),
+                flight=inventory.flight(row),
+            )
+        )
+
+    stay_nights = [
+        leave - arrive for arrive, leave in zip(arrival_days, departure_days[1:])
+    ]
+    return MultiCityItinerary(
+        objective=objective,
+        order=[stops[city] for city, _ in visits],
+        nights=stay_nights,
+        total_price=round(sum(leg.flight.price for leg in itinerary_legs), 2),
+        total_flight_time=f"{total_minutes // 60}h {total_minutes % 60:02d}m",
+        legs=itinerary_legs,
+        booking_tips=[
+            "Each leg is the best flight of its day; confirm legs one at a time",
+        ],
+    )
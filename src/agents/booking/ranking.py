@@ -0,0 +1,171 @@
+"""Preference-weighted ranking of booking search results.
+
+Candidate rows from the inventory are scored in one vectorized pass over their
+columns, and only the best `k` are turned into schema objects for the model.
+Weights start from defaults and are adjusted by the user's long-term memories
+("prefers beach resorts", "travelling on a budget", "direct flights only").
+"""
+
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from ...memory import MemoryEntry, memory_store
+from .inventory import AMENITIES, STAY_TYPES, Inventory
+
+FLIGHT_WEIGHTS = {"price": 0.4, "rating": 0.2, "stops": 0.2, "duration": 0.2}
+STAY_WEIGHTS = {"price": 0.4, "rating": 0.3, "amenities": 0.2, "type": 0.1}
+# Memory phrases that raise (factor > 1) or lower a weight
+WEIGHT_RULES = [
+    (r"\b(budget|cheap|cheapest|affordable|inexpensive|save money)\b", "price", 2.0),
+    (r"\b(luxury|luxurious|upscale|five[- ]star|5[- ]star|splurge)\b", "price", 0.4),
+    (
+        r"\b(luxury|luxurious|upscale|five[- ]star|5[- ]star|(best|top)[- ]rated)\b",
+        "rating",
+        2.0,
+    ),
+    (r"\b(direct|non[- ]?stop|no (layovers?|connections?|stops))\b", "stops", 3.0),
+    (
+        r"\b(fast|fastest|quick|quickest|short(est)?) (flights?|travel|journey)\b",
+        "duration",
+        2.5,
+    ),
+]
+BUDGET_RE = re.compile(
+    r"\b(?:under|below|less than|at most|max(?:imum)?|budget(?: of)?)"
+    r"\s*[$€£]?\s*(\d+(?:\.\d+)?)"
+)
+STAY_WORDS = ("night", "hotel", "stay", "accommodation", "room", "resort")
+FLIGHT_WORDS = ("flight", "fare", "ticket", "plane")
+# Over-budget options keep their order among themselves but fall below the rest
+OVER_BUDGET_PENALTY = 1.0
+
+
+@dataclass
+class TravelPreferences:
+    flight_weights: dict[str, float] = field(
+        default_factory=lambda: dict(FLIGHT_WEIGHTS)
+    )
+    stay_weights: dict[str, float] = field(default_factory=lambda: dict(STAY_WEIGHTS))
+    amenities: set[str] = field(default_factory=set)
+    stay_types: set[str] = field(default_factory=set)
+    flight_budget: float | None = None
+    stay_budget: float | None = None
+
+
+def preferences_from_memories(memories: list[MemoryEntry]) -> TravelPreferences:
+    """Derive ranking weights, wanted amenities and budgets from memory texts."""
+    preferences = TravelPreferences()
+    for memory in memories:
+        text = memory.content.casefold()
+
+        for pattern, name, factor in WEIGHT_RULES:
+            if re.search(pattern, text):
+                for weights in (preferences.flight_weights, preferences.stay_weights):
+                    if name in weights:
+                        weights[name] *= factor
+
+        for amenity in AMENITIES:
+            if re.search(rf"\b{re.escape(amenity.casefold())}(s|front)?\b", text):
+                preferences.amenities.add(amenity)
+        for stay_type, *_ in STAY_TYPES:
+            if re.search(rf"\b{re.escape(stay_type.casefold())}s?\b", text):
+                preferences.stay_types.add(stay_type)
+
+        if match := BUDGET_RE.search(text):
+            amount = float(match.group(1))
+            if any(word in text for word in STAY_WORDS):
+                preferences.stay_budget = amount
+            elif any(word in text for word in FLIGHT_WORDS):
+                preferences.flight_budget = amount
+
+    if preferences.amenities:
+        preferences.stay_weights["amenities"] *= 2
+    if preferences.stay_types:
+        preferences.stay_weights["type"] *= 3
+    return preferences
+
+
+def load_preferences(session_id: str = "demo", limit: int = 50) -> TravelPreferences:
+    """Preferences from the session's most recent long-term memories."""
+    memories = memory_store.get_memories(session_id, "long_term")
+    return preferences_from_memories(memories[-limit:])
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indexes of the `k` highest scores, best first.
+
+    `np.argpartition` selects the top `k` in linear time, so only those `k`
+    are fully sorted, however many candidates there are.
+    """
+    if len(scores) > k:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def _lower_is_better(values: np.ndarray) -> np.ndarray:
+    """Scale to [0, 1] within the candidates, 1 for the lowest value."""
+    if len(values) == 0:
+        return np.zeros(0)
+    low, high = values.min(), values.max()
+    if high == low:
+        return np.ones(len(values))
+    return (high - values) / (high - low)
+
+
+def _higher_is_better(values: np.ndarray) -> np.ndarray:
+    return 1 - _lower_is_better(values)
+
+
+def _budget_penalty(prices: np.ndarray, budget: float | None) -> np.ndarray:
+    if budget is None:
+        return np.zeros(len(prices))
+    return np.where(prices > budget, OVER_BUDGET_PENALTY, 0.0)
+
+
+def score_flights(
+    inventory: Inventory,
+    rows: np.ndarray,
+    preferences: TravelPreferences,
+    prices: np.ndarray | None = None,
+) -> np.ndarray:
+    """Score flight rows; `prices` overrides the column, e.g. with round-trip fares."""
+    columns = inventory.flights
+    weights = preferences.flight_weights
+    prices = columns["price"][rows] if prices is None else prices
+    return (
+        weights["price"] * _lower_is_better(prices)
+        + weights["rating"] * _higher_is_better(columns["rating"][rows])
+        + weights["stops"] * _lower_is_better(columns["stops"][rows])
+        + weights["duration"] * _lower_is_better(columns["duration_minutes"][rows])
+        - _budget_penalty(prices, preferences.flight_budget)
+    )
+
+
+def score_stays(
+    inventory: Inventory, rows: np.ndarray, preferences: TravelPreferences
+) -> np.ndarray:
+    columns = inventory.stays
+    weights = preferences.stay_weights
+    prices = columns["price_per_night"][rows]
+    scores = (
+        weights["price"] * _lower_is_better(prices)
+        + weights["rating"] * _higher_is_better(columns["rating"][rows])
+        - _budget_penalty(prices, preferences.stay_budget)
+    )
+
+    if preferences.amenities:
+        wanted = sum(1 << AMENITIES.index(name) for name in preferences.amenities)
+        overlap = np.bitwise_count(columns["amenities"][rows] & np.uint16(wanted))
+        scores += weights["amenities"] * overlap / len(preferences.amenities)
+    if preferences.stay_types:
+        codes = [
+            code
+            for code, name in enumerate(inventory.vocab["types"])
+            if name in preferences.stay_types
+        ]
+        scores += weights["type"] * np.isin(columns["type"][rows], codes)
+    return scores
@@ -1,6 +1,6 @@
 """Booking agent schemas."""
 
-from typing import List, Optional
+from typing import ClassVar, List, Optional
 
 from pydantic import BaseModel
 
@@ -20,6 +20,14 @@ class Accommodation(BaseModel):
 class AccommodationSearch(BaseModel):
     """Accommodation search results."""
 
+    # Echoes of the search arguments, omitted from model input
+    compact_exclude: ClassVar[set[str]] = {
+        "destination",
+        "check_in",
+        "check_out",
+        "guests",
+    }
+
     destination: str
     check_in: str
     check_out: str
@@ -28,7 +36,11 @@ class AccommodationSearch(BaseModel):
 
 
 class Flight(BaseModel):
-    """Flight details."""
+    """Flight details.
+
+    A round-trip option carries its paired `return_flight`, and its `price` is
+    the total of both legs.
+    """
 
     airline: str
     price: float
@@ -37,11 +49,14 @@ class Flight(BaseModel):
     duration: str
     stops: int
     travel_class: str
+    return_flight: Optional["Flight"] = None
 
 
 class FlightSearch(BaseModel):
     """Flight search results."""
 
+    compact_exclude: ClassVar[set[str]] = {"departure_date", "return_date"}
+
     route: str
     departure_date: str
     return_date: Optional[str]
@@ -53,7 +68,67 @@ class FlightSearch(BaseModel):
 class BookingResponse(BaseModel):
     """Booking confirmation response."""
 
+    # Repeats `details` and the reference
+    compact_exclude: ClassVar[set[str]] = {"confirmation_message"}
+
     status: str
     booking_reference: str
     details: str
     confirmation_message: str
+
+
+class ItineraryLeg(BaseModel):
+    """One flight of a multi-city itinerary."""
+
+    route: str
+    departure_date: str
+    flight: Flight
+
+
+class MultiCityItinerary(BaseModel):
+    """Best ordering of a multi-city trip and the flights for each leg.
+
+    `nights` follows `order`; a one-way trip has no stay length for its last city.
+    """
+
+    compact_exclude: ClassVar[set[str]] = {"objective"}
+
+    objective: str
+    order: List[str]
+    nights: List[int]
+    total_price: float
+    total_flight_time: str
+    legs: List[ItineraryLeg]
+    booking_tips: List[str]
+
+
+class CalendarDay(BaseModel):
+    """Lowest fare of one departure day."""
+
+    date: str
+    min_price: Optional[float]
+
+
+class RoundTripOption(BaseModel):
+    """Outbound and return flights of one date combination."""
+
+    departure_date: str
+    return_date: str
+    nights: int
+    price: float
+    outbound: Flight
+    inbound: Flight
+
+
+class FlightCalendar(BaseModel):
+    """Lowest fares per day over a date window, with the cheapest round trips."""
+
+    compact_exclude: ClassVar[set[str]] = {"start_date", "end_date"}
+
+    route: str
+    start_date: str
+    end_date: str
+    calendar: List[CalendarDay]
+    cheapest_date: Optional[str]
+    round_trips: List[RoundTripOption]
+    booking_tips: List[str]
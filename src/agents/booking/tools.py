@@ -2,30 +2,49 @@
 
 import random
 
+import numpy as np
 from langchain_core.tools import tool
 
+from ...config import BOOKING_SEARCH_LIMIT, FLIGHT_CALENDAR_MAX_DAYS
 from ...memory import add_memory
+from ...serialization import compact_output
+from .inventory import Inventory, from_day, get_inventory, to_day
+from .itinerary import optimize_itinerary
+from .ranking import load_preferences, score_flights, score_stays, top_k
 from .schemas import (
-    Accommodation,
     AccommodationSearch,
     BookingResponse,
-    Flight,
+    CalendarDay,
+    FlightCalendar,
     FlightSearch,
+    MultiCityItinerary,
+    RoundTripOption,
 )
 
 
-@tool
+def _outside_inventory(inventory: Inventory, *dates: str | None) -> str | None:
+    """Reply for dates the inventory has no data on, None if all are covered."""
+    if inventory.covers(*dates):
+        return None
+    return (
+        "No inventory for these dates; flights and stays can be searched from "
+        f"{from_day(inventory.first_day)} to {from_day(inventory.last_day)}"
+    )
+
+
+@tool(response_format="content_and_artifact")
+@compact_output
 def search_accommodations(
     destination: str,
     check_in: str,
     guests: int,
     check_out: str | None = None,
-) -> AccommodationSearch:
+) -> AccommodationSearch | str:
     """Search for available accommodations in a destination.
 
     Args:
         destination: The destination city or location to search for accommodations
-        check_in: Check-in date in string format (e.g., "2024-01-15")
+        check_in: Check-in date in string format (e.g., "2027-01-15")
         guests: Number of guests for the accommodation
         check_out: Check-out date in string format, optional for same-day stays
 
@@ -36,7 +55,7 @@ def search_accommodations(
         ValueError: If destination, check_in, or guests are empty/invalid
 
     Example:
-        search_accommodations("Bali", "2024-02-01", 2, "2024-02-05")
+        search_accommodations("Bali", "2027-02-01", 2, "2027-02-05")
     """
     print(
         f"Called search_accommodations: destination={destination}, check_in={check_in}, check_out={check_out}, guests={guests}"
@@ -49,25 +68,14 @@ def search_accommodations(
     if not guests:
         raise ValueError("Guests number cannot be empty")
 
+    inventory = get_inventory()
+    outside = _outside_inventory(inventory, check_in, check_out)
+    if outside:
+        return outside
+    rows = inventory.find_stays(destination, check_in, check_out, guests)
+    scores = score_stays(inventory, rows, load_preferences())
     accommodations = [
-        Accommodation(
-            name="Beach Resort",
-            type="Resort",
-            price_per_night=300,
-            rating=4.5,
-            amenities=["Pool", "WiFi"],
-            pros="Great location",
-            cons="Expensive",
-        ),
-        Accommodation(
-            name="Budget Hotel",
-            type="Hotel",
-            price_per_night=80,
-            rating=4.0,
-            amenities=["WiFi", "Breakfast"],
-            pros="Affordable",
-            cons="Basic facilities",
-        ),
+        inventory.stay(rows[i]) for i in top_k(scores, BOOKING_SEARCH_LIMIT)
     ]
 
     return AccommodationSearch(
@@ -79,29 +87,31 @@ def search_accommodations(
     )
 
 
-@tool
+@tool(response_format="content_and_artifact")
+@compact_output
 def search_flights(
     origin: str,
     destination: str,
     departure_date: str,
     return_date: str | None = None,
-) -> FlightSearch:
+) -> FlightSearch | str:
     """Search for available flights between destinations.
 
     Args:
         origin: Departure city or airport code
         destination: Arrival city or airport code
-        departure_date: Departure date in string format (e.g., "2024-01-15")
+        departure_date: Departure date in string format (e.g., "2027-01-15")
         return_date: Return date for round-trip flights, optional for one-way trips
 
     Returns:
         FlightSearch object containing route details, dates, and available flight options
 
     Raises:
-        ValueError: If origin, destination, or departure_date are empty/invalid
+        ValueError: If origin, destination, or departure_date are empty/invalid,
+            or return_date is before departure_date
 
     Example:
-        search_flights("NYC", "LAX", "2024-02-01", "2024-02-08")
+        search_flights("NYC", "LAX", "2027-02-01", "2027-02-08")
     """
     print(
         f"Called search_flights: origin={origin}, destination={destination}, departure_date={departure_date}, "
@@ -114,29 +124,32 @@ def search_flights(
         raise ValueError("Destination cannot be empty")
     if not departure_date or departure_date.strip() == "":
         raise ValueError("Departure date cannot be empty")
+    if return_date is not None and to_day(return_date) < to_day(departure_date):
+        raise ValueError("Return date must not be before the departure date")
 
     is_roundtrip = return_date is not None
-
-    flights = [
-        Flight(
-            airline="Demo Airways",
-            price=500 if not is_roundtrip else 900,
-            rating=4.2,
-            departure_time="10:00",
-            duration="8h 30m",
-            stops=0,
-            travel_class="Economy",
-        ),
-        Flight(
-            airline="Budget Air",
-            price=300 if not is_roundtrip else 550,
-            rating=3.8,
-            departure_time="14:30",
-            duration="9h 15m",
-            stops=1,
-            travel_class="Economy",
-        ),
-    ]
+    inventory = get_inventory()
+    outside = _outside_inventory(inventory, departure_date, return_date)
+    if outside:
+        return outside
+    rows = inventory.find_flights(origin, destination, departure_date)
+    prices = inventory.flights["price"][rows]
+    return_rows = None
+    booking_tips = ["Book early for better prices"]
+
+    if is_roundtrip:
+        returns = inventory.find_flights(destination, origin, return_date)
+        rows, return_rows, prices = inventory.round_trips(rows, returns)
+
+    scores = score_flights(inventory, rows, load_preferences(), prices)
+    flights = []
+    for i in top_k(scores, BOOKING_SEARCH_LIMIT):
+        flight = inventory.flight(rows[i], prices[i])
+        if return_rows is not None:
+            flight.return_flight = inventory.flight(return_rows[i])
+        flights.append(flight)
+    if not flights:
+        booking_tips.append("No flights on these dates; try nearby dates")
 
     return FlightSearch(
         route=f"{origin} → {destination}",
@@ -144,11 +157,203 @@ def search_flights(
         return_date=return_date,
         is_roundtrip=is_roundtrip,
         options=flights,
-        booking_tips=["Book early for better prices"],
+        booking_tips=booking_tips,
+    )
+
+
+@tool(response_format="content_and_artifact")
+@compact_output
+def search_flight_calendar(
+    origin: str,
+    destination: str,
+    start_date: str,
+    end_date: str,
+    min_nights: int | None = None,
+    max_nights: int | None = None,
+) -> FlightCalendar | str:
+    """Find the lowest fare for each departure day in a date window.
+
+    Args:
+        origin: Departure city or airport code
+        destination: Arrival city or airport code
+        start_date: First departure date in string format (e.g., "2027-01-01")
+        end_date: Last departure date in string format (e.g., "2027-01-31")
+        min_nights: Shortest stay for round trips, optional for one-way calendars
+        max_nights: Longest stay for round trips, defaults to min_nights;
+            requires min_nights
+
+    Returns:
+        FlightCalendar object with the lowest price per day, the cheapest date and,
+        when min_nights is given, the cheapest round-trip date combinations
+
+    Raises:
+        ValueError: If origin, destination or the dates are empty/invalid
+
+    Example:
+        search_flight_calendar("London", "Paris", "2027-02-01", "2027-02-28", 3, 5)
+    """
+    print(
+        f"Called search_flight_calendar: origin={origin}, destination={destination}, "
+        f"start_date={start_date}, end_date={end_date}, min_nights={min_nights}, "
+        f"max_nights={max_nights}"
+    )
+
+    if not origin or origin.strip() == "":
+        raise ValueError("Origin cannot be empty")
+    if not destination or destination.strip() == "":
+        raise ValueError("Destination cannot be empty")
+    if not start_date or not end_date:
+        raise ValueError("Start and end dates cannot be empty")
+    if max_nights is not None and min_nights is None:
+        raise ValueError("max_nights needs min_nights for round trips")
+
+    first_day, last_day = to_day(start_date), to_day(end_date)
+    days = last_day - first_day + 1
+    if days < 1:
+        raise ValueError("End date must not be before the start date")
+    if days > FLIGHT_CALENDAR_MAX_DAYS:
+        raise ValueError(
+            f"Date window cannot be longer than {FLIGHT_CALENDAR_MAX_DAYS} days"
+        )
+
+    inventory = get_inventory()
+    outside = _outside_inventory(inventory, start_date, end_date)
+    if outside:
+        return outside
+    rows = inventory.find_flights(origin, destination, start_date, end_date)
+    prices, _ = inventory.cheapest_by_day(rows, first_day, days)
+    calendar = [
+        CalendarDay(
+            date=from_day(first_day + day),
+            min_price=round(float(price), 2) if np.isfinite(price) else None,
+        )
+        for day, price in enumerate(prices)
+    ]
+    cheapest = int(np.argmin(prices))
+    cheapest_date = (
+        from_day(first_day + cheapest) if np.isfinite(prices[cheapest]) else None
+    )
+    booking_tips = [
+        "Call search_flights on a chosen date to see all options for that day"
+    ]
+    if cheapest_date is None:
+        booking_tips.append("No flights in this window; try other dates")
+
+    round_trips = []
+    if min_nights is not None:
+        max_nights = min_nights if max_nights is None else max_nights
+        if not 0 < min_nights <= max_nights:
+            raise ValueError("Nights must satisfy 0 < min_nights <= max_nights")
+        returns = inventory.find_flights(
+            destination,
+            origin,
+            from_day(first_day + min_nights),
+            from_day(last_day + max_nights),
+        )
+        fares, out_rows, back_rows = inventory.round_trip_fares(
+            rows, returns, first_day, days, min_nights, max_nights
+        )
+        fares = fares.reshape(-1)
+        for index in top_k(-fares, BOOKING_SEARCH_LIMIT):
+            if not np.isfinite(fares[index]):
+                break
+            day, length = divmod(int(index), max_nights - min_nights + 1)
+            round_trips.append(
+                RoundTripOption(
+                    departure_date=from_day(first_day + day),
+                    return_date=from_day(first_day + day + min_nights + length),
+                    nights=min_nights + length,
+                    price=round(float(fares[index]), 2),
+                    outbound=inventory.flight(out_rows.reshape(-1)[index]),
+                    inbound=inventory.flight(back_rows.reshape(-1)[index]),
+                )
+            )
+
+    return FlightCalendar(
+        route=f"{origin} → {destination}",
+        start_date=start_date,
+        end_date=end_date,
+        calendar=calendar,
+        cheapest_date=cheapest_date,
+        round_trips=round_trips,
+        booking_tips=booking_tips,
+    )
+
+
+@tool(response_format="content_and_artifact")
+@compact_output
+def plan_multi_city_trip(
+    origin: str,
+    cities: list[str],
+    start_date: str,
+    end_date: str | None = None,
+    min_nights: int = 2,
+    max_nights: int = 4,
+    objective: str = "price",
+    return_to_origin: bool = True,
+) -> MultiCityItinerary | str:
+    """Find the best order and flights to visit several cities in one trip.
+
+    Args:
+        origin: City the trip starts from
+        cities: Cities to visit, in any order
+        start_date: Date of the first flight in string format (e.g., "2027-01-15")
+        end_date: Latest date of the last flight, optional; at most
+            len(cities) * max_nights days after start_date
+        min_nights: Fewest nights to spend in each city
+        max_nights: Most nights to spend in each city
+        objective: "price" for the cheapest trip or "duration" for the least flight time
+        return_to_origin: Whether the trip ends with a flight back to the origin
+
+    Returns:
+        MultiCityItinerary object with the visiting order, nights per city (none
+        for the last city when return_to_origin is False) and one flight per leg
+
+    Raises:
+        ValueError: If origin, cities or start_date are empty/invalid
+
+    Example:
+        plan_multi_city_trip("London", ["Paris", "Rome"], "2027-02-01", "2027-02-14")
+    """
+    print(
+        f"Called plan_multi_city_trip: origin={origin}, cities={cities}, "
+        f"start_date={start_date}, end_date={end_date}, "
+        f"min_nights={min_nights}, max_nights={max_nights}, "
+        f"objective={objective}, return_to_origin={return_to_origin}"
+    )
+
+    if not origin or origin.strip() == "":
+        raise ValueError("Origin cannot be empty")
+    if not cities:
+        raise ValueError("Cities cannot be empty")
+    if not start_date or start_date.strip() == "":
+        raise ValueError("Start date cannot be empty")
+
+    inventory = get_inventory()
+    outside = _outside_inventory(inventory, start_date, end_date)
+    if outside:
+        return outside
+    itinerary = optimize_itinerary(
+        inventory,
+        origin,
+        cities,
+        start_date,
+        end_date,
+        min_nights,
+        max_nights,
+        objective,
+        return_to_origin,
     )
+    if itinerary is None:
+        return (
+            "No flights fit these cities and dates; "
+            "try a later end date or different stay lengths"
+        )
+    return itinerary
 
 
-@tool
+@tool(response_format="content_and_artifact")
+@compact_output
 def confirm_accommodation_booking(
     accommodation_name: str,
     destination: str,
@@ -171,7 +376,7 @@ def confirm_accommodation_booking(
         BookingResponse object containing confirmation status, booking reference, and details
 
     Example:
-        confirm_accommodation_booking("Beach Resort", "Bali", "2024-02-01", "2024-02-05", "John Doe", "Credit Card")
+        confirm_accommodation_booking("Beach Resort", "Bali", "2027-02-01", "2027-02-05", "John Doe", "Credit Card")
 
     Note:
         This tool generates a random booking reference and stores the booking in memory.
@@ -206,7 +411,8 @@ def confirm_accommodation_booking(
     )
 
 
-@tool
+@tool(response_format="content_and_artifact")
+@compact_output
 def confirm_flight_booking(
     airline: str,
     route: str,
@@ -227,7 +433,7 @@ def confirm_flight_booking(
         BookingResponse object containing confirmation status, booking reference, and details
 
     Example:
-        confirm_flight_booking("Demo Airways", "NYC → LAX", "2024-02-01", "Jane Smith", "Credit Card")
+        confirm_flight_booking("Demo Airways", "NYC → LAX", "2027-02-01", "Jane Smith", "Credit Card")
 
     Note:
         This tool generates a random booking reference and stores the booking in memory.
@@ -3,7 +3,7 @@
 from langgraph.prebuilt import create_react_agent
 
 from ...config import get_llm_model
-from ...utils import debug_hook
+from ...utils import create_post_model_hook, create_pre_model_hook
 from .constants import SEARCH_AGENT_PROMPT
 from .tools import get_location_info, get_weather_forecast
 
@@ -15,6 +15,6 @@ def create_search_agent():
         tools=[get_weather_forecast, get_location_info],
         prompt=SEARCH_AGENT_PROMPT,
         name="search_agent",
-        pre_model_hook=lambda state: debug_hook(state, "SEARCH_PRE"),
-        post_model_hook=lambda state: debug_hook(state, "SEARCH_POST"),
+        pre_model_hook=create_pre_model_hook("search_agent"),
+        post_model_hook=create_post_model_hook("search_agent"),
     )
@@ -15,4 +15,5 @@ IMPORTANT:
 - If any required parameters are missing, ask specific questions to gather it
 - Do NOT ask for information that is not relevant to the tools or user's query
 - Do NOT add content that is not provided by the tools
+- Other agents may be handling other parts of the same query at the same time; only handle the part covered by your tools
 - The current date and time is {datetime.now()}"""
@@ -1,11 +1,15 @@
 """Search agent schemas for external data."""
 
+from typing import ClassVar
+
 from pydantic import BaseModel, Field
 
 
 class WeatherInfo(BaseModel):
     """Weather information from external API."""
 
+    compact_exclude: ClassVar[set[str]] = {"destination"}
+
     destination: str
     temperature_range: str = Field(description="Temperature range in Celsius")
     condition: str = Field(description="Current weather condition")
@@ -15,6 +19,8 @@ class WeatherInfo(BaseModel):
 class LocationInfo(BaseModel):
     """Basic location information from external API."""
 
+    compact_exclude: ClassVar[set[str]] = {"destination"}
+
     destination: str
     country: str
     timezone: str
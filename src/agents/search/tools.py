@@ -1,13 +1,35 @@
 """Search agent tools for external API calls and data retrieval."""
 
+import functools
 import random
 
 from langchain_core.tools import tool
 
+from ...cache import cached
+from ...config import LOCATION_CACHE_TTL, TOOL_CACHE_SIZE, WEATHER_CACHE_TTL
+from ...serialization import compact_output
 from .schemas import LocationInfo, WeatherInfo
 
 
-@tool
+def normalize_destination(destination: str) -> str:
+    """Cache key for a destination, ignoring case and extra whitespace."""
+    return " ".join(destination.casefold().split())
+
+
+def echo_destination(func):
+    """Label a result cached under another spelling with the caller's destination."""
+
+    @functools.wraps(func)
+    def wrapper(destination: str):
+        return func(destination).model_copy(update={"destination": destination})
+
+    return wrapper
+
+
+@tool(response_format="content_and_artifact")
+@compact_output
+@echo_destination
+@cached(TOOL_CACHE_SIZE, WEATHER_CACHE_TTL, key=normalize_destination)
 def get_weather_forecast(destination: str) -> WeatherInfo:
     """Get current weather forecast for a destination.
 
@@ -39,7 +61,10 @@ def get_weather_forecast(destination: str) -> WeatherInfo:
     )
 
 
-@tool
+@tool(response_format="content_and_artifact")
+@compact_output
+@echo_destination
+@cached(TOOL_CACHE_SIZE, LOCATION_CACHE_TTL, key=normalize_destination)
 def get_location_info(destination: str) -> LocationInfo:
     """Get basic location information for a destination.
 
@@ -68,3 +93,11 @@ def get_location_info(destination: str) -> LocationInfo:
         language="English",
         visa_required=random.choice([True, False]),
     )
+
+
+def tool_cache_stats() -> dict[str, dict[str, int]]:
+    """Cache metrics of the search tools, keyed by tool name."""
+    return {
+        tool.name: tool.func.__wrapped__.cache.stats()
+        for tool in (get_weather_forecast, get_location_info)
+    }
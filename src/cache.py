@@ -0,0 +1,150 @@
+"""Small in-process caches shared by the planner components."""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+
+class LRUCache:
+    """Thread-safe LRU cache with an optional TTL and hit/miss counters."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the cached value, or None if it is missing or expired."""
+        with self.lock:
+            entry = self.data.get(key)
+            if entry is not None and self.ttl is not None:
+                if time.monotonic() - entry[0] > self.ttl:
+                    del self.data[key]
+                    entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self.lock:
+            self.data[key] = (time.monotonic(), value)
+            self.data.move_to_end(key)
+            while len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters and current size."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self.data),
+                "maxsize": self.maxsize,
+            }
+
+
+class SingleFlightCache:
+    """LRU/TTL cache that coalesces concurrent computations of the same key.
+
+    The first caller for a missing key computes the value while later callers
+    for that key wait for its result instead of starting their own upstream
+    call. Failures are propagated to every waiter and never cached.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None):
+        self.cache = LRUCache(maxsize, ttl)
+        self.inflight: dict[Hashable, Future] = {}
+        self.lock = threading.Lock()
+        self.coalesced = 0
+        self.errors = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        value = self.cache.get(key)
+        if value is not None:
+            return value
+
+        with self.lock:
+            future = self.inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.inflight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self.lock:
+                self.errors += 1
+                del self.inflight[key]
+            future.set_exception(e)
+            raise
+
+        self.cache.set(key, value)
+        with self.lock:
+            del self.inflight[key]
+        future.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        self.cache.clear()
+        with self.lock:
+            self.coalesced = 0
+            self.errors = 0
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters plus coalesced waiters and failed computations."""
+        stats = self.cache.stats()
+        with self.lock:
+            stats["coalesced"] = self.coalesced
+            stats["errors"] = self.errors
+            stats["inflight"] = len(self.inflight)
+        return stats
+
+
+def cached(
+    maxsize: int = 1024,
+    ttl: float | None = None,
+    key: Callable[..., Hashable] | None = None,
+):
+    """Decorate a function with a `SingleFlightCache`.
+
+    `key` maps the call arguments to a cache key (the positional and keyword
+    arguments by default). The cache is available as `wrapper.cache`.
+    """
+
+    def decorator(func):
+        cache = SingleFlightCache(maxsize, ttl)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = (
+                key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            )
+            return cache.get_or_compute(cache_key, lambda: func(*args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
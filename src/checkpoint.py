@@ -0,0 +1,300 @@
+"""Bounded checkpointers for the planner graph."""
+
+import asyncio
+import sqlite3
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+)
+from langgraph.checkpoint.memory import InMemorySaver
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+
+@dataclass
+class CheckpointRetention:
+    """Retention policy shared by the bounded checkpointers.
+
+    Only the newest `max_checkpoints_per_thread` root checkpoints of a thread are
+    kept. Subgraph checkpoints are dropped once the step that produced them has
+    completed, since they are only needed to resume an interrupted agent. Threads
+    with no new checkpoint for `idle_thread_ttl` seconds are evicted, checked at
+    most once every `eviction_interval` seconds.
+    """
+
+    max_checkpoints_per_thread: int = 20
+    idle_thread_ttl: float | None = 24 * 60 * 60
+    eviction_interval: float = 60
+
+
+def _version_number(version: str | int | float) -> int:
+    """Extract the monotonic counter from a channel version."""
+    if isinstance(version, str):
+        return int(version.split(".")[0])
+    return int(version)
+
+
+class BoundedMemorySaver(InMemorySaver):
+    """In-memory checkpointer that prunes old checkpoints and idle threads."""
+
+    def __init__(self, retention: CheckpointRetention | None = None):
+        super().__init__()
+        self.retention = retention or CheckpointRetention()
+        self.blob_keys: dict[str, set[tuple]] = defaultdict(set)
+        self.last_active: dict[str, float] = {}
+        self.last_eviction = time.monotonic()
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        self.blob_keys[thread_id].update(
+            (thread_id, checkpoint_ns, k, v) for k, v in new_versions.items()
+        )
+        self.last_active[thread_id] = time.monotonic()
+
+        if not checkpoint_ns:
+            self._prune_thread(thread_id)
+        self._evict_idle_threads()
+        return next_config
+
+    def delete_thread(self, thread_id: str) -> None:
+        for checkpoint_ns, checkpoints in self.storage.pop(thread_id, {}).items():
+            for checkpoint_id in checkpoints:
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+        for key in self.blob_keys.pop(thread_id, ()):
+            self.blobs.pop(key, None)
+        self.last_active.pop(thread_id, None)
+
+    def _prune_thread(self, thread_id: str) -> None:
+        """Apply the retention policy to a single thread."""
+        namespaces = self.storage[thread_id]
+        root = namespaces[""]
+        latest_ids = sorted(root, reverse=True)
+        latest_root_id = latest_ids[0]
+
+        for checkpoint_id in latest_ids[self.retention.max_checkpoints_per_thread :]:
+            del root[checkpoint_id]
+            self.writes.pop((thread_id, "", checkpoint_id), None)
+
+        finished_namespaces = [
+            checkpoint_ns
+            for checkpoint_ns, checkpoints in namespaces.items()
+            if checkpoint_ns and (not checkpoints or max(checkpoints) < latest_root_id)
+        ]
+        for checkpoint_ns in finished_namespaces:
+            for checkpoint_id in namespaces.pop(checkpoint_ns):
+                self.writes.pop((thread_id, checkpoint_ns, checkpoint_id), None)
+
+        oldest_checkpoint = self.serde.loads_typed(root[min(root)][0])
+        floor = {
+            channel: _version_number(version)
+            for channel, version in oldest_checkpoint["channel_versions"].items()
+        }
+        stale_keys = [
+            key
+            for key in self.blob_keys[thread_id]
+            if key[1] not in namespaces
+            or (key[1] == "" and _version_number(key[3]) < floor.get(key[2], 0))
+        ]
+        for key in stale_keys:
+            self.blobs.pop(key, None)
+            self.blob_keys[thread_id].discard(key)
+
+    def _evict_idle_threads(self) -> None:
+        """Delete threads that have been idle for longer than the TTL."""
+        ttl = self.retention.idle_thread_ttl
+        now = time.monotonic()
+        if ttl is None or now - self.last_eviction < self.retention.eviction_interval:
+            return
+
+        self.last_eviction = now
+        for thread_id, last_active in list(self.last_active.items()):
+            if now - last_active > ttl:
+                self.delete_thread(thread_id)
+
+
+class BoundedSqliteSaver(SqliteSaver):
+    """SQLite checkpointer with retention and async support.
+
+    The async methods run the synchronous queries in a worker thread, so the
+    same saver serves both `invoke` and `ainvoke` without blocking the event loop.
+    """
+
+    def __init__(
+        self, conn: sqlite3.Connection, retention: CheckpointRetention | None = None
+    ):
+        super().__init__(conn)
+        self.retention = retention or CheckpointRetention()
+        self.last_eviction = 0.0
+
+    def setup(self) -> None:
+        if self.is_setup:
+            return
+
+        super().setup()
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS thread_activity (
+                thread_id TEXT PRIMARY KEY,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS thread_activity_updated_at
+                ON thread_activity (updated_at);
+            """)
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+
+        thread_id = str(config["configurable"]["thread_id"])
+        with self.cursor() as cur:
+            cur.execute(
+                "INSERT OR REPLACE INTO thread_activity (thread_id, updated_at) "
+                "VALUES (?, ?)",
+                (thread_id, time.time()),
+            )
+            if not config["configurable"]["checkpoint_ns"]:
+                self._prune_thread(cur, thread_id, checkpoint["id"])
+
+        self._evict_idle_threads()
+        return next_config
+
+    def delete_thread(self, thread_id: str) -> None:
+        super().delete_thread(thread_id)
+        with self.cursor() as cur:
+            cur.execute(
+                "DELETE FROM thread_activity WHERE thread_id = ?", (str(thread_id),)
+            )
+
+    def _prune_thread(
+        self, cur: sqlite3.Cursor, thread_id: str, latest_root_id: str
+    ) -> None:
+        """Apply the retention policy to a single thread."""
+        cur.execute(
+            """
+            DELETE FROM checkpoints
+            WHERE thread_id = ? AND checkpoint_ns = '' AND checkpoint_id NOT IN (
+                SELECT checkpoint_id FROM checkpoints
+                WHERE thread_id = ? AND checkpoint_ns = ''
+                ORDER BY checkpoint_id DESC LIMIT ?
+            )
+            """,
+            (thread_id, thread_id, self.retention.max_checkpoints_per_thread),
+        )
+        cur.execute(
+            """
+            DELETE FROM checkpoints
+            WHERE thread_id = ? AND checkpoint_ns IN (
+                SELECT checkpoint_ns FROM checkpoints
+                WHERE thread_id = ? AND checkpoint_ns != ''
+                GROUP BY checkpoint_ns HAVING MAX(checkpoint_id) < ?
+            )
+            """,
+            (thread_id, thread_id, latest_root_id),
+        )
+        cur.execute(
+            """
+            DELETE FROM writes
+            WHERE thread_id = ? AND NOT EXISTS (
+                SELECT 1 FROM checkpoints c
+                WHERE c.thread_id = writes.thread_id
+                AND c.checkpoint_ns = writes.checkpoint_ns
+                AND c.checkpoint_id = writes.checkpoint_id
+            )
+            """,
+            (thread_id,),
+        )
+
+    def _evict_idle_threads(self) -> None:
+        """Delete threads that have been idle for longer than the TTL."""
+        ttl = self.retention.idle_thread_ttl
+        now = time.time()
+        if ttl is None or now - self.last_eviction < self.retention.eviction_interval:
+            return
+
+        self.last_eviction = now
+        with self.cursor() as cur:
+            cur.execute(
+                "SELECT thread_id FROM thread_activity WHERE updated_at < ?",
+                (now - ttl,),
+            )
+            idle_threads = [row[0] for row in cur.fetchall()]
+
+        for thread_id in idle_threads:
+            self.delete_thread(thread_id)
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for item in items:
+            yield item
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Any,
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def create_checkpointer(
+    backend: str = "memory",
+    path: str = "checkpoints.sqlite",
+    retention: CheckpointRetention | None = None,
+) -> BaseCheckpointSaver:
+    """Create a bounded checkpointer for the given backend ("memory" or "sqlite")."""
+    if backend == "memory":
+        return BoundedMemorySaver(retention)
+
+    if backend == "sqlite":
+        conn = sqlite3.connect(path, check_same_thread=False)
+        return BoundedSqliteSaver(conn, retention)
+
+    raise ValueError(f"Unknown checkpointer backend: {backend}")
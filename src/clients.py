@@ -0,0 +1,120 @@
+"""Process-wide pooled HTTP clients for model providers."""
+
+import asyncio
+import threading
+import weakref
+from typing import AsyncIterator
+
+import httpx
+
+
+class LoopLocalAsyncTransport(httpx.AsyncBaseTransport):
+    """Async transport that keeps one connection pool per event loop.
+
+    Async connections are bound to the loop that opened them, so a single pool
+    cannot be shared between, say, a server loop and an `asyncio.run` call in a
+    script. Requests are routed to the pool of the running loop, which is
+    created on first use. Each pool is closed on its own loop when the loop
+    shuts down its async generators, as `asyncio.run` does before closing;
+    call `aclose` before closing a loop that is managed by hand.
+    """
+
+    def __init__(self, limits: httpx.Limits):
+        self.limits = limits
+        self.transports: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.lock = threading.Lock()
+
+    async def _transport(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            entry = self.transports.get(loop)
+            if entry is not None:
+                return entry[0]
+            transport = httpx.AsyncHTTPTransport(limits=self.limits)
+            closer = self._close_on_shutdown(loop, transport)
+            self.transports[loop] = (transport, closer)
+        # Starting the generator registers it with the loop's shutdown hooks
+        await closer.__anext__()
+        return transport
+
+    async def _close_on_shutdown(
+        self, loop: asyncio.AbstractEventLoop, transport: httpx.AsyncHTTPTransport
+    ) -> AsyncIterator[None]:
+        """Stay suspended until the loop shuts down, then close its pool."""
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.transports.pop(loop, None)
+            await transport.aclose()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        transport = await self._transport()
+        return await transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            entry = self.transports.pop(loop, None)
+        if entry is not None:
+            await entry[1].aclose()
+
+
+class HttpClientRegistry:
+    """Hands out the shared sync and async HTTP clients used by every model.
+
+    All agents of all graphs in the process reuse the same connection pools, so
+    concurrent conversations keep TLS sessions alive between LLM round trips
+    instead of opening a new connection per client.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 15.0,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout)
+        self._client: httpx.Client | None = None
+        self._async_client: httpx.AsyncClient | None = None
+        self.async_transport = LoopLocalAsyncTransport(self.limits)
+        self.lock = threading.Lock()
+
+    @property
+    def client(self) -> httpx.Client:
+        if self._client is None:
+            with self.lock:
+                if self._client is None:
+                    self._client = httpx.Client(
+                        limits=self.limits,
+                        timeout=self.timeout,
+                        follow_redirects=True,
+                    )
+        return self._client
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None:
+            with self.lock:
+                if self._async_client is None:
+                    self._async_client = httpx.AsyncClient(
+                        transport=self.async_transport,
+                        timeout=self.timeout,
+                        follow_redirects=True,
+                    )
+        return self._async_client
+
+    def close(self) -> None:
+        """Close the sync pool at shutdown."""
+        if self._client is not None:
+            self._client.close()
+
+    async def aclose(self) -> None:
+        """Close the async pool of the running event loop at shutdown."""
+        await self.async_transport.aclose()
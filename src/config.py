@@ -1,16 +1,136 @@
 import os
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Callable
 
 from dotenv import load_dotenv
 from langchain_groq import ChatGroq
 
+from .clients import HttpClientRegistry
+from .llm_cache import ResponseCache
+
 load_dotenv()
 
+HISTORY_MAX_TOKENS = int(os.getenv("HISTORY_MAX_TOKENS", "6000"))
+HISTORY_SUMMARIZE = os.getenv("HISTORY_SUMMARIZE", "true").lower() == "true"
+
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "huggingface")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "onnx/model_quint8_avx2.onnx")
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH")
+
+# Namespaces with at least this many memories switch to approximate (IVF) search
+VECTOR_INDEX_IVF_THRESHOLD = (
+    int(os.getenv("VECTOR_INDEX_IVF_THRESHOLD"))
+    if os.getenv("VECTOR_INDEX_IVF_THRESHOLD")
+    else None
+)
+VECTOR_INDEX_NPROBE = int(os.getenv("VECTOR_INDEX_NPROBE", "8"))
+
+# Seconds to reuse search tool results for the same destination
+WEATHER_CACHE_TTL = float(os.getenv("WEATHER_CACHE_TTL", "900"))
+LOCATION_CACHE_TTL = float(os.getenv("LOCATION_CACHE_TTL", "86400"))
+TOOL_CACHE_SIZE = int(os.getenv("TOOL_CACHE_SIZE", "1024"))
+
+# Directory with the booking inventory (`.npy` columns, or CSV/Parquet tables);
+# without it a synthetic inventory is generated from the settings below. Its
+# window starts a month before today, so the dates the agents see are covered
+INVENTORY_PATH = os.getenv("INVENTORY_PATH")
+INVENTORY_START = os.getenv(
+    "INVENTORY_START", (date.today() - timedelta(days=30)).isoformat()
+)
+INVENTORY_DAYS = int(os.getenv("INVENTORY_DAYS", "1095"))
+INVENTORY_FLIGHTS_PER_DAY = int(os.getenv("INVENTORY_FLIGHTS_PER_DAY", "4"))
+INVENTORY_PROPERTIES_PER_CITY = int(os.getenv("INVENTORY_PROPERTIES_PER_CITY", "150"))
+INVENTORY_SEED = int(os.getenv("INVENTORY_SEED", "7"))
+# Options returned per booking search
+BOOKING_SEARCH_LIMIT = int(os.getenv("BOOKING_SEARCH_LIMIT", "5"))
+# Longest departure window of one flight price calendar search
+FLIGHT_CALENDAR_MAX_DAYS = int(os.getenv("FLIGHT_CALENDAR_MAX_DAYS", "62"))
+
+# Route clear-cut user messages straight to an agent without a supervisor LLM call.
+# Off by default: the thresholds are untuned, and routing loads the embedding
+# model on the first supervisor turn
+ROUTER_ENABLED = os.getenv("ROUTER_ENABLED", "false").lower() == "true"
+ROUTER_THRESHOLD = float(os.getenv("ROUTER_THRESHOLD", "0.7"))
+ROUTER_MARGIN = float(os.getenv("ROUTER_MARGIN", "0.1"))
+
+SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "1"))
+# Turns running at once per worker, and how long a request may wait for a slot
+SERVER_MAX_CONCURRENCY = int(os.getenv("SERVER_MAX_CONCURRENCY", "32"))
+SERVER_QUEUE_TIMEOUT = float(os.getenv("SERVER_QUEUE_TIMEOUT", "10"))
+# Streamed events buffered per connection before the graph waits for the client
+SERVER_STREAM_BUFFER = int(os.getenv("SERVER_STREAM_BUFFER", "64"))
+SERVER_SHUTDOWN_TIMEOUT = float(os.getenv("SERVER_SHUTDOWN_TIMEOUT", "30"))
+SERVER_CHECKPOINTER = os.getenv("SERVER_CHECKPOINTER", "sqlite")
+SERVER_CHECKPOINT_PATH = os.getenv("SERVER_CHECKPOINT_PATH", "checkpoints.sqlite")
+
+TRACE_LEVEL = os.getenv("TRACE_LEVEL", "off")
+TRACE_FILE = os.getenv("TRACE_FILE")
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# Conversations kept for per-conversation metrics; process totals are unaffected
+METRICS_MAX_CONVERSATIONS = int(os.getenv("METRICS_MAX_CONVERSATIONS", "10000"))
+# USD per million tokens, used to estimate cost in the metrics
+LLM_INPUT_COST_PER_MTOK = float(os.getenv("LLM_INPUT_COST_PER_MTOK", "0.15"))
+LLM_OUTPUT_COST_PER_MTOK = float(os.getenv("LLM_OUTPUT_COST_PER_MTOK", "0.60"))
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() == "true"
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "3600"))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+
+response_cache = ResponseCache(LLM_CACHE_SIZE, LLM_CACHE_TTL, LLM_CACHE_PATH)
+
+LLM_POOL_MAX_CONNECTIONS = int(os.getenv("LLM_POOL_MAX_CONNECTIONS", "100"))
+LLM_POOL_MAX_KEEPALIVE = int(os.getenv("LLM_POOL_MAX_KEEPALIVE", "20"))
+LLM_POOL_KEEPALIVE_EXPIRY = float(os.getenv("LLM_POOL_KEEPALIVE_EXPIRY", "30"))
+
+http_clients = HttpClientRegistry(
+    max_connections=LLM_POOL_MAX_CONNECTIONS,
+    max_keepalive_connections=LLM_POOL_MAX_KEEPALIVE,
+    keepalive_expiry=LLM_POOL_KEEPALIVE_EXPIRY,
+    timeout=15,
+)
+
+
+# Replaces ChatGroq in `get_llm_model` when set, see `set_llm_factory`
+_llm_factory: Callable[[bool], Any] | None = None
+
+
+def set_llm_factory(factory: Callable[[bool], Any] | None) -> None:
+    """Make `get_llm_model` return `factory(cache)` instead of ChatGroq.
+
+    Used by benchmarks and load tests to run the graph against a scripted model.
+    Must be called before the graphs are built; pass None to restore ChatGroq.
+    """
+    global _llm_factory
+    _llm_factory = factory
+
+
+def get_llm_model(cache: bool = True):
+    """Return the shared chat model; `cache=False` opts out of the response cache.
+
+    Every agent of every graph gets the same instance, which sends its requests
+    through the process-wide pooled HTTP clients.
+    """
+    if _llm_factory is not None:
+        return _llm_factory(cache)
+    return _build_llm_model(cache)
+
 
-def get_llm_model():
+@lru_cache(maxsize=None)
+def _build_llm_model(cache: bool):
     return ChatGroq(
         groq_api_key=os.getenv("GROQ_API_KEY"),
         model_name="openai/gpt-oss-120b",
         temperature=0.5,
         timeout=15,
         max_retries=2,
+        cache=response_cache if LLM_CACHE_ENABLED and cache else False,
+        http_client=http_clients.client,
+        http_async_client=http_clients.async_client,
     )
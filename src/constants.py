@@ -17,9 +17,10 @@ These are the long-term memory tools that you can use when needed:
 WORKFLOW:
 1. When a user asks a question, analyze what type of information they need
 2. Transfer the user's query to an internal agent to generate a hidden response
-3. When the internal agent transfers control back to you, relay the hidden response to the user
-4. Relay the entire response because you are the supervisor
-5. Use the long-term memory tools ONLY when:
+3. If the query has independent parts for different agents (e.g. weather AND flights/hotels), transfer to ALL of them in the SAME turn by calling their transfer tools together, so they work in parallel
+4. When the internal agents transfer control back to you, relay their hidden responses to the user as one combined reply
+5. Relay the entire response because you are the supervisor
+6. Use the long-term memory tools ONLY when:
     a. When the user provides specific information worth remembering
     b. To retrieve past information to reply to the user's query
 
@@ -34,3 +35,56 @@ IMPORTANT:
 - If a question is not travel-related, politely redirect the user back to travel topics
 - The current date and time is {datetime.now()}
 """
+
+HISTORY_SUMMARY_PROMPT = """You maintain a running summary of a travel planning conversation between a user, a supervisor and internal agents.
+
+Update the existing summary (if any) with the new messages. Keep:
+- The user's destinations, dates, traveller details, budget and preferences
+- Search results and options that were presented to the user
+- Bookings made or cancelled, with their references
+- Open questions that still need an answer
+
+Be concise and factual. Do not add information that is not in the messages.
+Respond with the updated summary only."""
+
+
+# Labelled exemplars for the embedding router. Messages closest to the
+# "supervisor" exemplars always go through the supervisor model.
+ROUTER_EXEMPLARS = {
+    "search_agent": [
+        "What's the weather in London?",
+        "What is the weather forecast for Paris?",
+        "Will it rain in Tokyo next week?",
+        "How hot is it in Dubai right now?",
+        "What's the climate like in Bali?",
+        "Do I need a visa to visit Japan?",
+        "What currency do they use in Thailand?",
+        "What time zone is New York in?",
+        "What language do they speak in Brazil?",
+        "Tell me about Barcelona as a destination",
+    ],
+    "booking_agent": [
+        "Search flights from London to New York",
+        "Find me a flight to Rome",
+        "Are there any cheap flights to Madrid next Friday?",
+        "Show me hotels in Paris",
+        "Find accommodation in Tokyo for 3 nights",
+        "I need a hotel near the beach in Lisbon",
+        "Book the second hotel",
+        "Book that flight for me",
+        "I'd like to reserve a room for two adults",
+        "Cancel my hotel reservation",
+    ],
+    "supervisor": [
+        "Remember that I prefer window seats",
+        "I'm vegetarian and I like quiet hotels",
+        "What did I tell you about my preferences?",
+        "Where did I say I wanted to go last time?",
+        "Plan a 3-day trip to Rome for next week",
+        "Check the weather and find me a hotel in Paris",
+        "Hello, how are you?",
+        "Thanks, that's all",
+        "What can you help me with?",
+        "Write me a poem",
+    ],
+}
@@ -0,0 +1,205 @@
+"""Embedding model wrappers for the memory store."""
+
+import hashlib
+import math
+import re
+import sqlite3
+import threading
+import unicodedata
+from array import array
+from typing import Callable
+
+from langchain_core.embeddings import Embeddings
+
+from .cache import LRUCache
+from .config import EMBEDDING_MODEL, EMBEDDING_ONNX_FILE
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text so trivially different inputs share a cache entry."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that skips the model for texts it has seen before.
+
+    Vectors are keyed by a SHA-256 of the normalized text, kept in an in-memory
+    LRU and, when `path` is set, persisted to a local SQLite file so they survive
+    restarts. Misses within one call are embedded with a single model call.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        maxsize: int = 10_000,
+        path: str | None = None,
+        namespace: str = "",
+    ):
+        self.embeddings = embeddings
+        self.namespace = namespace
+        self.cache = LRUCache(maxsize)
+        self.conn = None
+        self.lock = threading.Lock()
+
+        if path:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self.conn.commit()
+
+    def _key(self, kind: str, text: str) -> str:
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{self.namespace}:{kind}:{digest}"
+
+    def _load(self, keys: list[str]) -> dict[str, list[float]]:
+        """Look up vectors in memory, falling back to the disk tier."""
+        found = {}
+        missing = []
+        for key in keys:
+            vector = self.cache.get(key)
+            if vector is None:
+                missing.append(key)
+            else:
+                found[key] = vector
+
+        if self.conn is not None and missing:
+            placeholders = ",".join("?" * len(missing))
+            with self.lock:
+                rows = self.conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    missing,
+                ).fetchall()
+            for key, blob in rows:
+                vector = array("f", blob).tolist()
+                self.cache.set(key, vector)
+                found[key] = vector
+
+        return found
+
+    def _save(self, vectors: dict[str, list[float]]) -> None:
+        for key, vector in vectors.items():
+            self.cache.set(key, vector)
+
+        if self.conn is not None and vectors:
+            with self.lock:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [
+                        (key, array("f", vector).tobytes())
+                        for key, vector in vectors.items()
+                    ],
+                )
+                self.conn.commit()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [self._key("doc", text) for text in texts]
+        found = self._load(keys)
+
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                pending.setdefault(key, text)
+
+        if pending:
+            vectors = self.embeddings.embed_documents(list(pending.values()))
+            computed = dict(zip(pending.keys(), vectors))
+            self._save(computed)
+            found.update(computed)
+
+        return [found[key] for key in keys]
+
+    def embed_query(self, text: str) -> list[float]:
+        key = self._key("query", text)
+        vector = self._load([key]).get(key)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self._save({key: vector})
+        return vector
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters of the in-memory tier."""
+        return self.cache.stats()
+
+
+class LazyEmbeddings(Embeddings):
+    """Defers building the underlying model until the first embedding call."""
+
+    def __init__(self, factory: Callable[[], Embeddings]):
+        self.factory = factory
+        self._model: Embeddings | None = None
+        self.lock = threading.Lock()
+
+    @property
+    def model(self) -> Embeddings:
+        if self._model is None:
+            with self.lock:
+                if self._model is None:
+                    self._model = self.factory()
+        return self._model
+
+    def warmup(self) -> None:
+        """Load the model and run one forward pass ahead of the first request."""
+        self.model.embed_query("warmup")
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.model.embed_documents(texts)
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.model.embed_query(text)
+
+
+class HashingEmbeddings(Embeddings):
+    """Dependency-free embedder based on feature hashing of words and word pairs.
+
+    It has no semantic understanding, but loads instantly and is deterministic,
+    which makes it suitable for tests, benchmarks and workers that only need
+    exact or near-exact text matches.
+    """
+
+    def __init__(self, dims: int = 384):
+        self.dims = dims
+
+    def _features(self, text: str) -> list[str]:
+        words = TOKEN_RE.findall(normalize_text(text).lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed_query(self, text: str) -> list[float]:
+        vector = [0.0] * self.dims
+        for feature in self._features(text):
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % self.dims] += 1.0 if value & (1 << 63) else -1.0
+
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(text) for text in texts]
+
+
+def create_embeddings(backend: str) -> Embeddings:
+    """Build the embedding model for a backend: "huggingface", "onnx" or "hashing"."""
+    if backend == "huggingface":
+        from langchain.embeddings import init_embeddings
+
+        return init_embeddings(f"huggingface:{EMBEDDING_MODEL}")
+
+    if backend == "onnx":
+        from langchain_huggingface import HuggingFaceEmbeddings
+
+        return HuggingFaceEmbeddings(
+            model_name=EMBEDDING_MODEL,
+            model_kwargs={
+                "backend": "onnx",
+                "model_kwargs": {"file_name": EMBEDDING_ONNX_FILE},
+            },
+        )
+
+    if backend == "hashing":
+        return HashingEmbeddings()
+
+    raise ValueError(f"Unknown embedding backend: {backend}")
@@ -1,26 +1,52 @@
 """Multi-agent travel planner graph."""
 
-from typing import Any
+from typing import Any, AsyncIterator, Iterator
 
-from langchain_core.messages import HumanMessage
-from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.messages import AIMessageChunk, HumanMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.types import Command
 from langgraph_supervisor import create_supervisor
 
 from .agents import create_booking_agent, create_search_agent
+from .checkpoint import CheckpointRetention, create_checkpointer
 from .config import get_llm_model
 from .constants import SUPERVISOR_PROMPT
+from .metrics import metrics
+from .router import intent_router
 from .tools import add_long_term_memory, search_long_term_memory
-from .utils import debug_hook
+from .tracing import tracer
+from .utils import create_pre_model_hook, parallel_handoff
+
+# Interrupts only reach the stream as a top-level "__interrupt__" update, never
+# in "values" chunks
+STREAM_MODES = ["messages", "tasks", "values", "updates"]
+AGENT_NAMES = ["search_agent", "booking_agent"]
+
+
+def post_model_hook(state, config: RunnableConfig):
+    """Post-model hook for the supervisor."""
+    tracer.model_end(state, "supervisor", config)
+    return parallel_handoff(state, AGENT_NAMES)
 
 
 class TravelPlannerGraph:
     """Multi-agent travel planner using supervisor pattern."""
 
-    def __init__(self, enable_memory: bool = True):
-        self.graph = self._build_graph(enable_memory)
+    def __init__(
+        self,
+        enable_memory: bool = True,
+        checkpointer: str = "memory",
+        checkpoint_path: str = "checkpoints.sqlite",
+        retention: CheckpointRetention | None = None,
+    ):
+        self.checkpointer = (
+            create_checkpointer(checkpointer, checkpoint_path, retention)
+            if enable_memory
+            else None
+        )
+        self.graph = self._build_graph()
 
-    def _build_graph(self, enable_memory: bool = True):
+    def _build_graph(self):
         """Build the supervisor graph using langgraph-supervisor."""
 
         supervisor = create_supervisor(
@@ -34,17 +60,54 @@ class TravelPlannerGraph:
             add_handoff_messages=True,
             add_handoff_back_messages=True,
             output_mode="full_history",
-            pre_model_hook=lambda state: debug_hook(state, "SUPERVISOR_PRE"),
-            post_model_hook=lambda state: debug_hook(state, "SUPERVISOR_POST"),
+            parallel_tool_calls=True,
+            pre_model_hook=create_pre_model_hook("supervisor", intent_router),
+            post_model_hook=post_model_hook,
         )
 
-        return supervisor.compile(
-            checkpointer=MemorySaver() if enable_memory else None,
-        )
+        return supervisor.compile(checkpointer=self.checkpointer)
 
     def get_config(self, conversation_id: str) -> dict[str, Any]:
         """Get configuration for the graph."""
-        return {"configurable": {"thread_id": conversation_id}}
+        config = {"configurable": {"thread_id": conversation_id}}
+        if metrics.enabled:
+            config["callbacks"] = [metrics]
+        return config
+
+    def get_metrics(self, conversation_id: str | None = None) -> dict[str, Any]:
+        """Per-node latency, token, cost, handoff and interrupt metrics.
+
+        Covers the whole process, or one conversation when `conversation_id` is
+        given; see `MetricsCollector.get_metrics`.
+        """
+        return metrics.get_metrics(conversation_id)
+
+    def _build_input(self, message: str, is_approved: bool | None) -> dict | Command:
+        """Build the graph input for a new message or an approval resume."""
+        if is_approved is not None:
+            return Command(resume={"is_approved": is_approved})
+        return {"messages": [HumanMessage(content=message)]}
+
+    def _format_result(self, result: dict) -> str | dict:
+        """Convert a graph result into a chat response or an interrupt payload."""
+        if isinstance(result, dict) and "__interrupt__" in result:
+            interrupt_data = result["__interrupt__"][0].value
+            return {
+                "type": "interrupt",
+                "data": interrupt_data,
+                "message": "Human approval required. Please respond to continue.",
+            }
+
+        return result["messages"][-1].content
+
+    def _format_error(self, error: Exception, is_approved: bool | None) -> str:
+        """Log a failed turn and return the user-facing error message."""
+        if is_approved is not None:
+            print(f"Error in approval flow: {error}")
+            return "I encountered an error while processing the approval. Please try again."
+
+        print(f"Error in chat flow: {error}")
+        return "I encountered an error while processing your request. Please try again."
 
     def chat(
         self,
@@ -55,32 +118,232 @@ class TravelPlannerGraph:
         """Chat interface that returns responses from both supervisor and agents."""
         config = self.get_config(conversation_id)
 
-        if is_approved is not None:
-            try:
-                result = self.graph.invoke(
-                    Command(resume={"is_approved": is_approved}),
-                    config=config,
-                )
-            except Exception as e:
-                print(f"Error in approval flow: {e}")
-                return "I encountered an error while processing the approval. Please try again."
-
-        else:
-            try:
-                result = self.graph.invoke(
-                    {"messages": [HumanMessage(content=message)]},
-                    config=config,
-                )
-            except Exception as e:
-                print(f"Error in chat flow: {e}")
-                return "I encountered an error while processing your request. Please try again."
+        try:
+            result = self.graph.invoke(
+                self._build_input(message, is_approved),
+                config=config,
+            )
+        except Exception as e:
+            return self._format_error(e, is_approved)
 
-        if isinstance(result, dict) and "__interrupt__" in result:
-            interrupt_data = result["__interrupt__"][0].value
+        return self._format_result(result)
+
+    async def achat(
+        self,
+        message: str,
+        conversation_id: str = "demo",
+        is_approved: bool | None = None,
+    ) -> str | dict:
+        """Async variant of `chat` for serving many conversations on one event loop."""
+        config = self.get_config(conversation_id)
+
+        try:
+            result = await self.graph.ainvoke(
+                self._build_input(message, is_approved),
+                config=config,
+            )
+        except Exception as e:
+            return self._format_error(e, is_approved)
+
+        return self._format_result(result)
+
+    def _batch_rounds(self, items: list[tuple[str, str]]) -> list[list[int]]:
+        """Group item indexes so each conversation appears at most once per round.
+
+        Rounds run one after another, so messages to the same conversation are
+        processed in the order given while different conversations run together.
+        """
+        rounds: list[list[int]] = []
+        seen: dict[str, int] = {}
+        for index, (conversation_id, _) in enumerate(items):
+            position = seen.get(conversation_id, 0)
+            seen[conversation_id] = position + 1
+            if position == len(rounds):
+                rounds.append([])
+            rounds[position].append(index)
+        return rounds
+
+    def _batch_result(self, output: Any) -> str | dict:
+        """Format one batch output, keeping failures isolated to their item."""
+        if isinstance(output, Exception):
+            print(f"Error in batch item: {output}")
             return {
-                "type": "interrupt",
-                "data": interrupt_data,
-                "message": "Human approval required. Please respond to continue.",
+                "type": "error",
+                "error": type(output).__name__,
+                "content": str(output),
             }
+        return self._format_result(output)
 
-        return result["messages"][-1].content
+    def _batch_plan(
+        self,
+        items: list[tuple[str, str]],
+        round_indexes: list[int],
+        results: list,
+        max_concurrency: int,
+    ) -> tuple[list[int], list[dict], list[dict]]:
+        """Select the round's items that can run, with their inputs and configs."""
+        waiting = {
+            items[index][0]
+            for index, result in enumerate(results)
+            if isinstance(result, dict) and result.get("type") == "interrupt"
+        }
+        runnable, inputs, configs = [], [], []
+        for index in round_indexes:
+            conversation_id, message = items[index]
+            if conversation_id in waiting:
+                results[index] = {
+                    "type": "error",
+                    "error": "PendingApproval",
+                    "content": (
+                        "Conversation is waiting for approval of an earlier message."
+                    ),
+                }
+                continue
+            runnable.append(index)
+            inputs.append(self._build_input(message, None))
+            configs.append(
+                {**self.get_config(conversation_id), "max_concurrency": max_concurrency}
+            )
+        return runnable, inputs, configs
+
+    def chat_batch(
+        self, items: list[tuple[str, str]], max_concurrency: int = 8
+    ) -> list[str | dict]:
+        """Run many `(conversation_id, message)` pairs through the graph's batch API.
+
+        At most `max_concurrency` turns run at once. Results come back in input
+        order with the same shape as `chat`, except that a failed item returns
+        an error dict with the exception instead of the generic error message.
+        A message sent to a conversation left waiting for approval by an earlier
+        item is not run.
+        """
+        results: list = [None] * len(items)
+        for round_indexes in self._batch_rounds(items):
+            runnable, inputs, configs = self._batch_plan(
+                items, round_indexes, results, max_concurrency
+            )
+            if not inputs:
+                continue
+            outputs = self.graph.batch(inputs, configs, return_exceptions=True)
+            for index, output in zip(runnable, outputs):
+                results[index] = self._batch_result(output)
+        return results
+
+    async def achat_batch(
+        self, items: list[tuple[str, str]], max_concurrency: int = 8
+    ) -> list[str | dict]:
+        """Async variant of `chat_batch`."""
+        results: list = [None] * len(items)
+        for round_indexes in self._batch_rounds(items):
+            runnable, inputs, configs = self._batch_plan(
+                items, round_indexes, results, max_concurrency
+            )
+            if not inputs:
+                continue
+            outputs = await self.graph.abatch(inputs, configs, return_exceptions=True)
+            for index, output in zip(runnable, outputs):
+                results[index] = self._batch_result(output)
+        return results
+
+    def _parse_stream_chunk(
+        self, namespace: tuple[str, ...], mode: str, chunk: Any
+    ) -> dict | None:
+        """Convert a raw graph stream chunk into a streaming event."""
+        if mode == "messages":
+            message, metadata = chunk
+            if not isinstance(message, AIMessageChunk):
+                return None
+            if not isinstance(message.content, str) or not message.content:
+                return None
+            node = (
+                namespace[0].split(":")[0]
+                if namespace
+                else metadata.get("langgraph_node")
+            )
+            return {"type": "token", "node": node, "content": message.content}
+
+        if mode == "tasks" and not namespace and "input" in chunk:
+            return {"type": "node", "node": chunk["name"]}
+
+        return None
+
+    def _merge_top_level(
+        self, values: dict | None, mode: str, chunk: Any
+    ) -> dict | None:
+        """Track the latest top-level state values plus any pending interrupt."""
+        if mode == "values":
+            interrupt = (values or {}).get("__interrupt__")
+            return {**chunk, "__interrupt__": interrupt} if interrupt else chunk
+        if isinstance(chunk, dict) and "__interrupt__" in chunk:
+            return {**(values or {}), "__interrupt__": chunk["__interrupt__"]}
+        return values
+
+    def _final_event(self, values: dict | None) -> dict:
+        """Build the closing event from the last top-level state values."""
+        if values is None:
+            return {"type": "message", "content": ""}
+
+        result = self._format_result(values)
+        if isinstance(result, dict):
+            return result
+        return {"type": "message", "content": result}
+
+    def stream(
+        self,
+        message: str,
+        conversation_id: str = "demo",
+        is_approved: bool | None = None,
+    ) -> Iterator[dict]:
+        """Stream tokens, node transitions and interrupts as they happen.
+
+        Yields events of type "node" (a top-level node such as `search_agent`
+        started), "token" (a generated text chunk and the node producing it),
+        and finally one of "message" (the final response), "interrupt" (same
+        payload as `chat`) or "error".
+        """
+        config = self.get_config(conversation_id)
+        values = None
+
+        try:
+            for namespace, mode, chunk in self.graph.stream(
+                self._build_input(message, is_approved),
+                config=config,
+                stream_mode=STREAM_MODES,
+                subgraphs=True,
+            ):
+                if not namespace and mode in ("values", "updates"):
+                    values = self._merge_top_level(values, mode, chunk)
+                elif event := self._parse_stream_chunk(namespace, mode, chunk):
+                    yield event
+        except Exception as e:
+            yield {"type": "error", "content": self._format_error(e, is_approved)}
+            return
+
+        yield self._final_event(values)
+
+    async def astream(
+        self,
+        message: str,
+        conversation_id: str = "demo",
+        is_approved: bool | None = None,
+    ) -> AsyncIterator[dict]:
+        """Async variant of `stream` yielding the same events."""
+        config = self.get_config(conversation_id)
+        values = None
+
+        try:
+            async for namespace, mode, chunk in self.graph.astream(
+                self._build_input(message, is_approved),
+                config=config,
+                stream_mode=STREAM_MODES,
+                subgraphs=True,
+            ):
+                if not namespace and mode in ("values", "updates"):
+                    values = self._merge_top_level(values, mode, chunk)
+                elif event := self._parse_stream_chunk(namespace, mode, chunk):
+                    yield event
+        except Exception as e:
+            yield {"type": "error", "content": self._format_error(e, is_approved)}
+            return
+
+        yield self._final_event(values)
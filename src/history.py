@@ -0,0 +1,186 @@
+"""Conversation history compaction for model calls."""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from langchain_core.messages import AnyMessage, HumanMessage, SystemMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.constants import TAG_NOSTREAM
+
+from .config import HISTORY_MAX_TOKENS, HISTORY_SUMMARIZE, get_llm_model
+from .constants import HISTORY_SUMMARY_PROMPT
+
+
+@dataclass
+class CompactionPlan:
+    """Which part of the history to evict and how to summarize it."""
+
+    cut: int
+    key: str | None
+    summary: str | None
+    to_summarize: list[AnyMessage]
+
+
+def _render_messages(messages: list[AnyMessage]) -> str:
+    """Render messages as plain text for the summarization prompt."""
+    lines = []
+    for msg in messages:
+        speaker = getattr(msg, "name", None) or msg.type
+        if msg.content:
+            lines.append(f"{speaker}: {msg.content}")
+        for tool_call in getattr(msg, "tool_calls", None) or []:
+            lines.append(f"{speaker} called {tool_call['name']}({tool_call['args']})")
+    return "\n".join(lines)
+
+
+class HistoryCompactor:
+    """Keep model input within a token budget using trimming and rolling summaries.
+
+    The graph state is never modified: the compacted history is returned as
+    `llm_input_messages`, so checkpoints, pending tool calls and interrupts stay
+    intact. Turns are only evicted at `HumanMessage` boundaries and the current
+    turn is always kept whole. Evicted history is folded into a rolling summary
+    cached by the id of the last evicted message, so later calls and other agents
+    on the same thread reuse it instead of summarizing again. Token counts are
+    cached per message id, so each call only counts the messages added since.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = HISTORY_MAX_TOKENS,
+        summarize: bool = HISTORY_SUMMARIZE,
+        target_ratio: float = 0.5,
+        max_summaries: int = 1024,
+        max_counts: int = 65536,
+    ):
+        self.max_tokens = max_tokens
+        self.summarize = summarize
+        self.target_ratio = target_ratio
+        self.max_summaries = max_summaries
+        self.summaries: OrderedDict[str, str] = OrderedDict()
+        self.max_counts = max_counts
+        self.token_counts: OrderedDict[str, int] = OrderedDict()
+        self._model = None
+
+    @property
+    def model(self):
+        """Model used for summaries, created on first use."""
+        if self._model is None:
+            self._model = get_llm_model()
+        return self._model
+
+    def _count(self, message: AnyMessage) -> int:
+        """Approximate tokens of a message, cached by its id."""
+        if message.id is None:
+            return count_tokens_approximately([message])
+        count = self.token_counts.get(message.id)
+        if count is None:
+            count = count_tokens_approximately([message])
+            self.token_counts[message.id] = count
+            while len(self.token_counts) > self.max_counts:
+                self.token_counts.popitem(last=False)
+        return count
+
+    def _plan(self, messages: list[AnyMessage]) -> CompactionPlan | None:
+        """Decide where to cut the history, or return None if it fits."""
+        counts = [self._count(msg) for msg in messages]
+        suffix = [0] * (len(messages) + 1)
+        for i in range(len(messages) - 1, -1, -1):
+            suffix[i] = suffix[i + 1] + counts[i]
+        if suffix[0] <= self.max_tokens:
+            return None
+
+        boundaries = [
+            i for i, msg in enumerate(messages) if isinstance(msg, HumanMessage) and i
+        ]
+        previous = next(
+            (i for i in reversed(boundaries) if messages[i - 1].id in self.summaries),
+            0,
+        )
+        summary = self.summaries.get(messages[previous - 1].id) if previous else None
+        summary_tokens = count_tokens_approximately([summary]) if summary else 0
+
+        candidates = [i for i in boundaries if i > previous]
+        if previous and (
+            not candidates or suffix[previous] + summary_tokens <= self.max_tokens
+        ):
+            self.summaries.move_to_end(messages[previous - 1].id)
+            return CompactionPlan(previous, None, summary, [])
+        if not candidates:
+            return None
+
+        target = self.max_tokens * self.target_ratio
+        cut = next((i for i in candidates if suffix[i] <= target), candidates[-1])
+        return CompactionPlan(
+            cut=cut,
+            key=messages[cut - 1].id,
+            summary=summary,
+            to_summarize=messages[previous:cut],
+        )
+
+    def _summary_input(self, plan: CompactionPlan) -> list[AnyMessage]:
+        """Build the prompt that folds evicted messages into the running summary."""
+        content = _render_messages(plan.to_summarize)
+        if plan.summary:
+            content = f"Existing summary:\n{plan.summary}\n\nNew messages:\n{content}"
+        return [SystemMessage(content=HISTORY_SUMMARY_PROMPT), HumanMessage(content)]
+
+    def _store_summary(self, key: str | None, summary: str) -> None:
+        if key is None:
+            return
+        self.summaries[key] = summary
+        self.summaries.move_to_end(key)
+        while len(self.summaries) > self.max_summaries:
+            self.summaries.popitem(last=False)
+
+    def _apply(self, messages: list[AnyMessage], cut: int, summary: str | None) -> dict:
+        kept = messages[cut:]
+        if summary:
+            kept = [
+                SystemMessage(
+                    content=f"Summary of the earlier conversation:\n{summary}"
+                )
+            ] + kept
+        return {"llm_input_messages": kept}
+
+    def compact(self, state: dict) -> dict | None:
+        """Return compacted model input for the state, or None if it fits the budget."""
+        messages = state["messages"]
+        plan = self._plan(messages)
+        if plan is None:
+            return None
+
+        summary = plan.summary
+        if self.summarize and plan.to_summarize:
+            try:
+                summary = self.model.invoke(
+                    self._summary_input(plan), config={"tags": [TAG_NOSTREAM]}
+                ).content
+                self._store_summary(plan.key, summary)
+            except Exception as e:
+                print(f"Error summarizing history: {e}")
+
+        return self._apply(messages, plan.cut, summary)
+
+    async def acompact(self, state: dict) -> dict | None:
+        """Async variant of `compact`."""
+        messages = state["messages"]
+        plan = self._plan(messages)
+        if plan is None:
+            return None
+
+        summary = plan.summary
+        if self.summarize and plan.to_summarize:
+            try:
+                response = await self.model.ainvoke(
+                    self._summary_input(plan), config={"tags": [TAG_NOSTREAM]}
+                )
+                summary = response.content
+                self._store_summary(plan.key, summary)
+            except Exception as e:
+                print(f"Error summarizing history: {e}")
+
+        return self._apply(messages, plan.cut, summary)
+
+
+history_compactor = HistoryCompactor()
@@ -0,0 +1,206 @@
+"""Response cache for chat model calls."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Sequence
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage
+
+from .cache import LRUCache
+
+# Fields that change on every call without changing what the model is asked
+VOLATILE_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+
+def _normalize_prompt(prompt: str) -> str:
+    """Strip per-call noise from a serialized message list.
+
+    Message ids and provider metadata are dropped and tool call ids are replaced
+    by sequential placeholders, so two conversations with the same content map
+    to the same key.
+    """
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return prompt
+
+    tool_call_ids: dict[str, str] = {}
+
+    def placeholder(tool_call_id: str) -> str:
+        return tool_call_ids.setdefault(tool_call_id, f"call_{len(tool_call_ids)}")
+
+    for message in messages if isinstance(messages, list) else []:
+        fields = message.get("kwargs", {}) if isinstance(message, dict) else {}
+        for field in VOLATILE_FIELDS:
+            fields.pop(field, None)
+        for tool_call in fields.get("tool_calls") or []:
+            if tool_call.get("id"):
+                tool_call["id"] = placeholder(tool_call["id"])
+        for tool_call in fields.get("additional_kwargs", {}).get("tool_calls") or []:
+            if tool_call.get("id"):
+                tool_call["id"] = placeholder(tool_call["id"])
+        if fields.get("tool_call_id"):
+            fields["tool_call_id"] = placeholder(fields["tool_call_id"])
+
+    return json.dumps(messages, sort_keys=True, ensure_ascii=False)
+
+
+def _fresh_generation(generation: Any) -> Any:
+    """Copy a cached generation with new message and tool call ids.
+
+    Reusing the stored ids would make the graph treat a cached answer as an
+    update of the earlier message and pair tool results with the wrong call.
+    """
+    message = getattr(generation, "message", None)
+    if not isinstance(message, AIMessage):
+        return generation
+
+    renamed = {}
+    tool_calls = []
+    for tool_call in message.tool_calls:
+        new_id = f"call_{uuid.uuid4().hex[:24]}"
+        renamed[tool_call.get("id")] = new_id
+        tool_calls.append({**tool_call, "id": new_id})
+
+    additional_kwargs = dict(message.additional_kwargs)
+    if additional_kwargs.get("tool_calls"):
+        additional_kwargs["tool_calls"] = [
+            {**tool_call, "id": renamed.get(tool_call.get("id"), tool_call.get("id"))}
+            for tool_call in additional_kwargs["tool_calls"]
+        ]
+
+    usage = message.usage_metadata
+    if usage is not None:
+        usage = {**usage, "input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+
+    return generation.model_copy(
+        update={
+            "message": message.model_copy(
+                update={
+                    "id": None,
+                    "tool_calls": tool_calls,
+                    "additional_kwargs": additional_kwargs,
+                    "usage_metadata": usage,
+                }
+            )
+        }
+    )
+
+
+class ResponseCache(BaseCache):
+    """Two-tier cache of chat model responses.
+
+    Entries are keyed by a SHA-256 of the model configuration (model name,
+    parameters and bound tools, as reported by LangChain's `llm_string`) and the
+    normalized message list. The in-memory tier is an LRU with an optional TTL;
+    when `path` is set, responses are also kept in a local SQLite file so they
+    survive restarts. Models opt in through their `cache` argument.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float | None = None,
+        path: str | None = None,
+    ):
+        self.ttl = ttl
+        self.memory = LRUCache(maxsize, ttl)
+        self.conn = None
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if path:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, created_at REAL NOT NULL, "
+                "generations TEXT NOT NULL)"
+            )
+            self.conn.commit()
+
+    def _key(self, prompt: str, llm_string: str) -> str:
+        payload = f"{llm_string}\x00{_normalize_prompt(prompt)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load_from_disk(self, key: str) -> RETURN_VAL_TYPE | None:
+        if self.conn is None:
+            return None
+
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT created_at, generations FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        if self.ttl is not None and time.time() - row[0] > self.ttl:
+            with self.lock:
+                self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.conn.commit()
+            return None
+
+        try:
+            return loads(row[1])
+        except Exception as e:
+            print(f"Error loading cached response: {e}")
+            return None
+
+    def _count(self, hit: bool) -> None:
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def lookup(self, prompt: str, llm_string: str) -> RETURN_VAL_TYPE | None:
+        key = self._key(prompt, llm_string)
+        generations = self.memory.get(key)
+        if generations is None:
+            generations = self._load_from_disk(key)
+            if generations is not None:
+                self.memory.set(key, generations)
+
+        self._count(generations is not None)
+        if generations is None:
+            return None
+        return [_fresh_generation(generation) for generation in generations]
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Any]) -> None:
+        key = self._key(prompt, llm_string)
+        generations = list(return_val)
+        self.memory.set(key, generations)
+
+        if self.conn is not None:
+            with self.lock:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, created_at, generations) "
+                    "VALUES (?, ?, ?)",
+                    (key, time.time(), dumps(generations)),
+                )
+                self.conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        self.memory.clear()
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+            if self.conn is not None:
+                self.conn.execute("DELETE FROM responses")
+                self.conn.commit()
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss counters across both tiers and the in-memory size."""
+        memory = self.memory.stats()
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": memory["size"],
+                "maxsize": memory["maxsize"],
+            }
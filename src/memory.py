@@ -1,10 +1,21 @@
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
-from langchain.embeddings import init_embeddings
+from langgraph.store.base import PutOp
 from langgraph.store.memory import InMemoryStore
 
+from .config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_SIZE,
+    VECTOR_INDEX_IVF_THRESHOLD,
+    VECTOR_INDEX_NPROBE,
+)
+from .embeddings import CachedEmbeddings, LazyEmbeddings, create_embeddings
+from .vector_index import VectorIndex
+
 
 @dataclass
 class MemoryEntry:
@@ -14,74 +25,163 @@ class MemoryEntry:
 
 
 class TravelMemoryStore:
-    def __init__(self):
-        embeddings = init_embeddings(
-            "huggingface:sentence-transformers/all-MiniLM-L6-v2"
+    def __init__(self, embedding_backend: str = EMBEDDING_BACKEND):
+        # The model is only loaded on the first embedding call (or `warmup`)
+        self.model = LazyEmbeddings(lambda: create_embeddings(embedding_backend))
+        self.embeddings = CachedEmbeddings(
+            self.model,
+            maxsize=EMBEDDING_CACHE_SIZE,
+            path=EMBEDDING_CACHE_PATH,
+            namespace=embedding_backend,
+        )
+        self.store = InMemoryStore()
+        self.vectors = VectorIndex(
+            dims=384,
+            ivf_threshold=VECTOR_INDEX_IVF_THRESHOLD,
+            nprobe=VECTOR_INDEX_NPROBE,
         )
-        self.store = InMemoryStore(
-            index={
-                "embed": embeddings,
-                "dims": 384,
-            }
+        # Exact secondary index: (session_id, field, value) -> memory ids, in
+        # insertion order
+        self.index: Dict[Tuple[str, str, str], Dict[str, None]] = {}
+        self.index_lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.last_id_ns = 0
+
+    def warmup(self) -> None:
+        self.model.warmup()
+
+    def _index_keys(
+        self, session_id: str, memory_type: str, metadata: Dict[str, Any]
+    ) -> List[Tuple[str, str, str]]:
+        keys = [(session_id, "type", memory_type)]
+        if metadata.get("importance"):
+            keys.append((session_id, "importance", metadata["importance"]))
+        for tag in metadata.get("tags", []):
+            keys.append((session_id, "tag", tag))
+        return keys
+
+    def _next_memory_id(self, memory_type: str) -> str:
+        """Unique, monotonically increasing id; callers must hold `write_lock`."""
+        self.last_id_ns = max(time.time_ns(), self.last_id_ns + 1)
+        return f"{memory_type}_{self.last_id_ns}"
+
+    def _to_entry(self, value: Dict[str, Any]) -> MemoryEntry:
+        return MemoryEntry(
+            content=value.get("text", ""),
+            memory_type=value.get("type", "unknown"),
+            metadata=value.get("metadata", {}),
         )
 
     def store_memory(
         self, session_id: str, content: str, memory_type: str, metadata: Dict[str, Any]
     ) -> None:
-        memory_id = f"{memory_type}_{int(time.time())}"
-
-        self.store.put(
-            (session_id, "memories"),
-            memory_id,
-            {"text": content, "metadata": metadata, "type": memory_type},
+        self.add_memories([(session_id, MemoryEntry(content, memory_type, metadata))])
+
+    def add_memories(self, memories: List[Tuple[str, MemoryEntry]]) -> List[str]:
+        """Store many (session_id, entry) pairs at once and return their ids.
+
+        All texts are embedded in a single model call before anything is written,
+        so a failed batch leaves the store unchanged. The index entries and
+        vectors of the whole batch are published under one `index_lock`, so
+        listings never see part of a batch.
+        """
+        vectors = self.embeddings.embed_documents(
+            [entry.content for _, entry in memories]
         )
 
-    def get_memories(self, session_id: str, memory_type: str) -> List[MemoryEntry]:
-        try:
-            search_results = self.store.search(
-                (session_id, "memories"), query=f"type:{memory_type}", limit=100
+        with self.write_lock:
+            memory_ids = [
+                self._next_memory_id(entry.memory_type) for _, entry in memories
+            ]
+            self.store.batch(
+                [
+                    PutOp(
+                        (session_id, "memories"),
+                        memory_id,
+                        {
+                            "text": entry.content,
+                            "metadata": entry.metadata,
+                            "type": entry.memory_type,
+                        },
+                    )
+                    for memory_id, (session_id, entry) in zip(memory_ids, memories)
+                ]
             )
 
-            results = []
-            for item in search_results:
-                if item.value.get("type") == memory_type:
-                    results.append(
-                        MemoryEntry(
-                            content=item.value.get("text", ""),
-                            memory_type=memory_type,
-                            metadata=item.value.get("metadata", {}),
-                        )
+            index_keys = []
+            by_session: Dict[str, Tuple[List[str], List[List[float]]]] = {}
+            for memory_id, (session_id, entry), vector in zip(
+                memory_ids, memories, vectors
+            ):
+                keys, session_vectors = by_session.setdefault(session_id, ([], []))
+                keys.append(memory_id)
+                session_vectors.append(vector)
+                index_keys.extend(
+                    (key, memory_id)
+                    for key in self._index_keys(
+                        session_id, entry.memory_type, entry.metadata
                     )
-            return results
+                )
 
-        except Exception as e:
-            print(f"Error getting memories: {e}")
-            return []
+            with self.index_lock:
+                for key, memory_id in index_keys:
+                    self.index.setdefault(key, {})[memory_id] = None
+                for session_id, (keys, session_vectors) in by_session.items():
+                    self.vectors.add((session_id, "memories"), keys, session_vectors)
+
+        return memory_ids
+
+    def get_memories(
+        self,
+        session_id: str,
+        memory_type: str,
+        tag: Optional[str] = None,
+        importance: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[MemoryEntry]:
+        """Memories of a type from the exact index, oldest first, without embedding."""
+        with self.index_lock:
+            memory_ids = list(self.index.get((session_id, "type", memory_type), {}))
+            for field, value in (("tag", tag), ("importance", importance)):
+                if value is not None:
+                    allowed = self.index.get((session_id, field, value), {})
+                    memory_ids = [mid for mid in memory_ids if mid in allowed]
+
+        end = None if limit is None else offset + limit
+        results = []
+        for memory_id in memory_ids[offset:end]:
+            item = self.store.get((session_id, "memories"), memory_id)
+            if item is not None:
+                results.append(self._to_entry(item.value))
+        return results
 
-    def get_all_memories(self, session_id: str) -> Dict[str, List[MemoryEntry]]:
+    def get_all_memories(
+        self, session_id: str, limit: Optional[int] = None
+    ) -> Dict[str, List[MemoryEntry]]:
         results = {}
         for mem_type in ["booking", "long_term"]:
-            results[mem_type] = self.get_memories(session_id, mem_type)
+            results[mem_type] = self.get_memories(session_id, mem_type, limit=limit)
         return results
 
     def search_memories(
         self, session_id: str, query: str, limit: int = 5
     ) -> List[MemoryEntry]:
+        namespace = (session_id, "memories")
+        # Nothing to rank, so skip embedding the query
+        if not self.vectors.size(namespace):
+            return []
+
         try:
-            search_results = self.store.search(
-                (session_id, "memories"), query=query, limit=limit
+            hits = self.vectors.search(
+                namespace, self.embeddings.embed_query(query), limit
             )
 
             results = []
-            for item in search_results:
-                results.append(
-                    MemoryEntry(
-                        content=item.value.get("text", ""),
-                        memory_type=item.value.get("type", "unknown"),
-                        metadata=item.value.get("metadata", {}),
-                    )
-                )
-
+            for memory_id, _ in hits:
+                item = self.store.get((session_id, "memories"), memory_id)
+                if item is not None:
+                    results.append(self._to_entry(item.value))
             return results
         except Exception as e:
             print(f"Error searching memories: {e}")
@@ -91,14 +191,25 @@ class TravelMemoryStore:
 memory_store = TravelMemoryStore()
 
 
+def warmup() -> None:
+    """Load the embedding model ahead of the first memory request."""
+    memory_store.warmup()
+
+
 def add_memory(
     session_id: str, content: str, memory_type: str, metadata: Dict[str, Any]
 ) -> None:
     memory_store.store_memory(session_id, content, memory_type, metadata)
 
 
-def get_session_memories(session_id: str) -> Dict[str, List[MemoryEntry]]:
-    return memory_store.get_all_memories(session_id)
+def add_memories(memories: List[Tuple[str, MemoryEntry]]) -> List[str]:
+    return memory_store.add_memories(memories)
+
+
+def get_session_memories(
+    session_id: str, limit: Optional[int] = None
+) -> Dict[str, List[MemoryEntry]]:
+    return memory_store.get_all_memories(session_id, limit)
 
 
 def search_memories(session_id: str, query: str, limit: int = 5) -> List[MemoryEntry]:
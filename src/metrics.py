@@ -0,0 +1,365 @@
+"""Per-node latency, token, cost and flow metrics for the planner graph."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langgraph.errors import GraphInterrupt
+
+from .config import (
+    LLM_INPUT_COST_PER_MTOK,
+    LLM_OUTPUT_COST_PER_MTOK,
+    METRICS_ENABLED,
+    METRICS_MAX_CONVERSATIONS,
+)
+
+COUNTERS = [
+    "llm_calls",
+    "llm_errors",
+    "llm_seconds",
+    "prompt_tokens",
+    "completion_tokens",
+    "cost_usd",
+    "tool_calls",
+    "tool_errors",
+    "tool_seconds",
+    "handoffs",
+    "interrupts",
+]
+# Upper bounds in seconds of the model latency histogram buckets
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+PROMETHEUS_HELP = {
+    "llm_calls": ("counter", "Model calls"),
+    "llm_errors": ("counter", "Model calls that raised"),
+    "llm_seconds": ("counter", "Seconds spent in successful model calls"),
+    "prompt_tokens": ("counter", "Prompt tokens sent to the model"),
+    "completion_tokens": ("counter", "Completion tokens generated by the model"),
+    "cost_usd": ("counter", "Estimated model cost in USD"),
+    "tool_calls": ("counter", "Tool executions"),
+    "tool_errors": ("counter", "Tool executions that raised"),
+    "tool_seconds": ("counter", "Seconds spent executing tools"),
+    "handoffs": ("counter", "Times work was handed to the node"),
+    "interrupts": ("counter", "Human approval interrupts raised in the node"),
+    "max_prompt_tokens": ("gauge", "Largest prompt sent by the node"),
+}
+
+
+def _new_node() -> dict[str, float]:
+    return {
+        **dict.fromkeys(COUNTERS, 0),
+        "last_prompt_tokens": 0,
+        "max_prompt_tokens": 0,
+    }
+
+
+def _node_of(metadata: dict | None) -> str:
+    """Top-level graph node a run belongs to, e.g. `search_agent`."""
+    metadata = metadata or {}
+    namespace = metadata.get("langgraph_checkpoint_ns") or ""
+    return namespace.split(":")[0] or metadata.get("langgraph_node") or "unknown"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsCollector(BaseCallbackHandler):
+    """Callback handler aggregating graph metrics per node and per conversation.
+
+    Attached to every run through the graph config. Model calls record latency,
+    prompt/completion tokens and estimated cost; tool runs record time and
+    errors. A handoff is counted on the agent receiving it, whether it came
+    from a model's transfer call or from the intent router, and an interrupt
+    on the top-level node that raised it.
+
+    Process totals cover every conversation ever seen; per-conversation
+    metrics keep the `max_conversations` most recently active ones.
+    """
+
+    run_inline = True
+
+    def __init__(
+        self,
+        enabled: bool = METRICS_ENABLED,
+        max_conversations: int = METRICS_MAX_CONVERSATIONS,
+        input_cost_per_mtok: float = LLM_INPUT_COST_PER_MTOK,
+        output_cost_per_mtok: float = LLM_OUTPUT_COST_PER_MTOK,
+    ):
+        self.enabled = enabled
+        self.max_conversations = max_conversations
+        self.input_cost = input_cost_per_mtok / 1_000_000
+        self.output_cost = output_cost_per_mtok / 1_000_000
+        self.lock = threading.Lock()
+        self.process: dict[str, dict[str, float]] = {}
+        self.conversations: OrderedDict[str, dict[str, dict[str, float]]] = (
+            OrderedDict()
+        )
+        self.latency_buckets: dict[str, list[int]] = {}
+        # In-flight model and tool runs, and top-level node runs, keyed by run id
+        self.runs: dict[UUID, tuple[float, str, str | None]] = {}
+        self.roots: set[UUID] = set()
+        self.node_runs: dict[UUID, tuple[str, str | None]] = {}
+
+    def reset(self) -> None:
+        with self.lock:
+            self.process.clear()
+            self.conversations.clear()
+            self.latency_buckets.clear()
+            self.runs.clear()
+            self.roots.clear()
+            self.node_runs.clear()
+
+    def _record(self, node: str, conversation: str | None, **values: float) -> None:
+        """Add `values` to the node's process and conversation totals."""
+        with self.lock:
+            targets = [self.process.setdefault(node, _new_node())]
+            if conversation is not None:
+                nodes = self.conversations.get(conversation)
+                if nodes is None:
+                    nodes = self.conversations[conversation] = {}
+                    while len(self.conversations) > self.max_conversations:
+                        self.conversations.popitem(last=False)
+                else:
+                    self.conversations.move_to_end(conversation)
+                targets.append(nodes.setdefault(node, _new_node()))
+
+            prompt_tokens = values.pop("last_prompt_tokens", None)
+            for target in targets:
+                for name, value in values.items():
+                    target[name] += value
+                if prompt_tokens is not None:
+                    target["last_prompt_tokens"] = prompt_tokens
+                    target["max_prompt_tokens"] = max(
+                        target["max_prompt_tokens"], prompt_tokens
+                    )
+
+    def _start(self, run_id: UUID, metadata: dict | None) -> None:
+        if not self.enabled:
+            return
+        conversation = (metadata or {}).get("thread_id")
+        with self.lock:
+            self.runs[run_id] = (time.perf_counter(), _node_of(metadata), conversation)
+
+    def _finish(self, run_id: UUID) -> tuple[float, str, str | None] | None:
+        with self.lock:
+            run = self.runs.pop(run_id, None)
+        if run is None:
+            return None
+        started, node, conversation = run
+        return time.perf_counter() - started, node, conversation
+
+    def record_handoff(self, agent: str, conversation: str | None) -> None:
+        """Count a handoff that did not go through a model call."""
+        if self.enabled:
+            self._record(agent, conversation, handoffs=1)
+
+    # Model runs
+
+    def on_chat_model_start(
+        self,
+        serialized: dict,
+        messages: Any,
+        *,
+        run_id: UUID,
+        metadata: dict | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start(run_id, metadata)
+
+    def on_llm_start(
+        self,
+        serialized: dict,
+        prompts: Any,
+        *,
+        run_id: UUID,
+        metadata: dict | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start(run_id, metadata)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._finish(run_id)
+        if run is None:
+            return
+        seconds, node, conversation = run
+
+        prompt_tokens = completion_tokens = 0
+        handoffs = []
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or {}
+                prompt_tokens += usage.get("input_tokens", 0)
+                completion_tokens += usage.get("output_tokens", 0)
+                handoffs += [
+                    tool_call["name"].removeprefix("transfer_to_")
+                    for tool_call in getattr(message, "tool_calls", None) or []
+                    if tool_call["name"].startswith("transfer_to_")
+                ]
+
+        self._record(
+            node,
+            conversation,
+            llm_calls=1,
+            llm_seconds=seconds,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cost_usd=prompt_tokens * self.input_cost
+            + completion_tokens * self.output_cost,
+            last_prompt_tokens=prompt_tokens,
+        )
+        for agent in handoffs:
+            self._record(agent, conversation, handoffs=1)
+
+        index = next(
+            (i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound),
+            len(LATENCY_BUCKETS),
+        )
+        with self.lock:
+            buckets = self.latency_buckets.setdefault(
+                node, [0] * (len(LATENCY_BUCKETS) + 1)
+            )
+            buckets[index] += 1
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        run = self._finish(run_id)
+        if run is not None:
+            seconds, node, conversation = run
+            self._record(node, conversation, llm_errors=1)
+
+    # Tool runs
+
+    def on_tool_start(
+        self,
+        serialized: dict,
+        input_str: str,
+        *,
+        run_id: UUID,
+        metadata: dict | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start(run_id, metadata)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        run = self._finish(run_id)
+        if run is not None:
+            seconds, node, conversation = run
+            self._record(node, conversation, tool_calls=1, tool_seconds=seconds)
+
+    def on_tool_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        run = self._finish(run_id)
+        if run is not None:
+            seconds, node, conversation = run
+            self._record(
+                node, conversation, tool_calls=1, tool_errors=1, tool_seconds=seconds
+            )
+
+    # Graph runs, tracked only to attribute interrupts to a top-level node
+
+    def on_chain_start(
+        self,
+        serialized: dict,
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict | None = None,
+        **kwargs: Any,
+    ) -> None:
+        if not self.enabled:
+            return
+        with self.lock:
+            if parent_run_id is None:
+                self.roots.add(run_id)
+            elif parent_run_id in self.roots:
+                self.node_runs[run_id] = (
+                    _node_of(metadata),
+                    (metadata or {}).get("thread_id"),
+                )
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        with self.lock:
+            self.roots.discard(run_id)
+            self.node_runs.pop(run_id, None)
+
+    def on_chain_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        with self.lock:
+            self.roots.discard(run_id)
+            run = self.node_runs.pop(run_id, None)
+        if run is not None and isinstance(error, GraphInterrupt):
+            self._record(run[0], run[1], interrupts=1)
+
+    # Reporting
+
+    def get_metrics(self, conversation_id: str | None = None) -> dict[str, Any]:
+        """Metrics per node for the process, or for one conversation.
+
+        The process view also includes a `total` across nodes and the number of
+        conversations tracked.
+        """
+        with self.lock:
+            if conversation_id is not None:
+                nodes = self.conversations.get(conversation_id, {})
+                return {"nodes": {node: dict(values) for node, values in nodes.items()}}
+
+            nodes = {node: dict(values) for node, values in self.process.items()}
+            conversations = len(self.conversations)
+
+        total = _new_node()
+        for values in nodes.values():
+            for name in COUNTERS:
+                total[name] += values[name]
+            total["max_prompt_tokens"] = max(
+                total["max_prompt_tokens"], values["max_prompt_tokens"]
+            )
+        del total["last_prompt_tokens"]
+        return {"nodes": nodes, "total": total, "conversations": conversations}
+
+    def prometheus(self, prefix: str = "travel_planner") -> str:
+        """Process metrics in the Prometheus text exposition format."""
+        with self.lock:
+            nodes = {node: dict(values) for node, values in self.process.items()}
+            buckets = {
+                node: list(counts) for node, counts in self.latency_buckets.items()
+            }
+
+        lines = []
+        for name, (kind, help_text) in PROMETHEUS_HELP.items():
+            metric = f"{prefix}_{name}" + ("_total" if kind == "counter" else "")
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} {kind}"]
+            for node, values in sorted(nodes.items()):
+                lines.append(f'{metric}{{node="{_escape(node)}"}} {values[name]:g}')
+
+        metric = f"{prefix}_llm_latency_seconds"
+        lines += [f"# HELP {metric} Model call latency", f"# TYPE {metric} histogram"]
+        for node, counts in sorted(buckets.items()):
+            label = _escape(node)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ["+Inf"], counts):
+                cumulative += count
+                lines.append(
+                    f'{metric}_bucket{{node="{label}",le="{bound}"}} {cumulative}'
+                )
+            lines.append(
+                f'{metric}_sum{{node="{label}"}} {nodes[node]["llm_seconds"]:g}'
+            )
+            lines.append(f'{metric}_count{{node="{label}"}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsCollector()
+
+
+def get_metrics(conversation_id: str | None = None) -> dict[str, Any]:
+    """Metrics of the process-wide collector, see `MetricsCollector.get_metrics`."""
+    return metrics.get_metrics(conversation_id)
@@ -0,0 +1,160 @@
+"""Embedding-based fast path that routes clear-cut queries straight to an agent."""
+
+import asyncio
+import threading
+import uuid
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langgraph.types import Command
+from langgraph_supervisor.handoff import METADATA_KEY_HANDOFF_DESTINATION
+
+from .config import ROUTER_ENABLED, ROUTER_MARGIN, ROUTER_THRESHOLD
+from .constants import ROUTER_EXEMPLARS
+from .memory import memory_store
+
+
+class IntentRouter:
+    """Scores a user message against labelled exemplars to skip the supervisor LLM.
+
+    Each label is scored by its most similar exemplar. A message is routed only
+    when the best label is an agent, scores at least `threshold` and beats the
+    runner-up by `margin`; anything else (memory requests, small talk, composite
+    queries) falls back to the supervisor model. The "supervisor" label holds
+    exemplars that must never be routed.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        exemplars: dict[str, list[str]] = ROUTER_EXEMPLARS,
+        threshold: float = ROUTER_THRESHOLD,
+        margin: float = ROUTER_MARGIN,
+        supervisor_name: str = "supervisor",
+    ):
+        self.embeddings = embeddings
+        self.exemplars = exemplars
+        self.threshold = threshold
+        self.margin = margin
+        self.supervisor_name = supervisor_name
+        self.labels = list(exemplars)
+        self._matrix: np.ndarray | None = None
+        self._owners: np.ndarray | None = None
+        self.lock = threading.Lock()
+        self.routed = 0
+        self.fallbacks = 0
+
+    def _load(self) -> tuple[np.ndarray, np.ndarray]:
+        """Embed the exemplars once, on first use."""
+        if self._matrix is None:
+            with self.lock:
+                if self._matrix is None:
+                    texts = [
+                        text for label in self.labels for text in self.exemplars[label]
+                    ]
+                    matrix = np.asarray(
+                        self.embeddings.embed_documents(texts), dtype=np.float32
+                    )
+                    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                    self._owners = np.repeat(
+                        np.arange(len(self.labels)),
+                        [len(self.exemplars[label]) for label in self.labels],
+                    )
+                    self._matrix = matrix / np.where(norms == 0, 1, norms)
+        return self._matrix, self._owners
+
+    def _scores(self, vector: list[float]) -> dict[str, float]:
+        matrix, owners = self._load()
+        query = np.asarray(vector, dtype=np.float32)
+        similarities = matrix @ (query / (np.linalg.norm(query) or 1))
+        best = np.full(len(self.labels), -1.0, dtype=np.float32)
+        np.maximum.at(best, owners, similarities)
+        return dict(zip(self.labels, best.tolist()))
+
+    def _decide(self, scores: dict[str, float]) -> str | None:
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        label, best = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else -1.0
+        if (
+            label == self.supervisor_name
+            or best < self.threshold
+            or best - runner_up < self.margin
+        ):
+            label = None
+
+        with self.lock:
+            if label is None:
+                self.fallbacks += 1
+            else:
+                self.routed += 1
+        return label
+
+    @staticmethod
+    def _query(state: dict) -> str | None:
+        """The user message to route, if the supervisor has not acted on it yet."""
+        last = state["messages"][-1]
+        if isinstance(last, HumanMessage) and isinstance(last.content, str):
+            return last.content
+        return None
+
+    def route(self, text: str) -> str | None:
+        """Return the agent for a message, or None to fall back to the supervisor."""
+        return self._decide(self._scores(self.embeddings.embed_query(text)))
+
+    async def aroute(self, text: str) -> str | None:
+        """Async variant of `route`."""
+        if self._matrix is None:
+            await asyncio.to_thread(self._load)
+        return self._decide(self._scores(await self.embeddings.aembed_query(text)))
+
+    def _handoff(self, state: dict, agent: str) -> Command:
+        """Hand off to the agent as if the supervisor had called its transfer tool."""
+        tool_name = f"transfer_to_{agent}"
+        tool_call_id = f"call_{uuid.uuid4().hex[:24]}"
+        messages = state["messages"] + [
+            AIMessage(
+                content="",
+                name=self.supervisor_name,
+                tool_calls=[{"name": tool_name, "args": {}, "id": tool_call_id}],
+            ),
+            ToolMessage(
+                content=f"Successfully transferred to {agent}",
+                name=tool_name,
+                tool_call_id=tool_call_id,
+                response_metadata={METADATA_KEY_HANDOFF_DESTINATION: agent},
+            ),
+        ]
+        return Command(graph=Command.PARENT, goto=agent, update={"messages": messages})
+
+    def handoff(self, state: dict) -> Command | None:
+        """Return a handoff command for a clear-cut user message, or None."""
+        text = self._query(state)
+        if text is None:
+            return None
+        try:
+            agent = self.route(text)
+        except Exception as e:
+            print(f"Error routing message: {e}")
+            return None
+        return self._handoff(state, agent) if agent else None
+
+    async def ahandoff(self, state: dict) -> Command | None:
+        """Async variant of `handoff`."""
+        text = self._query(state)
+        if text is None:
+            return None
+        try:
+            agent = await self.aroute(text)
+        except Exception as e:
+            print(f"Error routing message: {e}")
+            return None
+        return self._handoff(state, agent) if agent else None
+
+    def stats(self) -> dict[str, int]:
+        """How many messages were routed directly and how many fell back."""
+        with self.lock:
+            return {"routed": self.routed, "fallbacks": self.fallbacks}
+
+
+intent_router = IntentRouter(memory_store.embeddings) if ROUTER_ENABLED else None
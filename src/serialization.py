@@ -0,0 +1,96 @@
+"""Compact serialization of tool results for model input."""
+
+import functools
+import json
+import threading
+from typing import Any, Callable
+
+from langchain_core.messages.utils import count_tokens_approximately
+from pydantic import BaseModel
+
+
+def _compact_value(value: Any) -> Any:
+    """Reduce a value to plain JSON data, pruning fields and tabulating lists."""
+    if isinstance(value, BaseModel):
+        exclude = getattr(value, "compact_exclude", set())
+        data = {}
+        for name in type(value).model_fields:
+            if name in exclude:
+                continue
+            item = _compact_value(getattr(value, name))
+            if item is None or item == [] or item == "":
+                continue
+            data[name] = item
+        return data
+
+    if isinstance(value, list):
+        items = [_compact_value(item) for item in value]
+        if items and all(isinstance(item, dict) for item in items):
+            # Rows of the same schema share one header instead of repeating keys
+            columns = list(dict.fromkeys(key for item in items for key in item))
+            return {
+                "columns": columns,
+                "rows": [[item.get(column) for column in columns] for item in items],
+            }
+        return items
+
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def to_compact(value: Any) -> str:
+    """Serialize a tool result as minified JSON with per-schema pruning.
+
+    Fields listed in a model's `compact_exclude` (typically echoes of the tool
+    arguments, which the model already sees in its own tool call) are dropped,
+    as are empty values, and lists of models become a columns/rows table.
+    """
+    if isinstance(value, str):
+        return value
+    return json.dumps(_compact_value(value), ensure_ascii=False, separators=(",", ":"))
+
+
+class ToolOutputStats:
+    """Approximate tokens saved by compact tool output, per tool."""
+
+    def __init__(self):
+        self.tools: dict[str, dict[str, int]] = {}
+        self.lock = threading.Lock()
+
+    def record(self, tool: str, verbose: str, compact: str) -> None:
+        verbose_tokens = count_tokens_approximately([verbose])
+        compact_tokens = count_tokens_approximately([compact])
+        with self.lock:
+            stats = self.tools.setdefault(
+                tool, {"calls": 0, "verbose_tokens": 0, "compact_tokens": 0}
+            )
+            stats["calls"] += 1
+            stats["verbose_tokens"] += verbose_tokens
+            stats["compact_tokens"] += compact_tokens
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Calls and approximate verbose vs compact token totals per tool."""
+        with self.lock:
+            return {tool: dict(stats) for tool, stats in self.tools.items()}
+
+
+tool_output_stats = ToolOutputStats()
+
+
+def compact_output(func: Callable) -> Callable:
+    """Make a tool return `(compact content, full result)`.
+
+    Use under `@tool(response_format="content_and_artifact")`: the model only
+    sees the compact content, while the original object stays available as the
+    ToolMessage artifact.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        result = func(*args, **kwargs)
+        content = to_compact(result)
+        tool_output_stats.record(func.__name__, str(result), content)
+        return content, result
+
+    return wrapper
@@ -0,0 +1,338 @@
+"""ASGI service exposing the travel planner over HTTP and Server-Sent Events.
+
+Endpoints:
+    GET  /health         liveness and the number of turns in flight
+    POST /chat           {"message", "conversation_id"} -> final response or interrupt
+    POST /chat/stream    same body, streams `TravelPlannerGraph.astream` events as SSE
+    POST /resume         {"conversation_id", "is_approved"} -> resumes an interrupt
+    POST /resume/stream  same body, streamed
+    GET  /metrics        per-node model, tool and flow metrics in Prometheus text format
+
+Each worker runs at most `max_concurrency` turns at once; further requests wait
+up to `queue_timeout` seconds for a slot and then get 503. A conversation runs
+one turn at a time (409 otherwise). Streams go through a bounded buffer, so a
+slow client pauses its graph run instead of growing memory. A client that
+disconnects does not cancel the turn: it finishes and is checkpointed. On
+shutdown, in-flight turns get `shutdown_timeout` seconds to complete.
+
+With several workers, use the SQLite checkpointer so every process sees the
+same threads. Per-conversation locking is per process.
+
+Usage:
+    python -m src.server --workers 4
+    python -m src.server --fake-llm 0.2   # offline, scripted model with 200ms latency
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import time
+import weakref
+from typing import AsyncIterator
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from .config import (
+    SERVER_CHECKPOINT_PATH,
+    SERVER_CHECKPOINTER,
+    SERVER_HOST,
+    SERVER_MAX_CONCURRENCY,
+    SERVER_PORT,
+    SERVER_QUEUE_TIMEOUT,
+    SERVER_SHUTDOWN_TIMEOUT,
+    SERVER_STREAM_BUFFER,
+    SERVER_WORKERS,
+    http_clients,
+    set_llm_factory,
+)
+from .graph import TravelPlannerGraph
+from .metrics import metrics
+
+STREAM_END = object()
+# Read when the app is created rather than from config, so `--fake-llm` also
+# reaches workers and the process that re-imports this module under uvicorn
+FAKE_LLM_ENV = "SERVER_FAKE_LLM_LATENCY"
+
+
+class ServiceUnavailable(Exception):
+    """No turn slot became free within the queue timeout."""
+
+
+class ConversationBusy(Exception):
+    """The conversation already has a turn in progress."""
+
+
+class PlannerService:
+    """Runs planner turns under the concurrency, ordering and shutdown rules."""
+
+    def __init__(
+        self,
+        planner: TravelPlannerGraph,
+        max_concurrency: int = SERVER_MAX_CONCURRENCY,
+        queue_timeout: float = SERVER_QUEUE_TIMEOUT,
+        stream_buffer: int = SERVER_STREAM_BUFFER,
+        shutdown_timeout: float = SERVER_SHUTDOWN_TIMEOUT,
+    ):
+        self.planner = planner
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.queue_timeout = queue_timeout
+        self.stream_buffer = stream_buffer
+        self.shutdown_timeout = shutdown_timeout
+        self.conversation_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+        self.tasks: set[asyncio.Task] = set()
+        self.accepting = True
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.tasks)
+
+    async def _acquire(self, conversation_id: str) -> asyncio.Lock:
+        """Take the conversation lock and a concurrency slot, or raise."""
+        if not self.accepting:
+            raise ServiceUnavailable("Server is shutting down")
+
+        lock = self.conversation_locks.get(conversation_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self.conversation_locks[conversation_id] = lock
+        if lock.locked():
+            raise ConversationBusy(conversation_id)
+        await lock.acquire()
+
+        try:
+            await asyncio.wait_for(self.slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            lock.release()
+            raise ServiceUnavailable("Too many concurrent requests")
+        return lock
+
+    def _release(self, lock: asyncio.Lock) -> None:
+        self.slots.release()
+        lock.release()
+
+    def _track(self, task: asyncio.Task) -> None:
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def run(
+        self, message: str, conversation_id: str, is_approved: bool | None
+    ) -> str | dict:
+        """Run one turn to completion, even if the caller goes away."""
+        lock = await self._acquire(conversation_id)
+
+        async def turn():
+            try:
+                return await self.planner.achat(message, conversation_id, is_approved)
+            finally:
+                self._release(lock)
+
+        task = asyncio.create_task(turn())
+        self._track(task)
+        return await asyncio.shield(task)
+
+    async def stream(
+        self, message: str, conversation_id: str, is_approved: bool | None
+    ) -> AsyncIterator[dict]:
+        """Stream one turn's events through a bounded buffer."""
+        lock = await self._acquire(conversation_id)
+        buffer: asyncio.Queue = asyncio.Queue(self.stream_buffer)
+        listening = True
+
+        async def produce():
+            try:
+                async for event in self.planner.astream(
+                    message, conversation_id, is_approved
+                ):
+                    if listening:
+                        # Waits while the buffer is full: the client sets the pace
+                        await buffer.put(event)
+            finally:
+                self._release(lock)
+                if listening:
+                    await buffer.put(STREAM_END)
+
+        task = asyncio.create_task(produce())
+        self._track(task)
+
+        try:
+            while (event := await buffer.get()) is not STREAM_END:
+                yield event
+        finally:
+            # On disconnect, stop buffering and let the turn finish on its own
+            listening = False
+            while not buffer.empty():
+                buffer.get_nowait()
+
+    async def shutdown(self) -> None:
+        """Stop accepting turns and wait for the ones in flight."""
+        self.accepting = False
+        if self.tasks:
+            await asyncio.wait(list(self.tasks), timeout=self.shutdown_timeout)
+
+
+def _sse(event: dict) -> str:
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    return f"event: {event['type']}\ndata: {data}\n\n"
+
+
+def _error(status: int, message: str) -> JSONResponse:
+    return JSONResponse({"type": "error", "content": message}, status_code=status)
+
+
+async def _parse(request: Request, resume: bool) -> tuple[str, str, bool | None]:
+    body = await request.json()
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object")
+    conversation_id = str(body.get("conversation_id") or "")
+    if not conversation_id:
+        raise ValueError("conversation_id is required")
+
+    if resume:
+        if not isinstance(body.get("is_approved"), bool):
+            raise ValueError("is_approved must be true or false")
+        return "", conversation_id, body["is_approved"]
+
+    message = body.get("message")
+    if not isinstance(message, str) or not message.strip():
+        raise ValueError("message is required")
+    return message, conversation_id, None
+
+
+def _format_response(result: str | dict) -> dict:
+    return (
+        result if isinstance(result, dict) else {"type": "message", "content": result}
+    )
+
+
+def create_app(planner: TravelPlannerGraph | None = None) -> Starlette:
+    """Build the ASGI app; the planner is created at startup unless given."""
+    if os.getenv(FAKE_LLM_ENV) and planner is None:
+        from benchmarks.fake_llm import ScriptedChatModel
+
+        model = ScriptedChatModel(latency=float(os.environ[FAKE_LLM_ENV]))
+        set_llm_factory(lambda cache: model)
+
+    state: dict[str, PlannerService] = {}
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette):
+        state["service"] = PlannerService(
+            planner
+            or TravelPlannerGraph(
+                checkpointer=SERVER_CHECKPOINTER,
+                checkpoint_path=SERVER_CHECKPOINT_PATH,
+            )
+        )
+        yield
+        await state["service"].shutdown()
+        await http_clients.aclose()
+
+    def handler(resume: bool, streaming: bool):
+        async def endpoint(request: Request):
+            service = state["service"]
+            try:
+                message, conversation_id, is_approved = await _parse(request, resume)
+            except ValueError as e:
+                return _error(400, str(e))
+
+            try:
+                if not streaming:
+                    result = await service.run(message, conversation_id, is_approved)
+                    return JSONResponse(_format_response(result))
+
+                events = service.stream(message, conversation_id, is_approved)
+                # Start the turn now so busy/overload errors become status codes
+                first = await anext(events)
+            except ConversationBusy:
+                return _error(409, "A turn is already running for this conversation")
+            except ServiceUnavailable as e:
+                return _error(503, str(e))
+
+            async def body():
+                try:
+                    yield _sse(first)
+                    async for event in events:
+                        yield _sse(event)
+                finally:
+                    await events.aclose()
+
+            return StreamingResponse(
+                body(),
+                media_type="text/event-stream",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+            )
+
+        return endpoint
+
+    async def health(request: Request):
+        service = state.get("service")
+        return JSONResponse(
+            {
+                "status": "ok" if service and service.accepting else "stopping",
+                "in_flight": service.in_flight if service else 0,
+                "time": time.time(),
+            }
+        )
+
+    async def prometheus(request: Request):
+        return PlainTextResponse(
+            metrics.prometheus(), media_type="text/plain; version=0.0.4"
+        )
+
+    return Starlette(
+        routes=[
+            Route("/health", health, methods=["GET"]),
+            Route("/metrics", prometheus, methods=["GET"]),
+            Route("/chat", handler(resume=False, streaming=False), methods=["POST"]),
+            Route(
+                "/chat/stream", handler(resume=False, streaming=True), methods=["POST"]
+            ),
+            Route("/resume", handler(resume=True, streaming=False), methods=["POST"]),
+            Route(
+                "/resume/stream", handler(resume=True, streaming=True), methods=["POST"]
+            ),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the travel planner over HTTP")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS)
+    parser.add_argument(
+        "--fake-llm",
+        type=float,
+        metavar="LATENCY",
+        help="Use the scripted offline model with this latency in seconds",
+    )
+    args = parser.parse_args()
+
+    # Settings reach the worker processes through the environment
+    if args.fake_llm is not None:
+        os.environ[FAKE_LLM_ENV] = str(args.fake_llm)
+    if args.workers > 1 and SERVER_CHECKPOINTER != "sqlite":
+        print("Multiple workers need SERVER_CHECKPOINTER=sqlite to share threads")
+
+    uvicorn.run(
+        "src.server:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=int(SERVER_SHUTDOWN_TIMEOUT),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Structured tracing for model calls in the planner graph."""
+
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, TextIO
+
+from .config import TRACE_FILE, TRACE_LEVEL
+
+TRACE_LEVELS = {"off": 0, "info": 1, "debug": 2}
+
+
+class JsonLinesSink:
+    """Write trace events as JSON lines to a stream or file."""
+
+    def __init__(self, target: str | TextIO = sys.stdout):
+        self.stream = (
+            open(target, "a", encoding="utf-8") if isinstance(target, str) else target
+        )
+        self.lock = threading.Lock()
+
+    def __call__(self, event: dict) -> None:
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self.lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+def _tool_call_summary(message: Any) -> list[str]:
+    """Names of the tool calls requested by a message."""
+    return [
+        tool_call["name"] for tool_call in getattr(message, "tool_calls", None) or []
+    ]
+
+
+def _message_preview(message: Any) -> dict:
+    """Short description of a message for debug-level traces."""
+    content = (
+        message.content if isinstance(message.content, str) else str(message.content)
+    )
+    return {
+        "type": type(message).__name__,
+        "name": getattr(message, "name", None),
+        "content": content.split("\n")[0][:100],
+        "tool_calls": _tool_call_summary(message),
+    }
+
+
+class Tracer:
+    """Emits per-node model call spans to a pluggable sink.
+
+    Every method returns immediately when tracing is off, so the hooks cost a
+    single comparison per model call. At "info" level each span records its
+    duration, message counts and the requested tool calls in O(1); "debug" also
+    includes a preview of every message in the state. Spans that never close,
+    because the model call raised or the graph stopped, are dropped oldest
+    first beyond `max_spans`.
+    """
+
+    def __init__(
+        self,
+        level: str = TRACE_LEVEL,
+        sink: Callable[[dict], None] | None = None,
+        max_spans: int = 4096,
+    ):
+        self.level = TRACE_LEVELS[level]
+        self.sink = sink or JsonLinesSink(TRACE_FILE or sys.stdout)
+        self.max_spans = max_spans
+        self.spans: OrderedDict[tuple[str, str], float] = OrderedDict()
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.level > 0
+
+    def configure(
+        self,
+        level: str | None = None,
+        sink: Callable[[dict], None] | None = None,
+    ) -> None:
+        """Change the trace level or sink at runtime."""
+        if level is not None:
+            self.level = TRACE_LEVELS[level]
+        if sink is not None:
+            self.sink = sink
+
+    def _emit(self, event: str, node: str, config: dict | None, **fields) -> None:
+        thread_id = (config or {}).get("configurable", {}).get("thread_id")
+        self.sink(
+            {
+                "ts": time.time(),
+                "event": event,
+                "node": node,
+                "thread_id": thread_id,
+                **fields,
+            }
+        )
+
+    def model_start(
+        self, state: dict, node: str, config: dict | None, update: dict | None = None
+    ) -> None:
+        """Open a span just before a node calls its model."""
+        if not self.level:
+            return
+
+        thread_id = (config or {}).get("configurable", {}).get("thread_id")
+        key = (thread_id, node)
+        with self.lock:
+            self.spans[key] = time.perf_counter()
+            self.spans.move_to_end(key)
+            while len(self.spans) > self.max_spans:
+                self.spans.popitem(last=False)
+
+        messages = state["messages"]
+        fields = {"messages": len(messages)}
+        if update and "llm_input_messages" in update:
+            fields["input_messages"] = len(update["llm_input_messages"])
+        if self.level >= TRACE_LEVELS["debug"]:
+            fields["history"] = [_message_preview(msg) for msg in messages]
+        self._emit("model_start", node, config, **fields)
+
+    def model_end(self, state: dict, node: str, config: dict | None) -> None:
+        """Close the span opened by `model_start` once the model has responded."""
+        if not self.level:
+            return
+
+        thread_id = (config or {}).get("configurable", {}).get("thread_id")
+        with self.lock:
+            started = self.spans.pop((thread_id, node), None)
+        if started is None:
+            return
+
+        last = state["messages"][-1]
+        fields = {
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            "messages": len(state["messages"]),
+            "tool_calls": _tool_call_summary(last),
+        }
+        if self.level >= TRACE_LEVELS["debug"]:
+            fields["response"] = _message_preview(last)
+        self._emit("model_end", node, config, **fields)
+
+
+tracer = Tracer()
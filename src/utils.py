@@ -1,62 +1,106 @@
+import uuid
+
 from langchain_core.messages import AIMessage, ToolMessage
-from langgraph.types import interrupt
-
-
-def debug_hook(
-    state: dict,
-    hook_type: str = "POST",
-) -> None:
-    if not isinstance(state, dict) or "messages" not in state:
-        print(f"   State type: {type(state).__name__}")
-        print()
-        return
-
-    print(f"\n🔍 {hook_type}_HOOK:")
-    # print(f"\n🔍 State dict: {state}")
-
-    messages = state["messages"]
-    print(f"   Messages count: {len(messages)}")
-
-    for i, msg in enumerate(messages):
-        msg_name: str | None = getattr(msg, "name", None)
-        msg_content: str | None = getattr(msg, "content", None)
-
-        content = msg_content.split("\n")[0] if msg_content else "(no content)"
-        content_preview = content[:100]
-        if len(content) > 100:
-            content_preview += "..."
-
-        tool_calls: list[dict] | None = getattr(msg, "tool_calls", None)
-        if tool_calls:
-            tool_info = f" 🔧 {len(tool_calls)} tool call(s)"
-        else:
-            tool_info = ""
-
-        if msg_name:
-            print(f"   [{i}] {msg_name}: {content_preview}{tool_info}")
-        else:
-            msg_type = type(msg).__name__
-            print(f"   [{i}] {msg_type}: {content_preview}{tool_info}")
-
-        if tool_calls:
-            for j, tool_call in enumerate(tool_calls):
-                if isinstance(tool_call, dict):
-                    if "function" in tool_call:
-                        tool_name = tool_call["function"].get("name", "unknown")
-                        tool_args = tool_call["function"].get("arguments", "{}")
-                    else:
-                        tool_name = tool_call.get("name", "unknown")
-                        tool_args = tool_call.get("args", "{}")
-                else:
-                    tool_name = str(tool_call)
-                    tool_args = "{}"
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langgraph.types import Command, Send, interrupt
+from langgraph_supervisor.handoff import METADATA_KEY_HANDOFF_DESTINATION
+
+from .history import history_compactor
+from .metrics import metrics
+from .router import IntentRouter
+from .tracing import tracer
+
+
+def _thread_id(config: RunnableConfig | None) -> str | None:
+    return (config or {}).get("configurable", {}).get("thread_id")
+
+
+def create_pre_model_hook(
+    node: str, router: IntentRouter | None = None
+) -> RunnableLambda:
+    """Create a pre-model hook that compacts the history and opens a trace span.
+
+    With a `router`, clear-cut user messages are handed off to an agent directly
+    and the model call is skipped.
+    """
+
+    def pre_model_hook(state: dict, config: RunnableConfig) -> dict | Command | None:
+        if router is not None:
+            handoff = router.handoff(state)
+            if handoff is not None:
+                metrics.record_handoff(handoff.goto, _thread_id(config))
+                return handoff
+        update = history_compactor.compact(state)
+        tracer.model_start(state, node, config, update)
+        return update
 
-                args_preview = str(tool_args)[:80]
-                if len(str(tool_args)) > 80:
-                    args_preview += "..."
-                print(f"      🔧 Tool {j+1}: {tool_name}({args_preview})")
+    async def apre_model_hook(
+        state: dict, config: RunnableConfig
+    ) -> dict | Command | None:
+        if router is not None:
+            handoff = await router.ahandoff(state)
+            if handoff is not None:
+                metrics.record_handoff(handoff.goto, _thread_id(config))
+                return handoff
+        update = await history_compactor.acompact(state)
+        tracer.model_start(state, node, config, update)
+        return update
 
-    print()
+    return RunnableLambda(pre_model_hook, afunc=apre_model_hook)
+
+
+def create_post_model_hook(node: str) -> RunnableLambda | None:
+    """Create a post-model hook that closes the trace span.
+
+    Returns None when tracing is off so the graph skips the extra node entirely.
+    """
+    if not tracer.enabled:
+        return None
+
+    def post_model_hook(state: dict, config: RunnableConfig) -> None:
+        tracer.model_end(state, node, config)
+
+    return RunnableLambda(post_model_hook)
+
+
+def parallel_handoff(state: dict, agents: list[str]) -> Command | None:
+    """Dispatch several handoffs from one supervisor message concurrently.
+
+    The supervisor's react agent runs each tool call as a separate task, so only
+    one of several handoff commands would reach the parent graph. When the last
+    message hands off to more than one agent, this sends every agent its own
+    copy of the history (with just its handoff call) in a single step. The parent
+    graph merges their responses before the next supervisor generation.
+    """
+    last = state["messages"][-1]
+    handoffs = [
+        tool_call
+        for tool_call in getattr(last, "tool_calls", None) or []
+        if tool_call["name"].removeprefix("transfer_to_") in agents
+    ]
+    if len(handoffs) < 2:
+        return None
+
+    sends = []
+    for tool_call in handoffs:
+        agent = tool_call["name"].removeprefix("transfer_to_")
+        messages = state["messages"][:-1] + [
+            AIMessage(
+                content=last.content,
+                tool_calls=[tool_call],
+                name=last.name,
+                id=str(uuid.uuid4()),
+            ),
+            ToolMessage(
+                content=f"Successfully transferred to {agent}",
+                name=tool_call["name"],
+                tool_call_id=tool_call["id"],
+                response_metadata={METADATA_KEY_HANDOFF_DESTINATION: agent},
+            ),
+        ]
+        sends.append(Send(agent, {**state, "messages": messages}))
+
+    return Command(graph=Command.PARENT, goto=sends)
 
 
 def human_in_the_loop(state, tools: list[str]) -> dict:
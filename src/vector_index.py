@@ -0,0 +1,194 @@
+"""Vectorized top-k similarity index for memory namespaces."""
+
+import threading
+from typing import Hashable, Sequence
+
+import numpy as np
+
+
+class NamespaceIndex:
+    """Normalized vectors of one namespace in a contiguous float32 matrix.
+
+    Inserts append (growing the matrix geometrically) and deletes swap the last
+    row into the freed slot, so both are O(1) amortized. Exact search is a
+    single matrix-vector product followed by `argpartition`. Once the namespace
+    reaches `ivf_threshold` vectors, an IVF (inverted file) layer clusters the
+    rows with k-means and only the `nprobe` closest clusters are scored.
+    """
+
+    def __init__(
+        self,
+        dims: int,
+        ivf_threshold: int | None = None,
+        nprobe: int = 8,
+    ):
+        self.dims = dims
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.vectors = np.empty((16, dims), dtype=np.float32)
+        self.keys: list[str] = []
+        self.positions: dict[str, int] = {}
+        self.centroids: np.ndarray | None = None
+        self.assignments = np.empty(16, dtype=np.int32)
+        self.trained_size = 0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.vectors)
+        if needed <= capacity:
+            return
+
+        while capacity < needed:
+            capacity *= 2
+        vectors = np.empty((capacity, self.dims), dtype=np.float32)
+        vectors[: len(self.keys)] = self.vectors[: len(self.keys)]
+        assignments = np.empty(capacity, dtype=np.int32)
+        assignments[: len(self.keys)] = self.assignments[: len(self.keys)]
+        self.vectors = vectors
+        self.assignments = assignments
+
+    def add(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """Insert or replace vectors for the given keys."""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(keys), self.dims)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        for key in keys:
+            if key in self.positions:
+                self.delete(key)
+
+        start = len(self.keys)
+        self._grow(start + len(keys))
+        self.vectors[start : start + len(keys)] = vectors
+        for offset, key in enumerate(keys):
+            self.positions[key] = start + offset
+            self.keys.append(key)
+
+        if self.centroids is not None:
+            self.assignments[start : start + len(keys)] = self._nearest_centroids(
+                vectors
+            )
+        if self.ivf_threshold is not None and len(self.keys) >= max(
+            self.ivf_threshold, 2 * self.trained_size
+        ):
+            self._train()
+
+    def delete(self, key: str) -> None:
+        """Remove a key by moving the last row into its slot."""
+        position = self.positions.pop(key, None)
+        if position is None:
+            return
+
+        last = len(self.keys) - 1
+        if position != last:
+            moved = self.keys[last]
+            self.vectors[position] = self.vectors[last]
+            self.assignments[position] = self.assignments[last]
+            self.keys[position] = moved
+            self.positions[moved] = position
+        self.keys.pop()
+
+    def _nearest_centroids(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def _train(self, iterations: int = 10, sample_size: int = 20_000) -> None:
+        """Cluster the current vectors with spherical k-means."""
+        size = len(self.keys)
+        data = self.vectors[:size]
+        nlist = max(1, int(np.sqrt(size)))
+        rng = np.random.default_rng(0)
+        sample = data[rng.choice(size, min(size, sample_size), replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = np.where(
+                norms > 0, sums / np.where(norms == 0, 1, norms), centroids
+            )
+
+        self.centroids = centroids
+        self.assignments[:size] = self._nearest_centroids(data)
+        self.trained_size = size
+
+    def search(self, query: np.ndarray, k: int) -> list[tuple[str, float]]:
+        """Return the `k` most similar keys with their cosine similarity."""
+        size = len(self.keys)
+        if not size or k <= 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1)
+
+        if self.centroids is not None and self.nprobe < len(self.centroids):
+            probes = np.argpartition(-(self.centroids @ query), self.nprobe)[
+                : self.nprobe
+            ]
+            candidates = np.flatnonzero(np.isin(self.assignments[:size], probes))
+            scores = self.vectors[candidates] @ query
+        else:
+            candidates = None
+            scores = self.vectors[:size] @ query
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(k)
+        top = top[np.argsort(-scores[top])]
+        positions = top if candidates is None else candidates[top]
+        return [(self.keys[p], float(scores[t])) for p, t in zip(positions, top)]
+
+
+class VectorIndex:
+    """Thread-safe collection of per-namespace vector indexes."""
+
+    def __init__(
+        self,
+        dims: int,
+        ivf_threshold: int | None = None,
+        nprobe: int = 8,
+    ):
+        self.dims = dims
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+        self.namespaces: dict[Hashable, NamespaceIndex] = {}
+        self.lock = threading.RLock()
+
+    def _namespace(self, namespace: Hashable) -> NamespaceIndex:
+        if namespace not in self.namespaces:
+            self.namespaces[namespace] = NamespaceIndex(
+                self.dims, self.ivf_threshold, self.nprobe
+            )
+        return self.namespaces[namespace]
+
+    def add(
+        self,
+        namespace: Hashable,
+        keys: Sequence[str],
+        vectors: Sequence[Sequence[float]],
+    ) -> None:
+        if not keys:
+            return
+        with self.lock:
+            self._namespace(namespace).add(keys, np.asarray(vectors, dtype=np.float32))
+
+    def size(self, namespace: Hashable) -> int:
+        """Number of vectors stored in a namespace."""
+        with self.lock:
+            index = self.namespaces.get(namespace)
+            return len(index) if index is not None else 0
+
+    def delete(self, namespace: Hashable, key: str) -> None:
+        with self.lock:
+            if namespace in self.namespaces:
+                self.namespaces[namespace].delete(key)
+
+    def search(
+        self, namespace: Hashable, query: Sequence[float], k: int
+    ) -> list[tuple[str, float]]:
+        with self.lock:
+            if namespace not in self.namespaces:
+                return []
+            return self.namespaces[namespace].search(np.asarray(query), k)
@@ -7,6 +7,11 @@ import streamlit as st
 from src import TravelPlannerGraph
 from src.memory import get_session_memories
 
+AGENT_STATUS = {
+    "search_agent": "🔎 Search agent is looking this up...",
+    "booking_agent": "🏨 Booking agent is checking availability...",
+}
+
 
 def initialize_session_state():
     """Initialize Streamlit session state."""
@@ -53,6 +58,34 @@ def display_memories():
                 st.write(f"• {memory.content}{tag_str} ({importance})")
 
 
+def render_stream(events) -> str | dict:
+    """Render streamed graph events incrementally and return the final response."""
+    status = st.empty()
+    placeholder = st.empty()
+    text = ""
+
+    for event in events:
+        if event["type"] == "node":
+            if event["node"] in AGENT_STATUS:
+                status.caption(AGENT_STATUS[event["node"]])
+            if event["node"] == "supervisor":
+                text = ""
+        elif event["type"] == "token" and event["node"] == "supervisor":
+            text += event["content"]
+            placeholder.markdown(text + "▌")
+        elif event["type"] == "interrupt":
+            status.empty()
+            placeholder.empty()
+            return event
+        else:
+            status.empty()
+            placeholder.markdown(event["content"])
+            return event["content"]
+
+    status.empty()
+    return text
+
+
 def render_chat_interface(session_id: str, tab_data: dict):
     """Render chat interface for a single session."""
     for message in tab_data["messages"]:
@@ -69,33 +102,30 @@ def render_chat_interface(session_id: str, tab_data: dict):
             st.write(prompt)
 
         with st.chat_message("assistant"):
-            with st.spinner("Processing..."):
-                try:
-                    response = st.session_state.graph.chat(
+            try:
+                response = render_stream(
+                    st.session_state.graph.stream(
                         prompt,
                         conversation_id=tab_data["id"],
                     )
+                )
 
-                    if (
-                        isinstance(response, dict)
-                        and response.get("type") == "interrupt"
-                    ):
-                        st.session_state.pending_interrupt = response
-                        st.session_state.active_tab = session_id
-                        st.rerun()
-                    else:
-                        st.write(response)
-                        tab_data["messages"].append(
-                            {"role": "assistant", "content": response}
-                        )
-                        st.rerun()
-
-                except Exception as e:
-                    response_text = f"❌ Error: {str(e)}"
-                    st.write(response_text)
+                if isinstance(response, dict) and response.get("type") == "interrupt":
+                    st.session_state.pending_interrupt = response
+                    st.session_state.active_tab = session_id
+                    st.rerun()
+                else:
                     tab_data["messages"].append(
-                        {"role": "assistant", "content": response_text}
+                        {"role": "assistant", "content": response}
                     )
+                    st.rerun()
+
+            except Exception as e:
+                response_text = f"❌ Error: {str(e)}"
+                st.write(response_text)
+                tab_data["messages"].append(
+                    {"role": "assistant", "content": response_text}
+                )
 
 
 def main():
@@ -155,12 +185,14 @@ def main():
         with col1:
             if st.button("✅ Approve", type="secondary", use_container_width=True):
                 with st.spinner("Processing approval..."):
-                    response = st.session_state.graph.chat(
-                        "",
-                        conversation_id=st.session_state.chat_tabs[
-                            st.session_state.active_tab
-                        ]["id"],
-                        is_approved=True,
+                    response = render_stream(
+                        st.session_state.graph.stream(
+                            "",
+                            conversation_id=st.session_state.chat_tabs[
+                                st.session_state.active_tab
+                            ]["id"],
+                            is_approved=True,
+                        )
                     )
                     st.session_state.chat_tabs[st.session_state.active_tab][
                         "messages"
@@ -172,12 +204,14 @@ def main():
         with col2:
             if st.button("❌ Reject", type="secondary"):
                 with st.spinner("Processing rejection..."):
-                    response = st.session_state.graph.chat(
-                        "",
-                        conversation_id=st.session_state.chat_tabs[
-                            st.session_state.active_tab
-                        ]["id"],
-                        is_approved=False,
+                    response = render_stream(
+                        st.session_state.graph.stream(
+                            "",
+                            conversation_id=st.session_state.chat_tabs[
+                                st.session_state.active_tab
+                            ]["id"],
+                            is_approved=False,
+                        )
                     )
                     st.session_state.chat_tabs[st.session_state.active_tab][
                         "messages"
@@ -1,7 +1,73 @@
+import asyncio
+import contextlib
+import gc
+import itertools
+import math
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+from src.agents.booking import inventory as booking_inventory
+from src.agents.booking.inventory import (
+    Inventory,
+    from_day,
+    generate_inventory,
+    to_day,
+)
+from src.agents.booking.itinerary import optimize_itinerary
+from src.agents.booking.tools import search_flight_calendar, search_flights
+from src.agents.search.tools import get_location_info
+from src.cache import SingleFlightCache
+from src.checkpoint import CheckpointRetention
+from src.clients import HttpClientRegistry
+from src.config import set_llm_factory
 from src.graph import TravelPlannerGraph
+from src.history import HistoryCompactor
+from src.memory import MemoryEntry, TravelMemoryStore
+from src.tracing import Tracer
+from src.vector_index import NamespaceIndex
 
 studio_graph = TravelPlannerGraph(enable_memory=False).graph
 
+BOOKING_QUERY = "Please book the flight to Rome"
+
+
+def _scripted_graph(**kwargs) -> TravelPlannerGraph:
+    """Planner graph whose agents are played by the offline scripted model."""
+    from benchmarks.fake_llm import ScriptedChatModel
+
+    model = ScriptedChatModel()
+    set_llm_factory(lambda cache: model)
+    try:
+        return TravelPlannerGraph(**kwargs)
+    finally:
+        set_llm_factory(None)
+
+
+def _checkpoint_counts(graph: TravelPlannerGraph, thread_id: str) -> dict[str, int]:
+    """Stored checkpoints of a thread per namespace ("" is the root graph)."""
+    saver = graph.checkpointer
+    if hasattr(saver, "storage"):
+        return {
+            checkpoint_ns: len(checkpoints)
+            for checkpoint_ns, checkpoints in saver.storage.get(thread_id, {}).items()
+        }
+    with saver.cursor() as cur:
+        cur.execute(
+            "SELECT checkpoint_ns, COUNT(*) FROM checkpoints WHERE thread_id = ? "
+            "GROUP BY checkpoint_ns",
+            (thread_id,),
+        )
+        return dict(cur.fetchall())
+
 
 def test_graph():
     """Test the travel planner graph with one query."""
@@ -19,5 +85,576 @@ def test_graph():
         print(f"ERROR: {e}")
 
 
+def test_stream_interrupt():
+    """Streaming a booking turn ends with the same interrupt payload as `chat`."""
+    graph = _scripted_graph()
+
+    expected = graph.chat(BOOKING_QUERY, "chat")
+    assert isinstance(expected, dict) and expected["type"] == "interrupt"
+    assert list(graph.stream(BOOKING_QUERY, "stream"))[-1] == expected
+
+    async def collect():
+        return [event async for event in graph.astream(BOOKING_QUERY, "astream")]
+
+    assert asyncio.run(collect())[-1] == expected
+
+
+def test_server_stream_interrupt():
+    """`/chat/stream` with the scripted model ends a booking turn in an interrupt."""
+    from starlette.testclient import TestClient
+
+    from src.server import FAKE_LLM_ENV, create_app
+
+    os.environ[FAKE_LLM_ENV] = "0"
+    try:
+        with TestClient(create_app()) as client:
+            response = client.post(
+                "/chat/stream",
+                json={"message": BOOKING_QUERY, "conversation_id": "sse"},
+            )
+    finally:
+        del os.environ[FAKE_LLM_ENV]
+        set_llm_factory(None)
+
+    events = [
+        line.removeprefix("event: ")
+        for line in response.text.splitlines()
+        if line.startswith("event: ")
+    ]
+    assert events[-1] == "interrupt", events
+
+
+def test_checkpoint_retention():
+    """Both checkpointers keep a bounded history that still resumes interrupts."""
+    retention = CheckpointRetention(
+        max_checkpoints_per_thread=3, idle_thread_ttl=0.5, eviction_interval=0
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for backend in ("memory", "sqlite"):
+            graph = _scripted_graph(
+                checkpointer=backend,
+                checkpoint_path=os.path.join(directory, "checkpoints.sqlite"),
+                retention=retention,
+            )
+            for query in ["What's the weather in London?", "Find me flights to Paris"]:
+                assert isinstance(graph.chat(query, "retention"), str)
+            assert _checkpoint_counts(graph, "retention") == {"": 3}
+
+            # The interrupted agent's subgraph checkpoints survive until resumed
+            assert graph.chat(BOOKING_QUERY, "retention")["type"] == "interrupt"
+            counts = _checkpoint_counts(graph, "retention")
+            assert counts.pop("") == 3 and counts, (backend, counts)
+            response = graph.chat("", "retention", is_approved=True)
+            assert "confirmed" in response, (backend, response)
+            assert _checkpoint_counts(graph, "retention") == {"": 3}, backend
+            if backend == "memory":
+                assert all(key[1] == "" for key in graph.checkpointer.blobs)
+
+            # Any later write evicts threads idle for longer than the TTL
+            time.sleep(retention.idle_thread_ttl * 2)
+            graph.chat("What's the weather in Rome?", "other")
+            assert _checkpoint_counts(graph, "retention") == {}, backend
+            assert _checkpoint_counts(graph, "other") == {"": 3}, backend
+
+
+class _Summarizer:
+    """Stand-in summary model that counts its calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, messages, config=None):
+        self.calls += 1
+        return AIMessage(content=f"Summary {self.calls}")
+
+
+def _tool_turn(turn: int) -> list:
+    """One user turn in which the agent calls a tool before answering."""
+    call_id = f"call-{turn}"
+    return [
+        HumanMessage(content=f"Find flights to city {turn}", id=f"human-{turn}"),
+        AIMessage(
+            content="",
+            tool_calls=[{"name": "search_flights", "args": {}, "id": call_id}],
+            id=f"ai-call-{turn}",
+        ),
+        ToolMessage(content="flight " * 60, tool_call_id=call_id, id=f"tool-{turn}"),
+        AIMessage(content=f"Here are flights to city {turn}", id=f"ai-{turn}"),
+    ]
+
+
+def test_history_compaction():
+    """Compaction keeps tool calls with their results and reuses the summary."""
+    compactor = HistoryCompactor(max_tokens=1000)
+    compactor._model = summarizer = _Summarizer()
+    messages = [message for turn in range(30) for message in _tool_turn(turn)]
+
+    kept = compactor.compact({"messages": messages})["llm_input_messages"]
+    assert summarizer.calls == 1 and len(messages) == 120
+    assert isinstance(kept[0], SystemMessage) and "Summary 1" in kept[0].content
+    assert isinstance(kept[1], HumanMessage) and kept[1:] == messages[-len(kept) + 1 :]
+    assert count_tokens_approximately(kept) <= compactor.max_tokens
+    call_ids = {call["id"] for msg in kept for call in getattr(msg, "tool_calls", [])}
+    result_ids = {msg.tool_call_id for msg in kept if isinstance(msg, ToolMessage)}
+    assert call_ids and call_ids == result_ids
+
+    # A follow-up in the same turn fits under the cached summary
+    messages.append(AIMessage(content="Anything else?", id="ai-follow-up"))
+    again = compactor.compact({"messages": messages})["llm_input_messages"]
+    assert summarizer.calls == 1 and again[:-1] == kept
+
+
+def test_tracer_drops_unfinished_spans():
+    """Spans of model calls that never finish do not accumulate."""
+    events = []
+    tracer = Tracer(level="info", sink=events.append, max_spans=8)
+    state = {"messages": [AIMessage(content="Hi")]}
+    for thread in range(100):
+        tracer.model_start(state, "agent", {"configurable": {"thread_id": thread}})
+    assert list(tracer.spans) == [(thread, "agent") for thread in range(92, 100)]
+
+    tracer.model_end(state, "agent", {"configurable": {"thread_id": 99}})
+    assert len(tracer.spans) == 7 and events[-1]["event"] == "model_end"
+
+
+def test_memory_listing_pagination():
+    """Filtered, paginated listings match a scan of the stored memories."""
+    rng = random.Random(0)
+    store = TravelMemoryStore(embedding_backend="hashing")
+    memories = []
+    for number in range(120):
+        metadata = {"tags": rng.sample(["beach", "city", "food"], rng.randint(0, 2))}
+        if rng.random() < 0.5:
+            metadata["importance"] = rng.choice(["high", "low"])
+        entry = MemoryEntry(
+            f"memory {number}", rng.choice(["booking", "long_term"]), metadata
+        )
+        memories.append((rng.choice(["alice", "bob"]), entry))
+    store.add_memories(memories[:60])
+    for session_id, entry in memories[60:]:
+        store.store_memory(session_id, entry.content, entry.memory_type, entry.metadata)
+
+    for session_id in ["alice", "bob", "nobody"]:
+        for memory_type in ["booking", "long_term"]:
+            for tag in [None, "beach", "food"]:
+                for importance in [None, "high"]:
+                    expected = [
+                        entry
+                        for owner, entry in memories
+                        if owner == session_id
+                        and entry.memory_type == memory_type
+                        and (tag is None or tag in entry.metadata["tags"])
+                        and importance in (None, entry.metadata.get("importance"))
+                    ]
+                    for limit, offset in [(None, 0), (3, 0), (4, 2), (5, 100)]:
+                        listed = store.get_memories(
+                            session_id, memory_type, tag, importance, limit, offset
+                        )
+                        end = None if limit is None else offset + limit
+                        assert listed == expected[offset:end]
+
+
+def test_memory_ids_unique():
+    """Ids stay unique and increasing in a tight loop and across threads."""
+    store = TravelMemoryStore(embedding_backend="hashing")
+    with store.write_lock:
+        ids = [store._next_memory_id("booking") for _ in range(10000)]
+    stamps = [int(memory_id.split("_")[-1]) for memory_id in ids]
+    assert all(earlier < later for earlier, later in zip(stamps, stamps[1:]))
+
+    batches = []
+
+    def add_batch(worker: int) -> None:
+        entries = [
+            ("demo", MemoryEntry(f"memory {worker}-{n}", "booking", {}))
+            for n in range(50)
+        ]
+        batches.append(store.add_memories(entries))
+
+    threads = [threading.Thread(target=add_batch, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    added = [memory_id for batch in batches for memory_id in batch]
+    assert len(set(added)) == 400
+    assert len(store.get_memories("demo", "booking")) == 400
+
+
+def _check_exact_search(index: NamespaceIndex, stored: dict, queries) -> None:
+    """Exact search returns the brute-force top hits of the stored vectors."""
+    keys = list(stored)
+    matrix = np.array([stored[key] for key in keys])
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    for query in queries:
+        scores = matrix @ (query / np.linalg.norm(query))
+        expected = [keys[i] for i in np.argsort(-scores)[:5]]
+        assert [key for key, _ in index.search(query, 5)] == expected
+
+
+def test_namespace_index_delete_and_retrain():
+    """Swap-deletes and IVF retraining keep search results correct."""
+    rng = np.random.default_rng(0)
+    queries = rng.normal(size=(20, 16))
+    index = NamespaceIndex(dims=16)
+    stored = {f"key-{n}": rng.normal(size=16) for n in range(300)}
+    index.add(list(stored), np.array(list(stored.values())))
+    for key in rng.choice(list(stored), 100, replace=False):
+        index.delete(key)
+        del stored[key]
+    replaced = list(stored)[:20]
+    vectors = rng.normal(size=(20, 16))
+    index.add(replaced, vectors)
+    stored.update(zip(replaced, vectors))
+    assert all(index.keys[index.positions[key]] == key for key in stored)
+    assert sorted(index.keys) == sorted(stored)
+    _check_exact_search(index, stored, queries)
+
+    # IVF: each stored vector must find itself first through its own cluster
+    index = NamespaceIndex(dims=16, ivf_threshold=64, nprobe=2)
+    stored = {f"key-{n}": rng.normal(size=16) for n in range(100)}
+    keys = list(stored)
+    index.add(keys[:64], np.array([stored[key] for key in keys[:64]]))
+    assert index.trained_size == 64
+    index.add(keys[64:], np.array([stored[key] for key in keys[64:]]))
+    assert index.trained_size == 64
+    for key in list(stored)[:30]:
+        index.delete(key)
+        del stored[key]
+    extra = {f"extra-{n}": rng.normal(size=16) for n in range(60)}
+    index.add(list(extra), np.array(list(extra.values())))
+    stored.update(extra)
+    assert index.trained_size == 130 and len(index.centroids) == 11
+    assignments = index.assignments[: len(index)]
+    nearest = np.argmax(index.vectors[: len(index)] @ index.centroids.T, axis=1)
+    assert (assignments == nearest).all()
+    for key, vector in stored.items():
+        assert index.search(vector, 1)[0][0] == key
+    index.nprobe = len(index.centroids)
+    _check_exact_search(index, stored, queries)
+
+
+def test_search_memories_skips_empty_namespace():
+    """Searching a session without memories never embeds the query."""
+    store = TravelMemoryStore(embedding_backend="hashing")
+    embedded = []
+    store.embeddings.embed_query = embedded.append
+    assert store.search_memories("nobody", "beach holidays") == []
+    assert embedded == []
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    """Keep-alive stub server that counts the connections it accepts."""
+
+    protocol_version = "HTTP/1.1"
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+def test_http_transport_pools_per_loop():
+    """Requests on a loop share one connection, closed when the loop ends."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CountingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    registry = HttpClientRegistry()
+    url = f"http://127.0.0.1:{server.server_port}/"
+
+    async def send_requests():
+        for _ in range(5):
+            assert (await registry.async_client.get(url)).text == "ok"
+        pool = registry.async_transport.transports[asyncio.get_running_loop()][0]
+        assert len(pool._pool.connections) == 1
+        return pool
+
+    try:
+        pools = [asyncio.run(send_requests()) for _ in range(2)]
+    finally:
+        server.shutdown()
+        server.server_close()
+    gc.collect()
+    assert _CountingHandler.connections == 2
+    assert pools[0] is not pools[1]
+    assert all(not pool._pool.connections for pool in pools)
+    assert not registry.async_transport.transports
+
+
+def test_search_cache_keeps_caller_spelling():
+    """A cache hit under another spelling answers with the caller's destination."""
+    cache = get_location_info.func.__wrapped__.cache
+    cache.clear()
+    _, first = get_location_info.func("tokyo")
+    _, second = get_location_info.func("  TOKYO ")
+    assert (first.destination, second.destination) == ("tokyo", "  TOKYO ")
+    assert second.model_copy(update={"destination": "tokyo"}) == first
+    assert cache.stats()["hits"] == 1
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    """Concurrent misses on one key share a single computation."""
+    cache = SingleFlightCache()
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(threading.get_ident())
+        release.wait(5)
+        return "value"
+
+    with ThreadPoolExecutor(8) as pool:
+        futures = [pool.submit(cache.get_or_compute, "key", compute) for _ in range(8)]
+        deadline = time.monotonic() + 5
+        while cache.stats()["coalesced"] < 7 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert results == ["value"] * 8 and len(calls) == 1
+    stats = cache.stats()
+    assert (stats["coalesced"], stats["inflight"], stats["size"]) == (7, 0, 1)
+
+
+def _sparse_inventory() -> Inventory:
+    """Three weeks of synthetic flights with half of them removed."""
+    full = generate_inventory("2027-03-01", 21, 2, 2, seed=3)
+    keep = np.random.default_rng(3).random(len(full.flights["day"])) < 0.5
+    flights = {name: column[keep] for name, column in full.flights.items()}
+    return Inventory(flights, full.stays, full.vocab)
+
+
+def _cheapest_tour(inventory, origin, cities, start, days, nights, return_home):
+    """Brute force over every visiting order and every stay length."""
+    fares = {}
+
+    def fare(leg_from: str, leg_to: str, day: int) -> float:
+        if (leg_from, leg_to, day) not in fares:
+            rows = inventory.find_flights(leg_from, leg_to, from_day(day))
+            prices = inventory.flights["price"][rows].astype(np.float64)
+            fares[leg_from, leg_to, day] = prices.min() if len(rows) else math.inf
+        return fares[leg_from, leg_to, day]
+
+    best = math.inf
+    for order in itertools.permutations(cities):
+        route = [origin, *order] + ([origin] if return_home else [])
+        for stays in itertools.product(nights, repeat=len(route) - 2):
+            departures = [start + sum(stays[:leg]) for leg in range(len(route) - 1)]
+            if departures[-1] < start + days:
+                legs = zip(route, route[1:], departures)
+                best = min(best, sum(fare(*leg) for leg in legs))
+    return best
+
+
+def test_itinerary_matches_brute_force():
+    """The Held-Karp optimizer finds the cheapest tour a brute force finds."""
+    inventory = _sparse_inventory()
+    start = "2027-03-02"
+    for cities, end, return_home in [
+        (["Paris", "Rome", "Berlin"], None, True),
+        (["Paris", "Rome", "Berlin"], "2027-03-08", True),
+        (["Paris", "Rome", "Berlin", "Madrid"], None, False),
+        (["Paris", "Rome", "Berlin", "Madrid"], "2027-03-10", True),
+    ]:
+        itinerary = optimize_itinerary(
+            inventory, "London", cities, start, end, 1, 3, "price", return_home
+        )
+        days = to_day(end) - to_day(start) + 1 if end else len(cities) * 3 + 1
+        expected = _cheapest_tour(
+            inventory, "London", cities, to_day(start), days, [1, 2, 3], return_home
+        )
+        assert math.isfinite(expected), cities
+        assert abs(itinerary.total_price - expected) < 0.01, (cities, end)
+        assert sorted(itinerary.order) == sorted(cities)
+        assert len(itinerary.nights) == len(cities) - (not return_home)
+        assert all(1 <= stay <= 3 for stay in itinerary.nights)
+        assert len(itinerary.legs) == len(cities) + return_home
+
+    try:
+        optimize_itinerary(inventory, "London", ["Paris"], start, "2027-03-20", 1, 3)
+    except ValueError as e:
+        assert "too far out" in str(e)
+    else:
+        raise AssertionError("An end date past the longest stays must be rejected")
+
+
+def _tiny_inventory() -> Inventory:
+    """A handful of London-Paris flights and Paris properties laid out by hand."""
+    flights = [
+        ("London", "Paris", "2027-03-01", "SkyWings", 100),
+        ("London", "Paris", "2027-03-01", "Budget Air", 80),
+        ("London", "Paris", "2027-03-03", "SkyWings", 90),
+        ("Paris", "London", "2027-03-04", "SkyWings", 70),
+        ("Paris", "London", "2027-03-04", "Budget Air", 120),
+        ("Paris", "London", "2027-03-06", "Budget Air", 60),
+    ]
+    # Alpha's blocks are back to back, Beta's leave the night of March 4 free
+    # and Gamma only sleeps one guest
+    stays = [
+        ("Alpha", 2, "2027-03-01", "2027-03-05"),
+        ("Alpha", 2, "2027-03-05", "2027-03-10"),
+        ("Beta", 2, "2027-03-01", "2027-03-04"),
+        ("Beta", 2, "2027-03-05", "2027-03-10"),
+        ("Gamma", 1, "2027-03-01", "2027-03-10"),
+    ]
+    origins, destinations, days, airlines, prices = zip(*flights)
+    names, capacities, starts, ends = zip(*stays)
+    return Inventory.from_records(
+        {
+            "origin": origins,
+            "destination": destinations,
+            "day": days,
+            "departure_minute": ["09:00"] * len(flights),
+            "duration_minutes": [75] * len(flights),
+            "stops": [0] * len(flights),
+            "price": prices,
+            "rating": [4.0] * len(flights),
+            "airline": airlines,
+            "travel_class": ["Economy"] * len(flights),
+        },
+        {
+            "destination": ["Paris"] * len(stays),
+            "name": names,
+            "type": ["Hotel"] * len(stays),
+            "price_per_night": [100] * len(stays),
+            "rating": [4.5] * len(stays),
+            "capacity": capacities,
+            "available_from": starts,
+            "available_to": ends,
+            "amenities": ["WiFi"] * len(stays),
+            "pros": ["Great location"] * len(stays),
+            "cons": ["Small rooms"] * len(stays),
+        },
+    )
+
+
+def test_inventory_stays_across_blocks():
+    """Stays may span back-to-back availability blocks but not a gap."""
+    inventory = _tiny_inventory()
+
+    def names(check_in: str, check_out: str, guests: int = 2) -> list[str]:
+        rows = inventory.find_stays("Paris", check_in, check_out, guests)
+        return sorted(inventory.stay(row).name for row in rows)
+
+    assert names("2027-03-02", "2027-03-08") == ["Alpha"]
+    assert names("2027-03-02", "2027-03-04") == ["Alpha", "Beta"]
+    assert names("2027-03-05", "2027-03-08") == ["Alpha", "Beta"]
+    assert names("2027-03-04", "2027-03-05") == ["Alpha"]
+    assert names("2027-03-02", "2027-03-08", guests=1) == ["Alpha", "Gamma"]
+    assert names("2027-03-08", "2027-03-11") == []
+
+
+@contextlib.contextmanager
+def _using_inventory(inventory: Inventory):
+    """Serve the booking tools from `inventory` inside the block."""
+    previous = booking_inventory._inventory
+    booking_inventory._inventory = inventory
+    try:
+        yield
+    finally:
+        booking_inventory._inventory = previous
+
+
+def test_search_flights_pairs_return_flights():
+    """Round trips pair each outbound flight with its airline's cheapest return."""
+    with _using_inventory(_tiny_inventory()):
+        _, flights = search_flights.func("London", "Paris", "2027-03-01", "2027-03-04")
+        _, outside = search_flights.func("London", "Paris", "2027-04-01")
+        try:
+            search_flights.func("London", "Paris", "2027-03-04", "2027-03-01")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("A return before the departure must be rejected")
+
+    legs = {
+        (option.airline, option.return_flight.airline): (
+            option.price,
+            option.return_flight.price,
+        )
+        for option in flights.options
+    }
+    assert legs == {
+        ("SkyWings", "SkyWings"): (170, 70),
+        ("Budget Air", "Budget Air"): (200, 120),
+    }
+    assert outside.startswith("No inventory for these dates")
+
+
+def test_inventory_fares_on_days_without_flights():
+    """Days and stay lengths without flights cost inf and have no row."""
+    inventory = _tiny_inventory()
+    first = to_day("2027-03-01")
+    rows = inventory.find_flights("London", "Paris", "2027-03-01", "2027-03-04")
+    best, best_rows = inventory.cheapest_by_day(rows, first, 4)
+    assert best.tolist() == [80, math.inf, 90, math.inf]
+    assert best_rows[[1, 3]].tolist() == [-1, -1]
+    assert inventory.flight(best_rows[0]).airline == "Budget Air"
+
+    # Return flights only pair with the same airline
+    returns = inventory.find_flights("Paris", "London", "2027-03-02", "2027-03-07")
+    fares, out_rows, back_rows = inventory.round_trip_fares(
+        rows, returns, first, 4, 1, 3
+    )
+    inf = math.inf
+    assert fares.tolist() == [
+        [inf, inf, 170],
+        [inf, inf, inf],
+        [160, inf, inf],
+        [inf, inf, inf],
+    ]
+    for day, length in [(0, 2), (2, 0)]:
+        outbound = inventory.flight(out_rows[day, length])
+        inbound = inventory.flight(back_rows[day, length])
+        assert outbound.airline == inbound.airline == "SkyWings"
+
+
+def test_flight_calendar_nights():
+    """The calendar tool honors min/max nights and the inventory's dates."""
+    with _using_inventory(_tiny_inventory()):
+        _, calendar = search_flight_calendar.func(
+            "London", "Paris", "2027-03-01", "2027-03-04", 1, 3
+        )
+        _, three_nights = search_flight_calendar.func(
+            "London", "Paris", "2027-03-01", "2027-03-04", 3
+        )
+        _, empty = search_flight_calendar.func(
+            "London", "Paris", "2027-03-02", "2027-03-02", 1
+        )
+        _, outside = search_flight_calendar.func(
+            "London", "Paris", "2027-03-05", "2027-03-08"
+        )
+        try:
+            search_flight_calendar.func(
+                "London", "Paris", "2027-03-01", "2027-03-04", max_nights=3
+            )
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("max_nights without min_nights must be rejected")
+
+    assert [day.min_price for day in calendar.calendar] == [80, None, 90, None]
+    assert calendar.cheapest_date == "2027-03-01"
+    trips = [
+        (trip.departure_date, trip.return_date, trip.nights, trip.price)
+        for trip in calendar.round_trips
+    ]
+    assert trips == [
+        ("2027-03-03", "2027-03-04", 1, 160),
+        ("2027-03-01", "2027-03-04", 3, 170),
+    ]
+    assert [trip.nights for trip in three_nights.round_trips] == [3]
+    assert empty.cheapest_date is None and empty.round_trips == []
+    assert outside.startswith("No inventory for these dates")
+
+
 if __name__ == "__main__":
     test_graph()